@@ -1,4 +1,5 @@
 import asyncio
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -31,6 +32,17 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Partitions of chat_logs, created and dropped by ``app.services.partitions`` rather
+# than migrations
+PARTITION_NAME = re.compile(r"^chat_logs_(y\d{4}m\d{2}|default)$")
+
+
+def include_name(name, type_, _parent_names):
+    if type_ == "table":
+        return not PARTITION_NAME.match(name)
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -55,6 +67,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -62,7 +75,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,43 @@
+"""add_translation_cache
+
+Revision ID: 8b2e6d0c4a17
+Revises: 3f9c1a2b7d4e
+Create Date: 2026-10-19 10:02:13.540871
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2e6d0c4a17"
+down_revision: str | None = "3f9c1a2b7d4e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "translation_cache",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("source_hash", sa.String(length=64), nullable=False),
+        sa.Column("source_language", sa.String(length=10), nullable=False),
+        sa.Column("target_language", sa.String(length=10), nullable=False),
+        sa.Column("translated_text", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "source_hash",
+            "source_language",
+            "target_language",
+            name="uq_translation_cache_key",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("translation_cache")
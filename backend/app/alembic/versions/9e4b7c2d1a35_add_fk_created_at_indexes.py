@@ -0,0 +1,59 @@
+"""add_fk_created_at_indexes
+
+Revision ID: 9e4b7c2d1a35
+Revises: 5d8a3e1f9b62
+Create Date: 2026-10-19 14:11:42.208371
+
+Indexes are built CONCURRENTLY so the tables stay writable, which can't run
+in a transaction. If a build fails, the INVALID index must be dropped before
+running the upgrade again.
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4b7c2d1a35"
+down_revision: str | None = "5d8a3e1f9b62"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+indexes: list[tuple[str, str, list[str]]] = [
+    ("ix_users_tenant_id_created_at", "users", ["tenant_id", "created_at"]),
+    ("ix_chat_sessions_user_id_created_at", "chat_sessions", ["user_id", "created_at"]),
+    (
+        "ix_chat_sessions_tenant_id_created_at",
+        "chat_sessions",
+        ["tenant_id", "created_at"],
+    ),
+    (
+        "ix_chat_logs_chat_session_id_created_at",
+        "chat_logs",
+        ["chat_session_id", "created_at"],
+    ),
+    ("ix_jobs_tenant_id_created_at", "jobs", ["tenant_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in indexes:
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _ in reversed(indexes):
+            op.drop_index(
+                index_name, table_name=table_name, postgresql_concurrently=True
+            )
@@ -0,0 +1,135 @@
+"""partition_chat_logs
+
+Revision ID: b7f1c3e8d920
+Revises: 9e4b7c2d1a35
+Create Date: 2026-10-19 15:24:09.733518
+
+Recreates chat_logs partitioned by month on created_at and copies the rows.
+Writes to chat_logs must be stopped while this runs.
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7f1c3e8d920"
+down_revision: str | None = "9e4b7c2d1a35"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Months after the current one to create partitions for, the worker keeps it up
+partitions_ahead = 3
+
+columns = "id, chat_session_id, prompt, response_text, created_at"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table("chat_logs", "chat_logs_unpartitioned")
+    op.execute("ALTER INDEX chat_logs_pkey RENAME TO chat_logs_unpartitioned_pkey")
+    op.drop_index(
+        "ix_chat_logs_chat_session_id_created_at", table_name="chat_logs_unpartitioned"
+    )
+    # Frees the name, the new table's foreign key would be named ..._fkey1 otherwise
+    op.drop_constraint(
+        "chat_logs_chat_session_id_fkey", "chat_logs_unpartitioned", type_="foreignkey"
+    )
+
+    op.create_table(
+        "chat_logs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("chat_session_id", sa.UUID(), nullable=False),
+        sa.Column("prompt", sa.Text(), nullable=False),
+        sa.Column("response_text", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["chat_session_id"],
+            ["chat_sessions.id"],
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "ix_chat_logs_chat_session_id_created_at",
+        "chat_logs",
+        ["chat_session_id", "created_at"],
+        unique=False,
+    )
+
+    # Monthly partitions, bounded in UTC, from the oldest chat log on
+    op.execute(f"""
+    DO $$
+    DECLARE
+        month timestamp;
+    BEGIN
+        FOR month IN
+            SELECT generate_series(
+                date_trunc('month', coalesce(
+                    (SELECT min(created_at) FROM chat_logs_unpartitioned), now()
+                ) AT TIME ZONE 'UTC'),
+                date_trunc('month', now() AT TIME ZONE 'UTC')
+                    + interval '{partitions_ahead} months',
+                interval '1 month'
+            )
+        LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF chat_logs FOR VALUES FROM (%L) TO (%L)',
+                'chat_logs_' || to_char(month, '"y"YYYY"m"MM'),
+                month AT TIME ZONE 'UTC',
+                (month + interval '1 month') AT TIME ZONE 'UTC'
+            );
+        END LOOP;
+    END $$;
+    """)
+    op.execute("CREATE TABLE chat_logs_default PARTITION OF chat_logs DEFAULT")
+
+    op.execute(
+        f"INSERT INTO chat_logs ({columns}) "
+        f"SELECT {columns} FROM chat_logs_unpartitioned"
+    )
+    op.drop_table("chat_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table("chat_logs", "chat_logs_partitioned")
+    op.execute("ALTER INDEX chat_logs_pkey RENAME TO chat_logs_partitioned_pkey")
+    op.drop_index(
+        "ix_chat_logs_chat_session_id_created_at", table_name="chat_logs_partitioned"
+    )
+    op.drop_constraint(
+        "chat_logs_chat_session_id_fkey", "chat_logs_partitioned", type_="foreignkey"
+    )
+
+    op.create_table(
+        "chat_logs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("chat_session_id", sa.UUID(), nullable=False),
+        sa.Column("prompt", sa.Text(), nullable=False),
+        sa.Column("response_text", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["chat_session_id"],
+            ["chat_sessions.id"],
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        f"INSERT INTO chat_logs ({columns}) SELECT {columns} FROM chat_logs_partitioned"
+    )
+    op.create_index(
+        "ix_chat_logs_chat_session_id_created_at",
+        "chat_logs",
+        ["chat_session_id", "created_at"],
+        unique=False,
+    )
+
+    # Drops the partitions too
+    op.drop_table("chat_logs_partitioned")
@@ -0,0 +1,40 @@
+"""add_summary_cache
+
+Revision ID: c41d7e9a2f60
+Revises: 8b2e6d0c4a17
+Create Date: 2026-10-19 11:26:51.804112
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d7e9a2f60"
+down_revision: str | None = "8b2e6d0c4a17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "summary_cache",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("provider", sa.String(length=50), nullable=False),
+        sa.Column("max_words", sa.Integer(), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "content_hash", "provider", "max_words", name="uq_summary_cache_key"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("summary_cache")
@@ -0,0 +1,43 @@
+"""add_chat_sessions_tenant_id_id_index
+
+Revision ID: e3a9f5c1b274
+Revises: 2c6f0e4a8d13
+Create Date: 2026-10-19 19:02:17.540613
+
+Chat logs are scoped to a tenant through ``chat_session_id IN (SELECT id FROM
+chat_sessions WHERE tenant_id = ...)``, which (tenant_id, id) answers with an
+index only scan. Built CONCURRENTLY, see 9e4b7c2d1a35.
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a9f5c1b274"
+down_revision: str | None = "2c6f0e4a8d13"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chat_sessions_tenant_id_id",
+            "chat_sessions",
+            ["tenant_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_chat_sessions_tenant_id_id",
+            table_name="chat_sessions",
+            postgresql_concurrently=True,
+        )
@@ -1,10 +1,25 @@
 from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Depends, Request
+from fastapi import Depends, Request, Response, Security
+from fastapi_azure_auth.user import User as AzureUser
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.db import AsyncSessionLocal
+from app.core.models import Tenant
+from app.core.security import azure_scheme
+from app.crud.tenancy import tenant_scope
+from app.exceptions import RateLimitExceededError, TenantAccessDeniedError
+from app.services.generation import ChatGenerator, chat_generator
+from app.services.job_handlers import user_data_manager
+from app.services.loop_lag import LoopLagMonitor, loop_lag_monitor
+from app.services.rate_limit import rate_limiter
+from app.services.readiness import ReadinessProbe, readiness_probe
+from app.services.summarization import Summarizer, summarizer
+from app.services.translation import TranslationBatcher, translation_batcher
+from app.services.user_data import UserDataManager
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -15,6 +30,86 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
 
 
+async def scope_to_token_tenant(
+    db: SessionDep, user: AzureUser = Security(azure_scheme)
+) -> AsyncGenerator[None, None]:
+    """
+    Scopes all CRUD operations of the request to the tenant whose
+    ``entra_tenant_id`` is the ``tid`` of the token.
+
+    Tokens of ``FIRST_SUPERUSER_TENANT_ID``, the tenant running the platform, are
+    unscoped. Tokens of Entra tenants without a tenant are rejected.
+    """
+    if user.tid == settings.FIRST_SUPERUSER_TENANT_ID:
+        yield
+        return
+
+    stmt = select(Tenant.id).where(Tenant.entra_tenant_id == user.tid)
+    async with db.begin():
+        tenant_id = (await db.execute(stmt)).scalar_one_or_none()
+    if tenant_id is None:
+        raise TenantAccessDeniedError(
+            detail="The tenant of the token isn't registered.",
+            function_name=scope_to_token_tenant.__name__,
+        )
+
+    with tenant_scope(tenant_id):
+        yield
+
+
+async def rate_limit(
+    request: Request,
+    response: Response,
+    db: SessionDep,
+    user: AzureUser = Security(azure_scheme),
+) -> None:
+    """
+    Takes a token of the route's rate limits for the tenant and the user of the
+    token, rejecting the request with a 429 when either is used up. The state of
+    the limit is sent in ``RateLimit-*`` headers.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    state = await rate_limiter.take(
+        db,
+        route_name=request.scope["route"].name,
+        entra_tenant_id=user.tid,
+        user_id=user.oid or user.sub,
+    )
+    if state is None:
+        return
+    if not state.allowed:
+        raise RateLimitExceededError(
+            headers=state.headers(), function_name=rate_limit.__name__
+        )
+    response.headers.update(state.headers())
+
+
+def get_translation_batcher() -> TranslationBatcher:
+    return translation_batcher
+
+
+def get_summarizer() -> Summarizer:
+    return summarizer
+
+
 def get_user_ip_from_header(request: Request) -> str:
     client_ip = request.headers.get("X-Forwarded-For")
     return client_ip if client_ip is not None else "127.0.0.1"
+
+
+def get_chat_generator() -> ChatGenerator:
+    return chat_generator
+
+
+def get_user_data_manager() -> UserDataManager:
+    return user_data_manager
+
+
+def get_readiness_probe() -> ReadinessProbe:
+    return readiness_probe
+
+
+def get_loop_lag_monitor() -> LoopLagMonitor:
+    return loop_lag_monitor
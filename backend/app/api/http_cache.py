@@ -0,0 +1,51 @@
+import hashlib
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+def weak_etag(*parts: object) -> str:
+    """Weak ETag from ``parts``, e.g. ``id`` and ``updated_at`` of an object."""
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=16
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def content_etag(obj: BaseModel) -> str:
+    """Weak ETag from the serialized ``obj``, for objects without ``updated_at``."""
+    return weak_etag(obj.model_dump_json())
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_response(
+    request: Request, response: Response, *, etag: str, cache_control: str
+) -> Response | None:
+    """
+    Returns ``304 Not Modified`` if the client's copy matches ``etag``, otherwise
+    sets the caching headers on ``response`` and returns None.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        # Responses depend on the caller's token
+        "Vary": "Authorization",
+    }
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
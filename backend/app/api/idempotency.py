@@ -0,0 +1,123 @@
+import hashlib
+from collections.abc import Callable, Coroutine
+from typing import Any, NamedTuple
+
+from fastapi import Header, Request, Response, Security
+from fastapi.routing import APIRoute
+from fastapi_azure_auth.user import User as AzureUser
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import SessionDep
+from app.core.security import azure_scheme
+from app.logs.logger import logger
+from app.services.idempotency import StoredResponse, idempotency_store
+
+
+class _Claim(NamedTuple):
+    db: AsyncSession
+    owner: str
+    key: str
+
+
+class _Replay(Exception):
+    def __init__(self, response: StoredResponse):
+        self.response = response
+
+
+async def _request_hash(request: Request) -> str:
+    digest = hashlib.sha256()
+    for part in (request.method, request.url.path, request.url.query):
+        digest.update(part.encode())
+        digest.update(b"\x1f")
+    digest.update(await request.body())
+    return digest.hexdigest()
+
+
+async def idempotency_key(
+    request: Request,
+    db: SessionDep,
+    user: AzureUser = Security(azure_scheme),
+    idempotency_key: str | None = Header(
+        None,
+        max_length=255,
+        description=(
+            "Unique per request, e.g. a UUID. Retries with the same key get the "
+            "response of the first request instead of creating the objects again."
+        ),
+    ),
+) -> None:
+    """
+    Claims the ``Idempotency-Key`` of the request for the tenant and user of the
+    token, or replays the response of the request that used the key first. Only
+    for routes of an ``IdempotentRoute`` router.
+    """
+    if idempotency_key is None:
+        return
+
+    owner = f"{user.tid}:{user.oid or user.sub}"
+    stored = await idempotency_store.claim(
+        db, owner=owner, key=idempotency_key, request_hash=await _request_hash(request)
+    )
+    if stored is not None:
+        raise _Replay(stored)
+    request.state.idempotency_claim = _Claim(db, owner, idempotency_key)
+
+
+class IdempotentRoute(APIRoute):
+    """
+    Stores the responses of requests whose ``Idempotency-Key`` the
+    ``idempotency_key`` dependency claimed, and replays them to retries.
+
+    Only successful responses with a body are stored, the claims of other
+    requests are released, so a retry runs again.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def idempotent_route_handler(request: Request) -> Response:
+            try:
+                response = await route_handler(request)
+            except _Replay as replay:
+                return Response(
+                    replay.response.body,
+                    status_code=replay.response.status_code,
+                    media_type=replay.response.media_type,
+                    headers={"Idempotent-Replayed": "true"},
+                )
+            except BaseException:
+                await _release(request)
+                raise
+
+            claim: _Claim | None = getattr(request.state, "idempotency_claim", None)
+            body = getattr(response, "body", None)
+            if claim is None:
+                return response
+            if not 200 <= response.status_code < 300 or body is None:
+                await _release(request)
+                return response
+
+            await idempotency_store.complete(
+                claim.db,
+                owner=claim.owner,
+                key=claim.key,
+                response=StoredResponse(
+                    status_code=response.status_code,
+                    media_type=response.headers.get("content-type"),
+                    body=bytes(body),
+                ),
+            )
+            return response
+
+        return idempotent_route_handler
+
+
+async def _release(request: Request) -> None:
+    claim: _Claim | None = getattr(request.state, "idempotency_claim", None)
+    if claim is None:
+        return
+    try:
+        await idempotency_store.release(claim.db, owner=claim.owner, key=claim.key)
+    except Exception as e:
+        # The claim times out after IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS instead
+        logger.error(f"Could not release Idempotency-Key {claim.key}: {e}")
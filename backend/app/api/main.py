@@ -1,11 +1,34 @@
-from fastapi import APIRouter, Security
+from fastapi import APIRouter, Depends, Security
 
-from app.api.routes import chat_logs, chat_sessions, tenants, users, utils
+from app.api.deps import rate_limit, scope_to_token_tenant
+from app.api.routes import (
+    articles,
+    chat_logs,
+    chat_sessions,
+    jobs,
+    summaries,
+    tenants,
+    translations,
+    users,
+    utils,
+)
 from app.core.security import azure_scheme
 
+# Authenticated routes, with CRUD operations scoped to the tenant of the token and
+# rate limits per tenant and user
+authenticated = [
+    Security(azure_scheme),
+    Depends(scope_to_token_tenant),
+    Depends(rate_limit),
+]
+
 api_router = APIRouter()
-api_router.include_router(tenants.router, dependencies=[Security(azure_scheme)])
-api_router.include_router(users.router, dependencies=[Security(azure_scheme)])
-api_router.include_router(chat_sessions.router, dependencies=[Security(azure_scheme)])
-api_router.include_router(chat_logs.router, dependencies=[Security(azure_scheme)])
+api_router.include_router(tenants.router, dependencies=authenticated)
+api_router.include_router(users.router, dependencies=authenticated)
+api_router.include_router(chat_sessions.router, dependencies=authenticated)
+api_router.include_router(chat_logs.router, dependencies=authenticated)
+api_router.include_router(articles.router, dependencies=authenticated)
+api_router.include_router(translations.router, dependencies=authenticated)
+api_router.include_router(summaries.router, dependencies=authenticated)
+api_router.include_router(jobs.router, dependencies=authenticated)
 api_router.include_router(utils.router)
@@ -0,0 +1,181 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import UUID4
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import (
+    get_db,
+)
+from app.api.idempotency import IdempotentRoute, idempotency_key
+from app.api.message_utils import (
+    delete_return_msg,
+)
+from app.core.schemas import (
+    ArticleCreate,
+    ArticlePublic,
+    ArticleSearchParams,
+    ArticleSearchResult,
+    ArticleUpdate,
+    BatchGetRequest,
+    BatchGetResponse,
+    FilterParams,
+)
+from app.crud import CRUD_articles
+from app.crud.tenancy import current_tenant_id
+from app.exceptions import TenantAccessDeniedError
+from app.services.retrieval import article_retriever
+
+router = APIRouter(prefix="/articles", tags=["articles"], route_class=IdempotentRoute)
+
+
+@router.get(
+    "/search",
+    response_model=list[ArticleSearchResult],
+)
+async def search_articles(
+    search_params: Annotated[ArticleSearchParams, Query()],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Hybrid search for articles of a tenant, optionally in one `language`.
+
+    Full text and vector search results are fused with reciprocal rank fusion.
+
+    Returns the articles ordered by descending relevance.
+    """
+    tenant_id = current_tenant_id.get()
+    if tenant_id is not None and search_params.tenant_id != tenant_id:
+        raise TenantAccessDeniedError(
+            detail="Articles of other tenants can't be searched.",
+            function_name=search_articles.__name__,
+        )
+
+    return await article_retriever.search(db=db, params=search_params)
+
+
+@router.get(
+    "/{article_id}",
+    response_model=ArticlePublic,
+)
+async def get_article(
+    article_id: UUID4,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get article by value for `article_id`.
+
+    Returns the article.
+    """
+
+    article_map = {"id": article_id}
+    article = await CRUD_articles.get(db=db, filters=article_map)
+
+    return article[0]
+
+
+@router.get(
+    "/",
+    response_model=list[ArticlePublic],
+)
+async def get_all_articles(
+    filter_params: Annotated[FilterParams, Query()],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get all articles.
+
+    Returns a list of all articles.
+    """
+
+    all_articles = await CRUD_articles.get_all(db=db, filter_params=filter_params)
+
+    return all_articles
+
+
+@router.post(
+    "/batch_get",
+    response_model=BatchGetResponse[ArticlePublic],
+)
+async def batch_get_articles(
+    batch_get: BatchGetRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get articles by `ids` in one query.
+
+    Returns the found articles in the order of `ids`, and the ids not found in
+    `missing`.
+    """
+    articles, missing = await CRUD_articles.get_many(db, batch_get.ids)
+
+    return BatchGetResponse[ArticlePublic](
+        data=[ArticlePublic.model_validate(obj) for obj in articles],
+        missing=missing,
+    )
+
+
+@router.post(
+    "/",
+    response_model=list[ArticlePublic],
+    dependencies=[Depends(idempotency_key)],
+)
+async def create_article(
+    articles: ArticleCreate | list[ArticleCreate],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Create a list of articles and index them for search.
+
+    Returns the list of articles.
+    """
+    created_articles = await CRUD_articles.create(db=db, obj_in=articles)
+
+    await article_retriever.index(created_articles)
+
+    return created_articles
+
+
+@router.patch(
+    "/{article_id}",
+    response_model=ArticlePublic,
+)
+async def update_article(
+    article_id: UUID4,
+    article_update: ArticleUpdate,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Update an article by value for `article_id` and reindex it for search.
+
+    Returns the updated article.
+    """
+    updated_article = await CRUD_articles.update(
+        db=db, obj_id=article_id, obj_in=article_update
+    )
+
+    await article_retriever.index([updated_article])
+
+    return ArticlePublic.model_validate(updated_article)
+
+
+@router.delete(
+    "/{article_id}",
+    response_model=str,
+)
+async def delete_article(
+    article_id: UUID4,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete an article by value for `article_id`, including its search vector.
+
+    Returns a message indicating the article was deleted.
+    """
+
+    article_map = {"id": article_id}
+    await CRUD_articles.delete(db=db, filters=article_map)
+
+    await article_retriever.remove([article_id])
+
+    return delete_return_msg(objs="Article", filters=article_map).message
@@ -1,23 +1,45 @@
 from typing import Annotated
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import (
+    get_chat_generator,
     get_db,
 )
+from app.api.http_cache import conditional_response, content_etag
+from app.api.idempotency import IdempotentRoute, idempotency_key
 from app.api.message_utils import (
     delete_return_msg,
 )
+from app.core.config import settings
 from app.core.schemas import (
+    BatchGetRequest,
+    BatchGetResponse,
+    BulkSelection,
+    BulkUpdateRequest,
+    ChatLogBulkUpdate,
     ChatLogCreate,
+    ChatLogGenerate,
     ChatLogPublic,
     FilterParams,
+    JobPublic,
 )
-from app.crud import CRUD_chat_logs
+from app.crud import CRUD_chat_logs, CRUD_chat_sessions
+from app.crud.tenancy import current_tenant_id
+from app.exceptions import TenantAccessDeniedError
+from app.services.bulk import enqueue_bulk_delete, enqueue_bulk_update
+from app.services.generation import ChatGenerator
+from app.services.job_handlers import (
+    enqueue_delete_chat_log_points,
+    enqueue_index_chat_logs,
+)
+from app.services.jobs import get_job
 
-router = APIRouter(prefix="/chat_logs", tags=["chat_logs"])
+router = APIRouter(prefix="/chat_logs", tags=["chat_logs"], route_class=IdempotentRoute)
 
 
 @router.get(
@@ -26,18 +48,30 @@ router = APIRouter(prefix="/chat_logs", tags=["chat_logs"])
 )
 async def get_chat_log(
     chat_log_id: UUID4,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get chat log by value for `chat_log_id`.
 
-    Returns the chat log.
+    Returns the chat log, or `304 Not Modified` if `If-None-Match` matches its ETag.
     """
 
     chat_log_map = {"id": chat_log_id}
     chat_log = await CRUD_chat_logs.get(db=db, filters=chat_log_map)
 
-    return chat_log[0]
+    chat_log_public = ChatLogPublic.model_validate(chat_log[0])
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=content_etag(chat_log_public),
+        cache_control=settings.CACHE_CONTROL_CHAT_LOGS,
+    )
+    if not_modified:
+        return not_modified
+
+    return chat_log_public
 
 
 @router.get(
@@ -59,9 +93,77 @@ async def get_all_chat_logs(
     return all_chat_logs
 
 
+@router.post(
+    "/batch_get",
+    response_model=BatchGetResponse[ChatLogPublic],
+)
+async def batch_get_chat_logs(
+    batch_get: BatchGetRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get chat logs by `ids` in one query.
+
+    Returns the found chat logs in the order of `ids`, and the ids not found in
+    `missing`.
+    """
+    chat_logs, missing = await CRUD_chat_logs.get_many(db, batch_get.ids)
+
+    return BatchGetResponse[ChatLogPublic](
+        data=[ChatLogPublic.model_validate(obj) for obj in chat_logs],
+        missing=missing,
+    )
+
+
+@router.post(
+    "/bulk_delete",
+    response_model=JobPublic,
+    status_code=202,
+)
+async def bulk_delete_chat_logs(
+    selection: BulkSelection,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete chat logs by `ids` or matching `filters` in a background job.
+
+    The rows are deleted in chunks, each in its own transaction.
+
+    Returns the job, follow its progress at `GET /jobs/{job_id}`.
+    """
+    job_id = await enqueue_bulk_delete(db, crud=CRUD_chat_logs, selection=selection)
+
+    return JobPublic.model_validate(await get_job(db, job_id))
+
+
+@router.post(
+    "/bulk_update",
+    response_model=JobPublic,
+    status_code=202,
+)
+async def bulk_update_chat_logs(
+    bulk_update: BulkUpdateRequest[ChatLogBulkUpdate],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Set the fields given in `values` on chat logs by `ids` or matching `filters`
+    in a background job.
+
+    The rows are updated in chunks, each in its own transaction.
+
+    Returns the job, follow its progress at `GET /jobs/{job_id}`.
+    """
+    job_id = await enqueue_bulk_update(
+        db, crud=CRUD_chat_logs, selection=bulk_update, values=bulk_update.values
+    )
+
+    return JobPublic.model_validate(await get_job(db, job_id))
+
+
 @router.post(
     "/",
     response_model=list[ChatLogPublic] | None,
+    dependencies=[Depends(idempotency_key)],
 )
 async def create_chat_log(
     chat_logs: ChatLogCreate | list[ChatLogCreate],
@@ -71,15 +173,66 @@ async def create_chat_log(
     """
     Create a list of chat logs.
 
+    The chat logs are indexed for vector search by a background job.
+
     Returns the list of chat logs.
     """
-    created_chat_logs = await CRUD_chat_logs.create(
-        db=db, obj_in=chat_logs, return_nothing=return_nothing
-    )
+    if current_tenant_id.get() is not None:
+        # Chat logs have no tenant of their own, their chat sessions must be visible
+        chat_session_ids = [
+            chat_log.chat_session_id
+            for chat_log in (chat_logs if isinstance(chat_logs, list) else [chat_logs])
+        ]
+        _, missing = await CRUD_chat_sessions.get_many(db, chat_session_ids)
+        if missing:
+            raise TenantAccessDeniedError(
+                model_table_name=CRUD_chat_logs.model.__tablename__,
+                function_name=create_chat_log.__name__,
+            )
+
+    async with db.begin():
+        # The ids are needed for the job, so the rows are always returned
+        created_chat_logs = await CRUD_chat_logs.create(db=db, obj_in=chat_logs)
+        await enqueue_index_chat_logs(db, chat_logs=created_chat_logs)
+
+    if return_nothing:
+        return None
 
     return created_chat_logs
 
 
+@router.post(
+    "/generate",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def generate_chat_log(
+    chat_log_generate: ChatLogGenerate,
+    db: AsyncSession = Depends(get_db),
+    generator: ChatGenerator = Depends(get_chat_generator),
+):
+    """
+    Generate a response to `prompt` in the chat session `chat_session_id`.
+
+    Streams server-sent events: a `token` event per generated token, then a `done`
+    event with the id of the chat log. The chat log is stored after the stream ends.
+    """
+    chat_session_map = {"id": chat_log_generate.chat_session_id}
+    await CRUD_chat_sessions.get(db=db, filters=chat_session_map)
+
+    events = generator.stream(
+        chat_log_id=uuid4(),
+        chat_session_id=chat_log_generate.chat_session_id,
+        prompt=chat_log_generate.prompt,
+    )
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete(
     "/{chat_log_id}",
     response_model=str,
@@ -91,10 +244,14 @@ async def delete_chat_log(
     """
     Delete a chat log by value for `chat_log_id`.
 
+    Its vector search point is deleted by a background job.
+
     Returns a message indicating the chat log was deleted.
     """
 
     chat_log_map = {"id": chat_log_id}
-    await CRUD_chat_logs.delete(db=db, filters=chat_log_map)
+    async with db.begin():
+        await CRUD_chat_logs.delete(db=db, filters=chat_log_map)
+        await enqueue_delete_chat_log_points(db, chat_log_ids=[chat_log_id])
 
     return delete_return_msg(objs="Chat log", filters=chat_log_map).message
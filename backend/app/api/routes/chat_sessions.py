@@ -1,23 +1,42 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import (
     get_db,
 )
+from app.api.http_cache import conditional_response, content_etag
+from app.api.idempotency import IdempotentRoute, idempotency_key
 from app.api.message_utils import (
     delete_return_msg,
 )
+from app.core.config import settings
 from app.core.schemas import (
+    BatchGetRequest,
+    BatchGetResponse,
+    BulkSelection,
+    BulkUpdateRequest,
+    ChatLogPublic,
+    ChatSessionBulkUpdate,
     ChatSessionCreate,
     ChatSessionPublic,
     FilterParams,
+    JobPublic,
+    KeysetParams,
+    Page,
+)
+from app.crud import CRUD_chat_logs, CRUD_chat_sessions, CRUD_users
+from app.crud.tenancy import current_tenant_id
+from app.exceptions import TenantAccessDeniedError
+from app.services.bulk import enqueue_bulk_delete, enqueue_bulk_update
+from app.services.job_handlers import enqueue_delete_chat_log_points
+from app.services.jobs import get_job
+
+router = APIRouter(
+    prefix="/chat_sessions", tags=["chat_sessions"], route_class=IdempotentRoute
 )
-from app.crud import CRUD_chat_sessions
-
-router = APIRouter(prefix="/chat_sessions", tags=["chat_sessions"])
 
 
 @router.get(
@@ -26,18 +45,59 @@ router = APIRouter(prefix="/chat_sessions", tags=["chat_sessions"])
 )
 async def get_chat_session(
     chat_session_id: UUID4,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get chat session by value for `chat_session_id`.
 
-    Returns the chat session.
+    Returns the chat session, or `304 Not Modified` if `If-None-Match` matches
+    its ETag.
     """
 
     chat_session_map = {"id": chat_session_id}
     chat_session = await CRUD_chat_sessions.get(db=db, filters=chat_session_map)
 
-    return chat_session[0]
+    chat_session_public = ChatSessionPublic.model_validate(chat_session[0])
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=content_etag(chat_session_public),
+        cache_control=settings.CACHE_CONTROL,
+    )
+    if not_modified:
+        return not_modified
+
+    return chat_session_public
+
+
+@router.get(
+    "/{chat_session_id}/chat_logs",
+    response_model=Page[ChatLogPublic],
+)
+async def get_chat_session_chat_logs(
+    chat_session_id: UUID4,
+    keyset_params: Annotated[KeysetParams, Query()],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the chat logs of the chat session `chat_session_id`, oldest first.
+
+    Returns a page of chat logs, pass `next_cursor` as `cursor` for the next page.
+    """
+    chat_logs, next_cursor = await CRUD_chat_logs.get_page(
+        db, {"chat_session_id": chat_session_id}, keyset_params=keyset_params
+    )
+
+    # An empty first page can also be a missing chat session
+    if not chat_logs and keyset_params.cursor is None:
+        await CRUD_chat_sessions.get(db=db, filters={"id": chat_session_id})
+
+    return Page[ChatLogPublic](
+        data=[ChatLogPublic.model_validate(chat_log) for chat_log in chat_logs],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get(
@@ -61,9 +121,77 @@ async def get_all_chat_sessions(
     return all_chat_sessions
 
 
+@router.post(
+    "/batch_get",
+    response_model=BatchGetResponse[ChatSessionPublic],
+)
+async def batch_get_chat_sessions(
+    batch_get: BatchGetRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get chat sessions by `ids` in one query.
+
+    Returns the found chat sessions in the order of `ids`, and the ids not found in
+    `missing`.
+    """
+    chat_sessions, missing = await CRUD_chat_sessions.get_many(db, batch_get.ids)
+
+    return BatchGetResponse[ChatSessionPublic](
+        data=[ChatSessionPublic.model_validate(obj) for obj in chat_sessions],
+        missing=missing,
+    )
+
+
+@router.post(
+    "/bulk_delete",
+    response_model=JobPublic,
+    status_code=202,
+)
+async def bulk_delete_chat_sessions(
+    selection: BulkSelection,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete chat sessions by `ids` or matching `filters` in a background job.
+
+    The rows are deleted in chunks, each in its own transaction.
+
+    Returns the job, follow its progress at `GET /jobs/{job_id}`.
+    """
+    job_id = await enqueue_bulk_delete(db, crud=CRUD_chat_sessions, selection=selection)
+
+    return JobPublic.model_validate(await get_job(db, job_id))
+
+
+@router.post(
+    "/bulk_update",
+    response_model=JobPublic,
+    status_code=202,
+)
+async def bulk_update_chat_sessions(
+    bulk_update: BulkUpdateRequest[ChatSessionBulkUpdate],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Set the fields given in `values` on chat sessions by `ids` or matching `filters`
+    in a background job.
+
+    The rows are updated in chunks, each in its own transaction.
+
+    Returns the job, follow its progress at `GET /jobs/{job_id}`.
+    """
+    job_id = await enqueue_bulk_update(
+        db, crud=CRUD_chat_sessions, selection=bulk_update, values=bulk_update.values
+    )
+
+    return JobPublic.model_validate(await get_job(db, job_id))
+
+
 @router.post(
     "/",
     response_model=list[ChatSessionPublic] | None,
+    dependencies=[Depends(idempotency_key)],
 )
 async def create_chat_session(
     chat_sessions: ChatSessionCreate | list[ChatSessionCreate],
@@ -75,6 +203,21 @@ async def create_chat_session(
 
     Returns the list of chat sessions.
     """
+    if current_tenant_id.get() is not None:
+        # ``check_tenant`` only sees ``tenant_id``, their users must be visible too
+        user_ids = [
+            chat_session.user_id
+            for chat_session in (
+                chat_sessions if isinstance(chat_sessions, list) else [chat_sessions]
+            )
+        ]
+        _, missing = await CRUD_users.get_many(db, user_ids)
+        if missing:
+            raise TenantAccessDeniedError(
+                model_table_name=CRUD_chat_sessions.model.__tablename__,
+                function_name=create_chat_session.__name__,
+            )
+
     created_chat_sessions = await CRUD_chat_sessions.create(
         db=db, obj_in=chat_sessions, return_nothing=return_nothing
     )
@@ -93,10 +236,14 @@ async def delete_chat_session(
     """
     Delete a chat session by value for `chat_session_id`.
 
+    The vector search points of its chat logs are deleted by a background job.
+
     Returns a message indicating the chat session was deleted.
     """
 
     chat_session_map = {"id": chat_session_id}
-    await CRUD_chat_sessions.delete(db=db, filters=chat_session_map)
+    async with db.begin():
+        await CRUD_chat_sessions.delete(db=db, filters=chat_session_map)
+        await enqueue_delete_chat_log_points(db, chat_session_ids=[chat_session_id])
 
     return delete_return_msg(objs="Chat session", filters=chat_session_map).message
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from pydantic import UUID4
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import (
+    get_db,
+)
+from app.core.schemas import JobPublic
+from app.services.jobs import get_job
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobPublic,
+)
+async def get_job_status(
+    job_id: UUID4,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get background job by value for `job_id`.
+
+    Returns the job with its status and the progress reported so far.
+    """
+
+    job = await get_job(db, job_id)
+
+    return JobPublic.model_validate(job)
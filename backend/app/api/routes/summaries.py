@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import (
+    get_db,
+    get_summarizer,
+)
+from app.core.schemas import (
+    SummarizeRequest,
+    SummarizeResponse,
+)
+from app.crud import CRUD_articles
+from app.services.summarization import Summarizer
+
+router = APIRouter(prefix="/summarize", tags=["summaries"])
+
+
+@router.post(
+    "/",
+    response_model=SummarizeResponse,
+)
+async def summarize(
+    summarize_request: SummarizeRequest,
+    db: AsyncSession = Depends(get_db),
+    summarizer: Summarizer = Depends(get_summarizer),
+):
+    """
+    Summarize `text`, or the stored article with value for `article_id`.
+
+    Long texts are summarized chunk by chunk and the chunk summaries combined.
+    Chunk summaries are cached, so an edited article only resummarizes
+    the changed chunks.
+
+    Returns the summary with the number of chunks and cached chunks.
+    """
+    if summarize_request.text is not None:
+        text = summarize_request.text
+    else:
+        article_map = {"id": summarize_request.article_id}
+        article = await CRUD_articles.get(db=db, filters=article_map)
+        text = f"{article[0].title}\n\n{article[0].body}"
+
+    result = await summarizer.summarize(text, max_words=summarize_request.max_words)
+
+    return SummarizeResponse(
+        summary=result.summary,
+        chunks=result.chunks,
+        cached_chunks=result.cached_chunks,
+    )
@@ -1,24 +1,37 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import (
     get_db,
 )
+from app.api.http_cache import conditional_response, content_etag
+from app.api.idempotency import IdempotentRoute, idempotency_key
 from app.api.message_utils import (
     delete_return_msg,
 )
+from app.core.config import settings
 from app.core.schemas import (
+    BatchGetRequest,
+    BatchGetResponse,
+    BulkSelection,
+    BulkUpdateRequest,
     FilterParams,
+    JobPublic,
+    TenantBulkUpdate,
     TenantCreate,
     TenantPublic,
     TenantUpdate,
 )
 from app.crud import CRUD_tenants
+from app.crud.tenancy import current_tenant_id
+from app.exceptions import TenantAccessDeniedError
+from app.services.bulk import enqueue_bulk_delete, enqueue_bulk_update
+from app.services.jobs import get_job
 
-router = APIRouter(prefix="/tenants", tags=["tenants"])
+router = APIRouter(prefix="/tenants", tags=["tenants"], route_class=IdempotentRoute)
 
 
 @router.get(
@@ -27,18 +40,30 @@ router = APIRouter(prefix="/tenants", tags=["tenants"])
 )
 async def get_tenant(
     tenant_id: UUID4,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get tenant by value for `tenant_id`.
 
-    Returns the tenant.
+    Returns the tenant, or `304 Not Modified` if `If-None-Match` matches its ETag.
     """
 
     tenant_map = {"id": tenant_id}
     tenant = await CRUD_tenants.get(db=db, filters=tenant_map)
 
-    return tenant[0]
+    tenant_public = TenantPublic.model_validate(tenant[0])
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=content_etag(tenant_public),
+        cache_control=settings.CACHE_CONTROL,
+    )
+    if not_modified:
+        return not_modified
+
+    return tenant_public
 
 
 @router.get(
@@ -60,9 +85,77 @@ async def get_all_tenants(
     return all_tenants
 
 
+@router.post(
+    "/batch_get",
+    response_model=BatchGetResponse[TenantPublic],
+)
+async def batch_get_tenants(
+    batch_get: BatchGetRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get tenants by `ids` in one query.
+
+    Returns the found tenants in the order of `ids`, and the ids not found in
+    `missing`.
+    """
+    tenants, missing = await CRUD_tenants.get_many(db, batch_get.ids)
+
+    return BatchGetResponse[TenantPublic](
+        data=[TenantPublic.model_validate(obj) for obj in tenants],
+        missing=missing,
+    )
+
+
+@router.post(
+    "/bulk_delete",
+    response_model=JobPublic,
+    status_code=202,
+)
+async def bulk_delete_tenants(
+    selection: BulkSelection,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete tenants by `ids` or matching `filters` in a background job.
+
+    The rows are deleted in chunks, each in its own transaction.
+
+    Returns the job, follow its progress at `GET /jobs/{job_id}`.
+    """
+    job_id = await enqueue_bulk_delete(db, crud=CRUD_tenants, selection=selection)
+
+    return JobPublic.model_validate(await get_job(db, job_id))
+
+
+@router.post(
+    "/bulk_update",
+    response_model=JobPublic,
+    status_code=202,
+)
+async def bulk_update_tenants(
+    bulk_update: BulkUpdateRequest[TenantBulkUpdate],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Set the fields given in `values` on tenants by `ids` or matching `filters`
+    in a background job.
+
+    The rows are updated in chunks, each in its own transaction.
+
+    Returns the job, follow its progress at `GET /jobs/{job_id}`.
+    """
+    job_id = await enqueue_bulk_update(
+        db, crud=CRUD_tenants, selection=bulk_update, values=bulk_update.values
+    )
+
+    return JobPublic.model_validate(await get_job(db, job_id))
+
+
 @router.post(
     "/",
     response_model=list[TenantPublic] | None,
+    dependencies=[Depends(idempotency_key)],
 )
 async def create_tenant(
     tenants: TenantCreate | list[TenantCreate],
@@ -70,10 +163,15 @@ async def create_tenant(
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Create a list of tenants.
+    Create a list of tenants. Only tokens of the platform tenant can create tenants.
 
     Returns the list of tenants.
     """
+    if current_tenant_id.get() is not None:
+        raise TenantAccessDeniedError(
+            model_table_name=CRUD_tenants.model.__tablename__,
+            function_name=create_tenant.__name__,
+        )
     created_tenants = await CRUD_tenants.create(
         db=db, obj_in=tenants, return_nothing=return_nothing
     )
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import (
+    get_translation_batcher,
+)
+from app.core.schemas import (
+    TranslationRequest,
+    TranslationResponse,
+)
+from app.services.translation import TranslationBatcher
+
+router = APIRouter(prefix="/translate", tags=["translations"])
+
+
+@router.post(
+    "/",
+    response_model=TranslationResponse,
+)
+async def translate(
+    translation_request: TranslationRequest,
+    batcher: TranslationBatcher = Depends(get_translation_batcher),
+):
+    """
+    Translate `segments` from `source_language` to `target_language`.
+
+    Segments are batched with concurrent requests and cached, so prefer
+    sending an article as many small segments (e.g. paragraphs).
+
+    Returns the translations in the same order as the segments.
+    """
+    translations = await batcher.translate(
+        translation_request.segments,
+        source_language=translation_request.source_language,
+        target_language=translation_request.target_language,
+    )
+
+    return TranslationResponse(
+        translations=translations,
+        source_language=translation_request.source_language,
+        target_language=translation_request.target_language,
+    )
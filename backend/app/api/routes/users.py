@@ -1,26 +1,46 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.api.deps import (
     get_db,
+    get_user_data_manager,
 )
+from app.api.http_cache import conditional_response, weak_etag
+from app.api.idempotency import IdempotentRoute, idempotency_key
 from app.api.message_utils import (
     delete_return_msg,
 )
+from app.core.config import settings
+from app.core.models import ChatSession
 from app.core.schemas import (
+    BatchGetRequest,
+    BatchGetResponse,
+    BulkSelection,
+    BulkUpdateRequest,
+    ChatSessionPageParams,
+    ChatSessionPublic,
+    ChatSessionWithChatLogs,
     FilterParams,
+    JobPublic,
     Message,
+    Page,
+    UserBulkUpdate,
     UserCreate,
     UserPublic,
     UsersPublic,
     UserUpdate,
 )
-from app.crud import CRUD_users
+from app.crud import CRUD_chat_sessions, CRUD_users
+from app.services.bulk import enqueue_bulk_delete, enqueue_bulk_update
+from app.services.jobs import get_job
+from app.services.user_data import UserDataManager, enqueue_erase_user
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=IdempotentRoute)
 
 
 @router.get(
@@ -29,22 +49,133 @@ router = APIRouter(prefix="/users", tags=["users"])
 )
 async def get_user(
     user_id: UUID4,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get chat session by value for `user_id`.
 
-    Always returns one user.
+    Always returns one user, or `304 Not Modified` if `If-None-Match` matches its ETag.
     """
 
     user_map = {"id": user_id}
     user = await CRUD_users.get(db=db, filters=user_map)
 
+    # Every change of a user sets `updated_at`
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=weak_etag(user[0].id, user[0].updated_at or user[0].created_at),
+        cache_control=settings.CACHE_CONTROL,
+    )
+    if not_modified:
+        return not_modified
+
     user_public = UserPublic.model_validate(user[0])
 
     return user_public
 
 
+@router.get(
+    "/{user_id}/chat_sessions",
+    response_model=Page[ChatSessionPublic] | Page[ChatSessionWithChatLogs],
+)
+async def get_user_chat_sessions(
+    user_id: UUID4,
+    page_params: Annotated[ChatSessionPageParams, Query()],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the chat sessions of the user `user_id`, newest first.
+
+    With `include=chat_logs` the chat logs of each session are included, loaded
+    in one extra query for the whole page.
+
+    Returns a page of chat sessions, pass `next_cursor` as `cursor` for the next page.
+    """
+    # FastAPI only reads a query model from the query when it's the only
+    # query parameter, so `include` is part of it
+    include_chat_logs = page_params.include == "chat_logs"
+    options = [selectinload(ChatSession.chat_logs)] if include_chat_logs else []
+    chat_sessions, next_cursor = await CRUD_chat_sessions.get_page(
+        db,
+        {"user_id": user_id},
+        keyset_params=page_params,
+        descending=True,
+        options=options,
+    )
+
+    # An empty first page can also be a missing user
+    if not chat_sessions and page_params.cursor is None:
+        await CRUD_users.get(db=db, filters={"id": user_id})
+
+    if include_chat_logs:
+        return Page[ChatSessionWithChatLogs](
+            data=[
+                ChatSessionWithChatLogs.model_validate(chat_session)
+                for chat_session in chat_sessions
+            ],
+            next_cursor=next_cursor,
+        )
+    return Page[ChatSessionPublic](
+        data=[
+            ChatSessionPublic.model_validate(chat_session)
+            for chat_session in chat_sessions
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/{user_id}/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/gzip": {}}}},
+)
+async def export_user(
+    user_id: UUID4,
+    db: AsyncSession = Depends(get_db),
+    user_data: UserDataManager = Depends(get_user_data_manager),
+):
+    """
+    Export all data of the user `user_id`: the user, its chat sessions and their
+    chat logs.
+
+    Streams a gzip compressed NDJSON file, one `{"table": ..., "data": ...}`
+    object per line.
+    """
+    await CRUD_users.get(db=db, filters={"id": user_id})
+
+    return StreamingResponse(
+        user_data.export(user_id),
+        media_type="application/gzip",
+        headers={
+            "Content-Disposition": f'attachment; filename="user-{user_id}.ndjson.gz"'
+        },
+    )
+
+
+@router.post(
+    "/{user_id}/erase",
+    response_model=JobPublic,
+    status_code=202,
+)
+async def erase_user(
+    user_id: UUID4,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Erase the user `user_id` and all its data in a background job, including the
+    chat logs in the vector db.
+
+    Returns the job, follow its progress at `GET /jobs/{job_id}`.
+    """
+    user = await CRUD_users.get(db=db, filters={"id": user_id})
+    job_id = await enqueue_erase_user(db, user=user[0])
+
+    return JobPublic.model_validate(await get_job(db, job_id))
+
+
 @router.get("/", response_model=UsersPublic)
 async def get_all_users(
     filter_params: Annotated[FilterParams, Query()],
@@ -62,16 +193,85 @@ async def get_all_users(
         UserPublic.model_validate(user) for user in all_users
     ]
 
-    users_count = await CRUD_users.get_count_all(db)
+    # The total of the filtered users, without the limit and offset of the page
+    users_count = await CRUD_users.get_count_all(db, filter_params=filter_params)
 
     users_public = UsersPublic(data=user_public_list, count=users_count)
 
     return users_public
 
 
+@router.post(
+    "/batch_get",
+    response_model=BatchGetResponse[UserPublic],
+)
+async def batch_get_users(
+    batch_get: BatchGetRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get users by `ids` in one query.
+
+    Returns the found users in the order of `ids`, and the ids not found in
+    `missing`.
+    """
+    users, missing = await CRUD_users.get_many(db, batch_get.ids)
+
+    return BatchGetResponse[UserPublic](
+        data=[UserPublic.model_validate(obj) for obj in users],
+        missing=missing,
+    )
+
+
+@router.post(
+    "/bulk_delete",
+    response_model=JobPublic,
+    status_code=202,
+)
+async def bulk_delete_users(
+    selection: BulkSelection,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete users by `ids` or matching `filters` in a background job.
+
+    The rows are deleted in chunks, each in its own transaction.
+
+    Returns the job, follow its progress at `GET /jobs/{job_id}`.
+    """
+    job_id = await enqueue_bulk_delete(db, crud=CRUD_users, selection=selection)
+
+    return JobPublic.model_validate(await get_job(db, job_id))
+
+
+@router.post(
+    "/bulk_update",
+    response_model=JobPublic,
+    status_code=202,
+)
+async def bulk_update_users(
+    bulk_update: BulkUpdateRequest[UserBulkUpdate],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Set the fields given in `values` on users by `ids` or matching `filters`
+    in a background job.
+
+    The rows are updated in chunks, each in its own transaction.
+
+    Returns the job, follow its progress at `GET /jobs/{job_id}`.
+    """
+    job_id = await enqueue_bulk_update(
+        db, crud=CRUD_users, selection=bulk_update, values=bulk_update.values
+    )
+
+    return JobPublic.model_validate(await get_job(db, job_id))
+
+
 @router.post(
     "/",
     response_model=UserPublic,
+    dependencies=[Depends(idempotency_key)],
 )
 async def create_user(
     user: UserCreate,
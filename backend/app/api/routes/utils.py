@@ -1,8 +1,55 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response, Security, status
+
+from app.api.deps import (
+    get_loop_lag_monitor,
+    get_readiness_probe,
+)
+from app.core.schemas import LoopLagHistogram, Readiness
+from app.core.security import azure_scheme
+from app.services.loop_lag import LoopLagMonitor
+from app.services.readiness import ReadinessProbe
 
 router = APIRouter(prefix="/utils", tags=["utils"])
 
 
 @router.get("/health-check/")
 async def health_check() -> bool:
+    """Liveness, true while the process serves requests at all."""
     return True
+
+
+@router.get(
+    "/ready",
+    response_model=Readiness,
+)
+async def ready(
+    response: Response,
+    readiness_probe: ReadinessProbe = Depends(get_readiness_probe),
+) -> Readiness:
+    """
+    Readiness: the warm-up after startup is done, Postgres and Qdrant answer, and
+    neither the pool wait nor the event loop lag is above its threshold. Checks
+    are cached for ``READINESS_CACHE_TTL_SECONDS``, probes stay cheap.
+
+    Returns the result of each check, with status 503 while not ready.
+    """
+    readiness = await readiness_probe.check()
+    if not readiness.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
+
+
+@router.get(
+    "/loop-lag",
+    response_model=LoopLagHistogram,
+    dependencies=[Security(azure_scheme)],
+)
+async def loop_lag(
+    loop_lag_monitor: LoopLagMonitor = Depends(get_loop_lag_monitor),
+) -> LoopLagHistogram:
+    """
+    Histogram of this worker's event loop lag since startup, how late the loop
+    woke up from sleeps sampled every ``LOOP_LAG_SAMPLE_INTERVAL_SECONDS``.
+    Empty while ``LOOP_LAG_MONITOR_ENABLED`` is off.
+    """
+    return loop_lag_monitor.histogram.snapshot()
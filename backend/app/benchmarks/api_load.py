@@ -0,0 +1,528 @@
+"""
+Throughput, latency and allocation benchmark for the API routes.
+
+Needs the Postgres service from docker compose. Run with:
+
+    python -m app.benchmarks.api_load --transport asgi --requests 2000 --concurrency 16
+    python -m app.benchmarks.api_load --transport uvicorn --chat-logs 100000
+
+The real ``app.main.app`` is driven either in process through httpx's ASGI
+transport, which measures the app alone, or over TCP through a uvicorn server
+started in the same process, which adds the HTTP server and the network stack.
+Authentication is overridden with an identity of ``FIRST_SUPERUSER_TENANT_ID``, so
+no Entra ID token is needed, and the app's lifespan doesn't run.
+
+Temporary tenants are seeded with the configured row counts per table and deleted
+afterwards. Routes that need Qdrant or the LLM (search, translations, summaries,
+generation) and routes that delete data are not part of the run, see
+``app.benchmarks.article_search`` for search.
+
+Results are printed as JSON, one entry per route with req/s, p50/p95/p99 latency,
+errors and allocations, together with the commit and the parameters of the run, so
+runs of different commits can be compared. Allocations are measured in a separate
+sequential pass under tracemalloc, as the peak of memory allocated while serving
+one request, client included.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID, uuid4
+
+import httpx
+import uvicorn
+from fastapi_azure_auth.user import User as AzureUser
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import rate_limit
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, engine
+from app.core.models import ChatSession, Tenant, User
+from app.core.schemas import (
+    ArticleCreate,
+    ChatLogCreate,
+    ChatSessionCreate,
+    TenantCreate,
+    UserCreate,
+)
+from app.core.security import azure_scheme
+from app.crud import (
+    CRUD_articles,
+    CRUD_chat_logs,
+    CRUD_chat_sessions,
+    CRUD_tenants,
+    CRUD_users,
+)
+from app.main import app
+
+SEED_BATCH_SIZE = 1000
+
+
+@dataclass
+class Seeded:
+    """Seeded rows, or their ids, requests pick their path parameters from them."""
+
+    tenants: list[Tenant] = field(default_factory=list)
+    users: list[User] = field(default_factory=list)
+    chat_sessions: list[ChatSession] = field(default_factory=list)
+    chat_logs: list[UUID] = field(default_factory=list)
+    articles: list[UUID] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    # (rng, seeded) -> (path below API_V1_STR, JSON body)
+    request: Callable[[random.Random, Seeded], tuple[str, Any]]
+
+
+def _batch_ids(rng: random.Random, ids: list[Any], k: int = 50) -> dict[str, Any]:
+    return {"ids": [str(obj.id) for obj in rng.choices(ids, k=k)]}
+
+
+def _one(rng: random.Random, ids: list[Any]) -> Any:
+    return rng.choice(ids)
+
+
+def _update_tenant(rng: random.Random, seeded: Seeded) -> tuple[str, Any]:
+    tenant = _one(rng, seeded.tenants)
+    body = {
+        "company_name": tenant.company_name,
+        "entra_tenant_id": tenant.entra_tenant_id,
+        "settings": {"benchmark": str(rng.random())},
+    }
+    return f"/tenants/{tenant.id}", body
+
+
+def _create_chat_session(rng: random.Random, seeded: Seeded) -> tuple[str, Any]:
+    user = _one(rng, seeded.users)
+    return "/chat_sessions/", {
+        "user_id": str(user.id),
+        "tenant_id": str(user.tenant_id),
+    }
+
+
+SCENARIOS = [
+    Scenario(
+        "GET /utils/health-check/", "GET", lambda rng, s: ("/utils/health-check/", None)
+    ),
+    Scenario(
+        "GET /tenants/{tenant_id}",
+        "GET",
+        lambda rng, s: (f"/tenants/{_one(rng, s.tenants).id}", None),
+    ),
+    Scenario("GET /tenants/", "GET", lambda rng, s: ("/tenants/?limit=100", None)),
+    Scenario(
+        "POST /tenants/batch_get",
+        "POST",
+        lambda rng, s: ("/tenants/batch_get", _batch_ids(rng, s.tenants)),
+    ),
+    Scenario("PATCH /tenants/{tenant_id}", "PATCH", _update_tenant),
+    Scenario(
+        "GET /users/{user_id}",
+        "GET",
+        lambda rng, s: (f"/users/{_one(rng, s.users).id}", None),
+    ),
+    Scenario("GET /users/", "GET", lambda rng, s: ("/users/?limit=100", None)),
+    Scenario(
+        "POST /users/batch_get",
+        "POST",
+        lambda rng, s: ("/users/batch_get", _batch_ids(rng, s.users)),
+    ),
+    Scenario(
+        "GET /users/{user_id}/chat_sessions",
+        "GET",
+        lambda rng, s: (f"/users/{_one(rng, s.users).id}/chat_sessions", None),
+    ),
+    Scenario(
+        "GET /users/{user_id}/export",
+        "GET",
+        lambda rng, s: (f"/users/{_one(rng, s.users).id}/export", None),
+    ),
+    Scenario(
+        "GET /chat_sessions/{chat_session_id}",
+        "GET",
+        lambda rng, s: (f"/chat_sessions/{_one(rng, s.chat_sessions).id}", None),
+    ),
+    Scenario(
+        "GET /chat_sessions/{chat_session_id}/chat_logs",
+        "GET",
+        lambda rng, s: (
+            f"/chat_sessions/{_one(rng, s.chat_sessions).id}/chat_logs",
+            None,
+        ),
+    ),
+    Scenario(
+        "POST /chat_sessions/batch_get",
+        "POST",
+        lambda rng, s: ("/chat_sessions/batch_get", _batch_ids(rng, s.chat_sessions)),
+    ),
+    Scenario("POST /chat_sessions/", "POST", _create_chat_session),
+    Scenario(
+        "GET /chat_logs/{chat_log_id}",
+        "GET",
+        lambda rng, s: (f"/chat_logs/{_one(rng, s.chat_logs)}", None),
+    ),
+    Scenario(
+        "POST /chat_logs/batch_get",
+        "POST",
+        lambda rng, s: (
+            "/chat_logs/batch_get",
+            {"ids": [str(obj_id) for obj_id in rng.choices(s.chat_logs, k=50)]},
+        ),
+    ),
+    Scenario(
+        "GET /articles/{article_id}",
+        "GET",
+        lambda rng, s: (f"/articles/{_one(rng, s.articles)}", None),
+    ),
+    Scenario("GET /articles/", "GET", lambda rng, s: ("/articles/?limit=100", None)),
+    Scenario(
+        "POST /articles/batch_get",
+        "POST",
+        lambda rng, s: (
+            "/articles/batch_get",
+            {"ids": [str(obj_id) for obj_id in rng.choices(s.articles, k=50)]},
+        ),
+    ),
+]
+
+
+def _benchmark_user() -> AzureUser:
+    now = int(time.time())
+    return AzureUser(
+        aud=settings.APP_CLIENT_ID,
+        iss=f"https://sts.windows.net/{settings.FIRST_SUPERUSER_TENANT_ID}/",
+        iat=now,
+        nbf=now,
+        exp=now + 3600,
+        sub="api-load-benchmark",
+        ver="1.0",
+        tid=settings.FIRST_SUPERUSER_TENANT_ID,
+        claims={},
+        access_token="",
+    )
+
+
+async def _create_in_batches(
+    db: AsyncSession, crud: Any, objs_in: list[Any], *, keep_objs: bool
+) -> list[Any]:
+    created = []
+    for start in range(0, len(objs_in), SEED_BATCH_SIZE):
+        batch = await crud.create(db, obj_in=objs_in[start : start + SEED_BATCH_SIZE])
+        created.extend(batch if keep_objs else [obj.id for obj in batch])
+    return created
+
+
+async def seed_rows(
+    db: AsyncSession, *, rng: random.Random, rows: dict[str, int]
+) -> Seeded:
+    """
+    Seeds ``rows[table]`` rows per table, spread randomly over ``rows["tenants"]``
+    new tenants.
+    """
+    seeded = Seeded()
+    run_id = uuid4().hex[:8]
+    seeded.tenants = await _create_in_batches(
+        db,
+        CRUD_tenants,
+        [
+            TenantCreate(
+                company_name=f"API load benchmark {i}",
+                entra_tenant_id=f"benchmark-{run_id}-{i}",
+            )
+            for i in range(rows["tenants"])
+        ],
+        keep_objs=True,
+    )
+    seeded.users = await _create_in_batches(
+        db,
+        CRUD_users,
+        [
+            UserCreate(
+                email=f"benchmark-{run_id}-{i}@example.com",
+                full_name=f"Benchmark User {i}",
+                entra_id=f"benchmark-{run_id}-{i}",
+                tenant_id=_one(rng, seeded.tenants).id,
+            )
+            for i in range(rows["users"])
+        ],
+        keep_objs=True,
+    )
+    seeded.chat_sessions = await _create_in_batches(
+        db,
+        CRUD_chat_sessions,
+        [
+            ChatSessionCreate(user_id=user.id, tenant_id=user.tenant_id)
+            for user in rng.choices(seeded.users, k=rows["chat_sessions"])
+        ],
+        keep_objs=True,
+    )
+    seeded.chat_logs = await _create_in_batches(
+        db,
+        CRUD_chat_logs,
+        [
+            ChatLogCreate(
+                chat_session_id=chat_session.id,
+                prompt=f"Benchmark prompt {i}",
+                response_text=f"Benchmark response {i} " * rng.randint(5, 50),
+            )
+            for i, chat_session in enumerate(
+                rng.choices(seeded.chat_sessions, k=rows["chat_logs"])
+            )
+        ],
+        keep_objs=False,
+    )
+    seeded.articles = await _create_in_batches(
+        db,
+        CRUD_articles,
+        [
+            ArticleCreate(
+                tenant_id=tenant.id,
+                title=f"Benchmark article {i}",
+                body=f"Benchmark article body {i} " * rng.randint(50, 500),
+                language="en",
+            )
+            for i, tenant in enumerate(rng.choices(seeded.tenants, k=rows["articles"]))
+        ],
+        keep_objs=False,
+    )
+    return seeded
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    rng: random.Random,
+    seeded: Seeded,
+) -> bool:
+    path, body = scenario.request(rng, seeded)
+    response = await client.request(
+        scenario.method, f"{settings.API_V1_STR}{path}", json=body
+    )
+    await response.aread()
+    return response.is_success
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    seeded: Seeded,
+    *,
+    n_requests: int,
+    n_warmup: int,
+    concurrency: int,
+    n_alloc_requests: int,
+    seed: int,
+) -> dict[str, Any]:
+    rng = random.Random(seed)
+    for _ in range(n_warmup):
+        await _send(client, scenario, rng, seeded)
+
+    latencies_ms: list[float] = []
+    errors = 0
+    remaining = n_requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            ok = await _send(client, scenario, rng, seeded)
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    alloc_peaks_kib = []
+    tracemalloc.start()
+    try:
+        for _ in range(n_alloc_requests):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            await _send(client, scenario, rng, seeded)
+            _, peak = tracemalloc.get_traced_memory()
+            alloc_peaks_kib.append((peak - baseline) / 1024)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "route": scenario.name,
+        "requests": len(latencies_ms),
+        "errors": errors,
+        "req_per_s": round(len(latencies_ms) / seconds, 1),
+        "latency_p50_ms": round(_percentile(latencies_ms, 50), 3),
+        "latency_p95_ms": round(_percentile(latencies_ms, 95), 3),
+        "latency_p99_ms": round(_percentile(latencies_ms, 99), 3),
+        "alloc_peak_kib_p50": round(statistics.median(alloc_peaks_kib), 1)
+        if alloc_peaks_kib
+        else None,
+    }
+
+
+async def _run_scenarios(
+    client: httpx.AsyncClient, seeded: Seeded, **kwargs: Any
+) -> list[dict[str, Any]]:
+    selected = kwargs.pop("routes")
+    return [
+        await _run_scenario(client, scenario, seeded, **kwargs)
+        for scenario in SCENARIOS
+        if not selected or any(route in scenario.name for route in selected)
+    ]
+
+
+async def _run_uvicorn(
+    seeded: Seeded, *, port: int, **kwargs: Any
+) -> list[dict[str, Any]]:
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"
+        )
+    )
+    server_task = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if server_task.done():
+                server_task.result()
+            await asyncio.sleep(0.01)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            limits=httpx.Limits(max_connections=kwargs["concurrency"]),
+            timeout=60,
+        ) as client:
+            return await _run_scenarios(client, seeded, **kwargs)
+    finally:
+        server.should_exit = True
+        await server_task
+
+
+async def _run_asgi(seeded: Seeded, **kwargs: Any) -> list[dict[str, Any]]:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=60
+    ) as client:
+        return await _run_scenarios(client, seeded, **kwargs)
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(
+    *,
+    transport: str,
+    port: int,
+    rows: dict[str, int],
+    n_requests: int,
+    n_warmup: int,
+    concurrency: int,
+    n_alloc_requests: int,
+    routes: list[str],
+    seed: int,
+) -> dict[str, Any]:
+    app.dependency_overrides[azure_scheme] = _benchmark_user
+    # One user sending as fast as it can, the limits would be all it measures
+    app.dependency_overrides[rate_limit] = lambda: None
+    async with AsyncSessionLocal() as db:
+        seeded = await seed_rows(db, rng=random.Random(seed), rows=rows)
+        try:
+            kwargs = {
+                "n_requests": n_requests,
+                "n_warmup": n_warmup,
+                "concurrency": concurrency,
+                "n_alloc_requests": n_alloc_requests,
+                "routes": routes,
+                "seed": seed,
+            }
+            results = (
+                await _run_uvicorn(seeded, port=port, **kwargs)
+                if transport == "uvicorn"
+                else await _run_asgi(seeded, **kwargs)
+            )
+        finally:
+            tenant_ids = [tenant.id for tenant in seeded.tenants]
+            async with db.begin():
+                await db.execute(delete(Tenant).where(Tenant.id.in_(tenant_ids)))
+            app.dependency_overrides.pop(azure_scheme, None)
+            app.dependency_overrides.pop(rate_limit, None)
+
+    return {
+        "commit": _commit(),
+        "transport": transport,
+        "rows": rows,
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "seed": seed,
+        "routes": results,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--chat-sessions", type=int, default=5000)
+    parser.add_argument("--chat-logs", type=int, default=20_000)
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--alloc-requests", type=int, default=20)
+    parser.add_argument(
+        "--routes", nargs="*", default=[], help="Only routes containing any of these"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = await run(
+        transport=args.transport,
+        port=args.port,
+        rows={
+            "tenants": args.tenants,
+            "users": args.users,
+            "chat_sessions": args.chat_sessions,
+            "chat_logs": args.chat_logs,
+            "articles": args.articles,
+        },
+        n_requests=args.requests,
+        n_warmup=args.warmup,
+        concurrency=args.concurrency,
+        n_alloc_requests=args.alloc_requests,
+        routes=args.routes,
+        seed=args.seed,
+    )
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
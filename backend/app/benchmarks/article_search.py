@@ -0,0 +1,208 @@
+"""
+Recall and latency benchmark for hybrid article search on a synthetic corpus.
+
+Needs the Postgres and Qdrant services from docker compose. Run with:
+
+    python -m app.benchmarks.article_search --articles 10000 --queries 200
+
+A temporary tenant is created for the corpus and deleted afterwards. Results are
+printed as JSON, one entry per retrieval mode (text, vector, hybrid).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import string
+import time
+from collections.abc import Awaitable, Callable
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import AsyncSessionLocal, engine
+from app.core.models import Tenant
+from app.core.schemas import ArticleCreate, ArticleSearchParams, TenantCreate
+from app.crud import CRUD_articles, CRUD_tenants
+from app.services.retrieval import article_retriever
+
+LANGUAGES = ["en", "no", "de", "fr"]
+
+
+def _random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+
+def build_corpus(
+    *, tenant_id: UUID, n_articles: int, n_topics: int, seed: int
+) -> tuple[list[ArticleCreate], list[int], list[list[str]]]:
+    """
+    Articles are drawn from ``n_topics`` topics. Each topic has its own vocabulary,
+    and every article mixes words of its topic with shared filler words.
+
+    Returns the articles, the topic of each article and each topic's vocabulary.
+    """
+    rng = random.Random(seed)
+    filler = [_random_word(rng) for _ in range(2000)]
+    vocabularies = [[_random_word(rng) for _ in range(30)] for _ in range(n_topics)]
+
+    articles, topics = [], []
+    for _ in range(n_articles):
+        topic = rng.randrange(n_topics)
+        words = rng.choices(vocabularies[topic], k=40) + rng.choices(filler, k=160)
+        rng.shuffle(words)
+        articles.append(
+            ArticleCreate(
+                tenant_id=tenant_id,
+                title=" ".join(rng.choices(vocabularies[topic], k=5)),
+                body=" ".join(words),
+                language=rng.choice(LANGUAGES),
+            )
+        )
+        topics.append(topic)
+
+    return articles, topics, vocabularies
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _run_mode(
+    search: Callable[[ArticleSearchParams], Awaitable[list[UUID]]],
+    queries: list[tuple[ArticleSearchParams, set[UUID]]],
+) -> dict[str, float]:
+    latencies_ms, recalls = [], []
+    for params, relevant in queries:
+        start = time.perf_counter()
+        found = await search(params)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        expected = min(len(relevant), params.limit)
+        hits = len(relevant.intersection(found[: params.limit]))
+        recalls.append(hits / expected if expected else 1.0)
+
+    return {
+        "recall": statistics.fmean(recalls),
+        "latency_p50_ms": _percentile(latencies_ms, 50),
+        "latency_p95_ms": _percentile(latencies_ms, 95),
+        "latency_p99_ms": _percentile(latencies_ms, 99),
+    }
+
+
+async def run(
+    *, n_articles: int, n_queries: int, n_topics: int, limit: int, seed: int
+) -> dict[str, dict[str, float]]:
+    rng = random.Random(seed)
+
+    async with AsyncSessionLocal() as db:
+        tenant = (
+            await CRUD_tenants.create(
+                db,
+                obj_in=TenantCreate(
+                    company_name="Article search benchmark",
+                    entra_tenant_id=f"benchmark-{uuid4()}",
+                ),
+            )
+        )[0]
+        try:
+            return await _run_with_tenant(
+                db,
+                tenant_id=tenant.id,
+                rng=rng,
+                n_articles=n_articles,
+                n_queries=n_queries,
+                n_topics=n_topics,
+                limit=limit,
+                seed=seed,
+            )
+        finally:
+            async with db.begin():
+                await db.execute(delete(Tenant).where(Tenant.id == tenant.id))
+            await article_retriever.collection.delete_where(tenant_id=str(tenant.id))
+
+
+async def _run_with_tenant(
+    db: AsyncSession,
+    *,
+    tenant_id: UUID,
+    rng: random.Random,
+    n_articles: int,
+    n_queries: int,
+    n_topics: int,
+    limit: int,
+    seed: int,
+) -> dict[str, dict[str, float]]:
+    articles_in, topics, vocabularies = build_corpus(
+        tenant_id=tenant_id, n_articles=n_articles, n_topics=n_topics, seed=seed
+    )
+
+    # RETURNING order of a bulk insert is not guaranteed, the random bodies are unique
+    topic_by_body = {
+        article.body: topic for article, topic in zip(articles_in, topics, strict=True)
+    }
+    ids_by_topic_language: dict[tuple[int, str], set[UUID]] = {}
+    batch_size = 1000
+    for start in range(0, len(articles_in), batch_size):
+        batch = articles_in[start : start + batch_size]
+        created = await CRUD_articles.create(db, obj_in=batch)
+        await article_retriever.index(created)
+        for article in created:
+            key = (topic_by_body[article.body], article.language)
+            ids_by_topic_language.setdefault(key, set()).add(article.id)
+
+    queries = []
+    for _ in range(n_queries):
+        topic = rng.randrange(n_topics)
+        language = rng.choice(LANGUAGES)
+        params = ArticleSearchParams(
+            q=" ".join(rng.sample(vocabularies[topic], k=3)),
+            tenant_id=tenant_id,
+            language=language,
+            limit=limit,
+        )
+        queries.append((params, ids_by_topic_language.get((topic, language), set())))
+
+    async def text(params: ArticleSearchParams) -> list[UUID]:
+        return await article_retriever.text_search(db, params=params)
+
+    async def vector(params: ArticleSearchParams) -> list[UUID]:
+        return await article_retriever.vector_search(params=params)
+
+    async def hybrid(params: ArticleSearchParams) -> list[UUID]:
+        results = await article_retriever.search(db, params=params)
+        return [result.article.id for result in results]
+
+    return {
+        "text": await _run_mode(text, queries),
+        "vector": await _run_mode(vector, queries),
+        "hybrid": await _run_mode(hybrid, queries),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--articles", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = await run(
+        n_articles=args.articles,
+        n_queries=args.queries,
+        n_topics=args.topics,
+        limit=args.limit,
+        seed=args.seed,
+    )
+    print(json.dumps(results, indent=2))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
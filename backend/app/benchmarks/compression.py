@@ -0,0 +1,121 @@
+"""
+CPU cost against bytes saved for each response compression codec and level.
+
+Needs no services. Run with:
+
+    python -m app.benchmarks.compression --sizes 10 100 1000 --repeat 20
+
+Payloads are JSON lists of synthetic chat logs, like a page of ``GET
+/chat_sessions/{id}/chat_logs``. Only installed codecs are measured, "br" and
+"zstd" need the brotli and zstandard packages. Results are printed as JSON, one
+entry per payload size, codec and level.
+
+``break_even_mbit_per_s`` is the link bandwidth below which compressing is faster
+end to end than sending the payload as is: bytes saved divided by the time spent
+compressing. Compression pays off for clients on slower links than that.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import string
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from app.compression import Compressor, available_compressors
+
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 11], "zstd": [1, 3, 19]}
+
+
+def _random_sentence(rng: random.Random, vocabulary: list[str]) -> str:
+    return " ".join(rng.choices(vocabulary, k=rng.randint(8, 60))).capitalize() + "."
+
+
+def build_payload(*, n_chat_logs: int, seed: int) -> bytes:
+    """JSON list of ``n_chat_logs`` chat logs with prompts and generated content."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        for _ in range(3000)
+    ]
+    chat_session_id = str(UUID(int=rng.getrandbits(128)))
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    chat_logs = []
+    for _ in range(n_chat_logs):
+        created_at += timedelta(seconds=rng.randint(1, 600))
+        chat_logs.append(
+            {
+                "id": str(UUID(int=rng.getrandbits(128))),
+                "chat_session_id": chat_session_id,
+                "prompt": _random_sentence(rng, vocabulary),
+                "content": " ".join(
+                    _random_sentence(rng, vocabulary) for _ in range(rng.randint(2, 8))
+                ),
+                "created_at": created_at.isoformat(),
+            }
+        )
+    return json.dumps(chat_logs).encode()
+
+
+def _measure(
+    compressor_factory: Callable[[], Compressor], payload: bytes, *, repeat: int
+) -> dict[str, float]:
+    timings, compressed_size = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressor = compressor_factory()
+        compressed_size = len(compressor.compress(payload) + compressor.finish())
+        timings.append(time.perf_counter() - start)
+
+    seconds = statistics.median(timings)
+    bytes_saved = len(payload) - compressed_size
+    return {
+        "compressed_bytes": compressed_size,
+        "ratio": round(len(payload) / compressed_size, 2),
+        "bytes_saved": bytes_saved,
+        "compress_ms": round(seconds * 1000, 3),
+        "throughput_mb_per_s": round(len(payload) / seconds / 1e6, 1),
+        "break_even_mbit_per_s": round(bytes_saved * 8 / seconds / 1e6, 1),
+    }
+
+
+def run(*, sizes: list[int], repeat: int, seed: int) -> list[dict]:
+    results = []
+    for n_chat_logs in sizes:
+        payload = build_payload(n_chat_logs=n_chat_logs, seed=seed)
+        for encoding, levels in LEVELS.items():
+            for level in levels:
+                compressors = available_compressors(
+                    gzip_level=level, brotli_level=level, zstd_level=level
+                )
+                if encoding not in compressors:
+                    continue
+                results.append(
+                    {
+                        "chat_logs": n_chat_logs,
+                        "payload_bytes": len(payload),
+                        "encoding": encoding,
+                        "level": level,
+                        **_measure(compressors[encoding], payload, repeat=repeat),
+                    }
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(sizes=args.sizes, repeat=args.repeat, seed=args.seed)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
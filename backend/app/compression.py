@@ -0,0 +1,247 @@
+"""
+Response compression with gzip, and brotli or zstd when the ``brotli`` or
+``zstandard`` packages are installed.
+"""
+
+import zlib
+from collections.abc import Callable, Sequence
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compresses ``data`` and flushes, so the output can be decoded so far."""
+        ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressobj = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressobj.compress(data) + self._compressobj.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressobj.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressobj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressobj.compress(data) + self._compressobj.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressobj.flush()
+
+
+def available_compressors(
+    *, gzip_level: int, brotli_level: int, zstd_level: int
+) -> dict[str, Callable[[], Compressor]]:
+    """Compressor factories by content coding, for the installed codecs."""
+    compressors: dict[str, Callable[[], Compressor]] = {
+        "gzip": lambda: GzipCompressor(gzip_level)
+    }
+    if brotli is not None:
+        compressors["br"] = lambda: BrotliCompressor(brotli_level)
+    if zstandard is not None:
+        compressors["zstd"] = lambda: ZstdCompressor(zstd_level)
+    return compressors
+
+
+def select_encoding(accept_encoding: str, preference: Sequence[str]) -> str | None:
+    """First encoding of ``preference`` that ``accept_encoding`` accepts."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+
+    for encoding in preference:
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int,
+        encodings: Sequence[str],
+        gzip_level: int,
+        brotli_level: int,
+        zstd_level: int,
+        excluded_media_types: Sequence[str] = ("text/event-stream", "application/gzip"),
+    ):
+        """
+        Compresses responses with the first of ``encodings`` the client accepts.
+
+        Complete bodies smaller than ``minimum_size`` are sent as is. Streamed bodies,
+        e.g. NDJSON, are compressed chunk by chunk and flushed after each chunk, so
+        the client can decode every chunk when it arrives.
+
+        :param app: ASGIApp
+        :param minimum_size: int
+            Bytes a complete body needs before it's compressed
+        :param encodings: Sequence[str]
+            Preferred content codings first, of "zstd", "br" and "gzip".
+            Codecs that aren't installed are skipped
+        :param gzip_level: int
+            1 - 9
+        :param brotli_level: int
+            Quality 0 - 11
+        :param zstd_level: int
+            1 - 22
+        :param excluded_media_types: Sequence[str]
+            Media types never compressed, by default server-sent events and gzip
+            archives
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.excluded_media_types = excluded_media_types
+
+        compressors = available_compressors(
+            gzip_level=gzip_level, brotli_level=brotli_level, zstd_level=zstd_level
+        )
+        self.compressors = compressors
+        self.encodings = [encoding for encoding in encodings if encoding in compressors]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("Accept-Encoding", "")
+        encoding = select_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send,
+            encoding=encoding,
+            compressor_factory=self.compressors[encoding],
+            minimum_size=self.minimum_size,
+            excluded_media_types=self.excluded_media_types,
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        send: Send,
+        *,
+        encoding: str,
+        compressor_factory: Callable[[], Compressor],
+        minimum_size: int,
+        excluded_media_types: Sequence[str],
+    ):
+        self._send = send
+        self.encoding = encoding
+        self.compressor_factory = compressor_factory
+        self.minimum_size = minimum_size
+        self.excluded_media_types = excluded_media_types
+
+        self._start_message: Message | None = None
+        self._compressor: Compressor | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+        elif message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("Content-Type", "").split(";")[0].strip()
+            if "Content-Encoding" in headers or media_type in self.excluded_media_types:
+                self._passthrough = True
+                await self._send(message)
+            else:
+                # Held back until the first body chunk shows if it's worth compressing
+                self._start_message = message
+        elif message["type"] != "http.response.body":
+            await self._send(message)
+        elif self._compressor is None:
+            await self._send_first_body(message)
+        else:
+            await self._send_compressed(message)
+
+    async def _send_first_body(self, message: Message) -> None:
+        assert self._start_message is not None
+        start_message = self._start_message
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if not more_body and len(body) < self.minimum_size:
+            self._passthrough = True
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        self._compressor = self.compressor_factory()
+        headers = MutableHeaders(raw=start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            # Streamed, the compressed length isn't known up front
+            del headers["Content-Length"]
+            await self._send(start_message)
+            await self._send_compressed(message)
+        else:
+            body = self._compressor.compress(body) + self._compressor.finish()
+            headers["Content-Length"] = str(len(body))
+            await self._send(start_message)
+            await self._send({"type": "http.response.body", "body": body})
+
+    async def _send_compressed(self, message: Message) -> None:
+        assert self._compressor is not None
+        more_body: bool = message.get("more_body", False)
+
+        chunk = self._compressor.compress(message.get("body", b""))
+        if not more_body:
+            chunk += self._compressor.finish()
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
@@ -0,0 +1,196 @@
+"""
+Adaptive limit of the requests in flight per worker, shedding the excess with fast
+503s rather than queueing everything on the database pool.
+"""
+
+import json
+import re
+import time
+from collections.abc import Mapping, Sequence
+from typing import NamedTuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class PriorityClass(NamedTuple):
+    name: str
+    # Fraction of the limit requests of this class may fill, lower classes are
+    # shed first as the worker gets busy
+    share: float
+    # Slower responses lower the limit, None leaves the limit to the other classes,
+    # e.g. for routes waiting on an external provider
+    latency_target_ms: float | None
+
+
+class PriorityRule(NamedTuple):
+    # None matches any method
+    method: str | None
+    path_pattern: str
+    # None exempts the route from the limit, e.g. health checks
+    priority: str | None
+
+
+def api_priority_rules(prefix: str) -> list[PriorityRule]:
+    """Priority classes of the API's routes under ``prefix``, first match wins."""
+    return [
+        PriorityRule(None, rf"^{prefix}/utils/", None),
+        PriorityRule("POST", rf"^{prefix}/chat_logs/generate$", "external"),
+        PriorityRule("POST", rf"^{prefix}/(summarize|translate)/$", "external"),
+        PriorityRule("POST", r"/(batch_get|bulk_delete|bulk_update)$", "heavy"),
+        # Creates take lists, list-all routes return every matching row
+        PriorityRule(None, rf"^{prefix}/[a-z_]+/$", "heavy"),
+        PriorityRule("GET", r"/(chat_logs|chat_sessions|export)$", "heavy"),
+        PriorityRule(None, rf"^{prefix}/", "interactive"),
+    ]
+
+
+class AIMDLimit:
+    def __init__(
+        self,
+        *,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        backoff_ratio: float,
+    ):
+        """
+        Additive increase, multiplicative decrease, like TCP congestion control.
+        Each response in time while the limit is in use adds ``1 / limit``, about
+        one per limit's worth of requests, each late response multiplies it by
+        ``backoff_ratio``.
+
+        :param initial_limit: int
+        :param min_limit: int
+        :param max_limit: int
+        :param backoff_ratio: float
+            0 - 1, the limit after a late response relative to before
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+
+        self._limit = float(initial_limit)
+        self._decreased_at = 0.0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_sample(self, *, started_at: float, in_flight: int, late: bool) -> None:
+        """
+        Adjusts the limit to a response of a request started at ``started_at``,
+        with ``in_flight`` requests in flight when it started.
+        """
+        if late:
+            # Requests started before the last decrease saw the load that caused it,
+            # they'd lower the limit again for the same overload
+            if started_at >= self._decreased_at:
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                self._decreased_at = time.monotonic()
+        elif in_flight * 2 >= self._limit:
+            # Only while the limit is in use, an idle worker says nothing about it
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+
+class ConcurrencyLimitMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        limit: AIMDLimit,
+        priority_classes: Sequence[PriorityClass],
+        rules: Sequence[PriorityRule],
+        default_priority: str,
+        retry_after_seconds: int,
+    ):
+        """
+        Rejects requests with a 503 and ``Retry-After`` when the requests in flight
+        reach their priority class' share of ``limit``. The limit adapts to the time
+        until the response starts, so it settles where the worker still answers
+        in time instead of queueing on the database pool.
+
+        :param app: ASGIApp
+        :param limit: AIMDLimit
+        :param priority_classes: Sequence[PriorityClass]
+        :param rules: Sequence[PriorityRule]
+            Priority class of each route, first match wins
+        :param default_priority: str
+            Priority class of requests no rule matches
+        :param retry_after_seconds: int
+            ``Retry-After`` of rejected requests
+        """
+        self.app = app
+        self.limit = limit
+        self.priority_classes: Mapping[str, PriorityClass] = {
+            priority_class.name: priority_class for priority_class in priority_classes
+        }
+        self.rules = [
+            (method, re.compile(path_pattern), priority)
+            for method, path_pattern, priority in rules
+        ]
+        self.default_priority = default_priority
+        self.retry_after_seconds = retry_after_seconds
+
+        self.in_flight = 0
+
+    def classify(self, method: str, path: str) -> PriorityClass | None:
+        """The priority class of a request, None if it's exempt from the limit."""
+        priority: str | None = self.default_priority
+        for rule_method, path_pattern, rule_priority in self.rules:
+            if rule_method in (None, method) and path_pattern.search(path):
+                priority = rule_priority
+                break
+        return None if priority is None else self.priority_classes[priority]
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({"detail": "Server busy, retry later"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.retry_after_seconds).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        priority_class = self.classify(scope["method"], scope["path"])
+        if priority_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self.in_flight >= max(1, self.limit.limit * priority_class.share):
+            await self._reject(send)
+            return
+
+        self.in_flight += 1
+        in_flight = self.in_flight
+        started_at = time.monotonic()
+        latency_ms: float | None = None
+        status = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal latency_ms, status
+            if message["type"] == "http.response.start":
+                # Until the response starts, streamed bodies take as long as they take
+                latency_ms = (time.monotonic() - started_at) * 1000
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight -= 1
+
+        target_ms = priority_class.latency_target_ms
+        if latency_ms is not None and target_ms is not None:
+            late = latency_ms > target_ms or status in (503, 504)
+            self.limit.on_sample(started_at=started_at, in_flight=in_flight, late=late)
@@ -74,6 +74,148 @@ class Settings(BaseSettings):
             )
         )
 
+    ARTICLES_COLLECTION_NAME: str = "articles"
+    EMBEDDING_PROVIDER: Literal["hashing"] = "hashing"
+    EMBEDDING_DIMENSION: int = 384
+    # Constant ``k`` in reciprocal rank fusion: score = sum(1 / (k + rank))
+    SEARCH_RRF_K: int = 60
+    # Candidates fetched from each retriever before fusing
+    SEARCH_CANDIDATES_PER_RETRIEVER: int = 50
+
+    TRANSLATION_PROVIDER: Literal["local"] = "local"
+    # Segments and characters grouped into one provider call
+    TRANSLATION_MAX_BATCH_SIZE: int = 64
+    TRANSLATION_MAX_BATCH_CHARS: int = 20_000
+    # How long the first segment of a batch waits for more segments to join
+    TRANSLATION_MAX_WAIT_MS: float = 10
+    TRANSLATION_LRU_SIZE: int = 10_000
+
+    SUMMARY_PROVIDER: Literal["local"] = "local"
+    # Max characters of text given to the provider in one call
+    SUMMARY_CHUNK_SIZE: int = 4000
+    # Max concurrent provider calls per worker
+    SUMMARY_FAN_OUT: int = 8
+    SUMMARY_MAX_WORDS: int = 150
+    SUMMARY_LRU_SIZE: int = 10_000
+
+    GENERATION_PROVIDER: Literal["local"] = "local"
+    # Persist the partial response every n tokens while streaming, 0 disables it
+    GENERATION_CHECKPOINT_TOKENS: int = 0
+
+    CHAT_LOGS_COLLECTION_NAME: str = "chat_logs"
+
+    # Concurrent jobs per worker process
+    JOB_WORKER_CONCURRENCY: int = 8
+    # Concurrent running jobs per tenant, across all workers
+    JOB_TENANT_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1
+    # In-process retries of a failing job before it's requeued or failed
+    JOB_RETRY_ATTEMPTS: int = 3
+    JOB_RETRY_WAIT_SECONDS: float = 0.5
+    # Claims of a job, a worker dying mid-job also uses up a claim
+    JOB_MAX_ATTEMPTS: int = 3
+    # Running jobs locked longer than this are considered abandoned
+    JOB_LOCK_TIMEOUT_SECONDS: int = 15 * 60
+    # Run a job worker inside every API worker process
+    JOB_WORKER_IN_PROCESS: bool = False
+
+    # Rows per transaction of bulk delete and update jobs
+    BULK_CHUNK_SIZE: int = 1000
+    # Pause between the chunks of a bulk job
+    BULK_CHUNK_PAUSE_SECONDS: float = 0.05
+
+    # Rows per round trip of the user data export, erasure chunks like bulk jobs
+    USER_EXPORT_BATCH_SIZE: int = 1000
+
+    # Monthly chat log partitions kept created ahead of the current month
+    CHAT_LOG_PARTITIONS_AHEAD: int = 3
+    # Months of chat logs kept before their partitions are dropped, None keeps all
+    CHAT_LOG_RETENTION_MONTHS: int | None = None
+    CHAT_LOG_PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 60 * 60
+
+    # Filters no index can evaluate are rejected on tables with more rows
+    FILTER_UNINDEXED_MAX_ROWS: int = 10_000
+    FILTER_ROW_ESTIMATE_TTL_SECONDS: int = 5 * 60
+
+    # Cache-Control of single objects, ``no-cache`` revalidates with the ETag each time
+    CACHE_CONTROL: str = "private, no-cache"
+    # Chat logs change with generation checkpoints and bulk updates, so they're
+    # revalidated too. A max-age only fits deployments where neither happens
+    CACHE_CONTROL_CHAT_LOGS: str = "private, no-cache"
+
+    # Complete response bodies smaller than this are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    # Preferred first, "br" and "zstd" need the brotli and zstandard packages
+    COMPRESSION_ENCODINGS: list[Literal["zstd", "br", "gzip"]] = ["zstd", "br", "gzip"]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_LEVEL: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Warm-up after startup, ``/utils/ready`` reports not ready until it's done
+    WARMUP_ENABLED: bool = True
+    # Connections opened and primed with the hot statements, up to the pool size
+    WARMUP_POOL_CONNECTIONS: int = 5
+
+    # Probes within this many seconds share one round of dependency checks
+    READINESS_CACHE_TTL_SECONDS: float = 2.0
+    # Not ready above these, so the load balancer sheds traffic before timeouts
+    READINESS_MAX_POOL_WAIT_MS: float = 500.0
+    READINESS_MAX_LOOP_LAG_MS: float = 200.0
+    # A dependency not answering within this is reported down
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+
+    # Requests in flight per worker, adapted between the min and max by latency
+    CONCURRENCY_LIMIT_ENABLED: bool = True
+    CONCURRENCY_LIMIT_INITIAL: int = 20
+    CONCURRENCY_LIMIT_MIN: int = 4
+    CONCURRENCY_LIMIT_MAX: int = 200
+    # The limit after a response slower than its target, relative to before
+    CONCURRENCY_LIMIT_BACKOFF_RATIO: float = 0.9
+    # Latency targets until the response starts, of interactive and heavy routes
+    CONCURRENCY_LATENCY_TARGET_MS: float = 250.0
+    CONCURRENCY_HEAVY_LATENCY_TARGET_MS: float = 2000.0
+    # Fraction of the limit heavy and external provider routes may fill
+    CONCURRENCY_HEAVY_SHARE: float = 0.5
+    CONCURRENCY_EXTERNAL_SHARE: float = 0.5
+    CONCURRENCY_RETRY_AFTER_SECONDS: int = 1
+
+    # Token buckets per route of the tenant and the user of the token, as
+    # [burst, per second] by route name pattern, the first match applies.
+    # Tenants override them in ``Tenant.settings["rate_limits"]``
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: dict[str, dict[Literal["tenant", "user"], tuple[float, float]]] = {
+        "create_chat_log": {"tenant": (100, 20), "user": (20, 5)},
+        "get_all_*": {"tenant": (100, 20), "user": (20, 5)},
+        "*": {"tenant": (1000, 200), "user": (200, 50)},
+    }
+    # "local" keeps the buckets per worker, "postgres" shares them between workers
+    RATE_LIMIT_STORE: Literal["local", "postgres"] = "local"
+    RATE_LIMIT_LOCAL_BUCKETS: int = 100_000
+    RATE_LIMIT_TENANT_SETTINGS_TTL_SECONDS: float = 60.0
+    RATE_LIMIT_TENANT_SETTINGS_CACHE_SIZE: int = 10_000
+
+    # Responses of creates sent with an Idempotency-Key are replayed this long
+    IDEMPOTENCY_TTL_SECONDS: int = 86_400
+    # A claim of a key older than this is taken over, its request died
+    IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS: int = 60
+    # Retries wait this long for the request in progress, then get a 409
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_POLL_INTERVAL_SECONDS: float = 0.05
+    # The job worker deletes expired keys this often
+    IDEMPOTENCY_PRUNE_INTERVAL_SECONDS: int = 3600
+
+    # Samples of the event loop's lag, served by /utils/loop-lag
+    LOOP_LAG_MONITOR_ENABLED: bool = True
+    LOOP_LAG_SAMPLE_INTERVAL_SECONDS: float = 0.5
+    LOOP_LAG_BUCKETS_MS: list[float] = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+    # /utils/ready compares the largest lag of this many recent seconds
+    LOOP_LAG_WINDOW_SECONDS: float = 10.0
+    # asyncio's debug mode, logging callbacks slower than LOOP_SLOW_CALLBACK_MS with
+    # the route, and stacks of the loop while blocked over the dump threshold
+    LOOP_DEBUG: bool = False
+    LOOP_SLOW_CALLBACK_MS: float = 100.0
+    LOOP_STACK_DUMP_THRESHOLD_MS: float = 500.0
+
     POSTGRES_SERVER: str
     POSTGRES_PORT: int = 5432
     POSTGRES_USER: str
@@ -1,4 +1,5 @@
-from qdrant_client import AsyncQdrantClient
+from typing import TYPE_CHECKING
+
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
     async_sessionmaker,
@@ -8,7 +9,29 @@ from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
-qdrant_client = AsyncQdrantClient(url=str(settings.QDRANT_URL))
+if TYPE_CHECKING:
+    from qdrant_client import AsyncQdrantClient
+
+# Built on first use, qdrant_client takes longer to import than the rest of the app
+_qdrant_client: "AsyncQdrantClient | None" = None
+
+
+def get_qdrant_client() -> "AsyncQdrantClient":
+    """The shared Qdrant client, created on the first call."""
+    global _qdrant_client
+    if _qdrant_client is None:
+        from qdrant_client import AsyncQdrantClient
+
+        _qdrant_client = AsyncQdrantClient(url=str(settings.QDRANT_URL))
+    return _qdrant_client
+
+
+async def close_qdrant_client() -> None:
+    global _qdrant_client
+    if _qdrant_client is not None:
+        await _qdrant_client.close()
+        _qdrant_client = None
+
 
 engine = create_async_engine(str(settings.OLTP_DATABASE_URI))
 
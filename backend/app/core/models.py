@@ -2,9 +2,25 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    DDL,
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    PrimaryKeyConstraint,
+    String,
+    Text,
+    UniqueConstraint,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
 
@@ -12,7 +28,8 @@ from app.core.db import Base
 Some rules these models use to work with the rest of the application:
 
 1. All pks are called "id".
-2. No composite pks are allowed.
+2. No composite pks are allowed. Partitioned tables include the partition key
+   in the db pk, but map ``id`` as the pk.
 
 """
 
@@ -34,6 +51,9 @@ class User(Base):
     """Lengths on fields on are according to UK Government Data Standards Catalogue"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_tenant_id_created_at", "tenant_id", "created_at"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -64,6 +84,12 @@ class User(Base):
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
+    __table_args__ = (
+        Index("ix_chat_sessions_user_id_created_at", "user_id", "created_at"),
+        Index("ix_chat_sessions_tenant_id_created_at", "tenant_id", "created_at"),
+        # Index only scans for the tenant condition of chat logs
+        Index("ix_chat_sessions_tenant_id_id", "tenant_id", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -80,13 +106,33 @@ class ChatSession(Base):
         DateTime(timezone=True), default=func.now(), nullable=False
     )
 
+    # Only loaded explicitly, e.g. with ``selectinload``
+    chat_logs: Mapped[list["ChatLog"]] = relationship(
+        lazy="raise",
+        passive_deletes=True,
+        order_by="(ChatLog.created_at, ChatLog.id)",
+    )
+
 
 class ChatLog(Base):
-    __tablename__ = "chat_logs"
+    """
+    Range partitioned by month on ``created_at``, see ``app.services.partitions``.
 
-    id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    Postgres requires the partition key in the pk, so the table's pk is
+    ``(id, created_at)``. The mapper still identifies chat logs by ``id`` alone.
+    Rows outside the monthly partitions land in ``chat_logs_default``.
+    """
+
+    __tablename__ = "chat_logs"
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at"),
+        Index(
+            "ix_chat_logs_chat_session_id_created_at", "chat_session_id", "created_at"
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), default=uuid.uuid4)
     chat_session_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("chat_sessions.id", ondelete="CASCADE", onupdate="CASCADE"),
@@ -97,3 +143,198 @@ class ChatLog(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=func.now(), nullable=False
     )
+
+    __mapper_args__ = {"primary_key": [id]}
+
+
+event.listen(
+    ChatLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE chat_logs_default PARTITION OF chat_logs DEFAULT"),
+)
+
+
+class Article(Base):
+    """
+    News article searchable through full text (``search_vector``) and dense
+    vectors stored in the Qdrant collection ``settings.ARTICLES_COLLECTION_NAME``.
+    """
+
+    __tablename__ = "articles"
+    __table_args__ = (
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_articles_tenant_id_language", "tenant_id", "language"),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    tenant_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    language: Mapped[str] = mapped_column(String(10), nullable=False)  # ISO 639-1
+    url: Mapped[str | None] = mapped_column(String(2048))
+    published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # 'simple' config since articles are written in many European languages
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(body, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), nullable=False
+    )
+
+
+class TranslationCache(Base):
+    """Translated segments, keyed on the sha256 of the source text and the languages"""
+
+    __tablename__ = "translation_cache"
+    __table_args__ = (
+        UniqueConstraint(
+            "source_hash",
+            "source_language",
+            "target_language",
+            name="uq_translation_cache_key",
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    source_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    source_language: Mapped[str] = mapped_column(String(10), nullable=False)
+    target_language: Mapped[str] = mapped_column(String(10), nullable=False)
+    translated_text: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), nullable=False
+    )
+
+
+class SummaryCache(Base):
+    """Summaries of article chunks, keyed on the sha256 of the chunk text"""
+
+    __tablename__ = "summary_cache"
+    __table_args__ = (
+        UniqueConstraint(
+            "content_hash",
+            "provider",
+            "max_words",
+            name="uq_summary_cache_key",
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    provider: Mapped[str] = mapped_column(String(50), nullable=False)
+    max_words: Mapped[int] = mapped_column(Integer, nullable=False)
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), nullable=False
+    )
+
+
+class Job(Base):
+    """
+    Durable background job, claimed by workers with ``FOR UPDATE SKIP LOCKED``.
+
+    ``status`` is one of "queued", "running", "succeeded" or "failed".
+    Higher ``priority`` runs first. ``progress`` is reported by the handler.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index(
+            "ix_jobs_queued_priority_run_after",
+            text("priority DESC"),
+            "run_after",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index("ix_jobs_tenant_id_created_at", "tenant_id", "created_at"),
+        Index(
+            "ix_jobs_running_tenant_id",
+            "tenant_id",
+            postgresql_where=text("status = 'running'"),
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    kind: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, default={}, nullable=False)
+    tenant_id: Mapped[UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE")
+    )
+    priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="queued", nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text)
+    progress: Mapped[dict[str, Any]] = mapped_column(
+        JSONB, default={}, server_default=text("'{}'::jsonb"), nullable=False
+    )
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), nullable=False
+    )
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        onupdate=func.now(),
+    )
+
+
+class RateLimitBucket(Base):
+    """
+    Token bucket of a rate limit, shared by all workers. Unlogged, the buckets are
+    refilled within seconds, so losing them in a crash doesn't matter.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+class IdempotencyKey(Base):
+    """
+    Response of a create request sent with an ``Idempotency-Key``, replayed to
+    retries of it. ``status_code`` is null while the first request is in progress.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        PrimaryKeyConstraint("owner", "key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    # Tenant and user of the token, keys of different callers don't collide
+    owner: Mapped[str] = mapped_column(String(255), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    # sha256 of the request, a key is only valid for the same request
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int | None] = mapped_column(Integer)
+    media_type: Mapped[str | None] = mapped_column(String(255))
+    response_body: Mapped[bytes | None] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
@@ -1,23 +1,56 @@
-from .api import FilterParams, Message, Token, TokenPayload
+from .api import (
+    BatchGetRequest,
+    BatchGetResponse,
+    BulkSelection,
+    BulkUpdateRequest,
+    DependencyCheck,
+    FilterCondition,
+    FilterParams,
+    KeysetParams,
+    LoopLagHistogram,
+    Message,
+    Page,
+    Readiness,
+    Token,
+    TokenPayload,
+)
+from .article import (
+    ArticleCreate,
+    ArticleInDb,
+    ArticlePublic,
+    ArticleSearchParams,
+    ArticleSearchResult,
+    ArticleUpdate,
+)
 from .chat_log import (
+    ChatLogBulkUpdate,
     ChatLogCreate,
+    ChatLogGenerate,
     ChatLogInDb,
     ChatLogPublic,
     ChatLogUpdate,
 )
 from .chat_session import (
+    ChatSessionBulkUpdate,
     ChatSessionCreate,
     ChatSessionInDb,
+    ChatSessionPageParams,
     ChatSessionPublic,
     ChatSessionUpdate,
+    ChatSessionWithChatLogs,
 )
+from .job import JobPublic
+from .summary import SummarizeRequest, SummarizeResponse
 from .tenant import (
+    TenantBulkUpdate,
     TenantCreate,
     TenantInDb,
     TenantPublic,
     TenantUpdate,
 )
+from .translation import TranslationRequest, TranslationResponse
 from .user import (
+    UserBulkUpdate,
     UserCreate,
     UserInDb,
     UserPublic,
@@ -1,4 +1,29 @@
-from pydantic import BaseModel, Field
+from typing import Generic, Literal, TypeVar, get_args
+
+from pydantic import (
+    UUID4,
+    BaseModel,
+    Field,
+    field_validator,
+    model_validator,
+)
+from typing_extensions import Self
+
+ItemType = TypeVar("ItemType")
+
+FilterOperator = Literal["eq", "in", "gt", "gte", "lt", "lte", "ilike", "contains"]
+
+
+# One condition of ``FilterParams.filters``, written as ``column:operator:value``
+class FilterCondition(BaseModel):
+    column: str
+    operator: FilterOperator
+    value: str
+
+    @classmethod
+    def parse(cls, expression: str) -> "FilterCondition":
+        column, operator, value = expression.split(":", 2)
+        return cls(column=column, operator=operator, value=value)  # type: ignore[arg-type]
 
 
 class FilterParams(BaseModel):
@@ -6,6 +31,85 @@ class FilterParams(BaseModel):
     offset: int = Field(0, ge=0)
     sort_columns: list[str] | None = Field(None)
     sort_orders: list[str] | None = Field(None)
+    filters: list[str] | None = Field(
+        None,
+        description=(
+            "Conditions as `column:operator:value`, all must match. Operators: "
+            f"{', '.join(get_args(FilterOperator))}. `in` takes comma separated "
+            "values, `contains` a JSON object for JSONB columns."
+        ),
+        examples=[["created_at:gt:2025-01-01T00:00:00+00:00"]],
+    )
+
+    @field_validator("filters")
+    @classmethod
+    def validate_filters(cls, filters: list[str] | None) -> list[str] | None:
+        for expression in filters or []:
+            if expression.count(":") < 2:
+                raise ValueError(
+                    f"Filter '{expression}' is not written as 'column:operator:value'"
+                )
+            FilterCondition.parse(expression)
+        return filters
+
+    @property
+    def filter_conditions(self) -> list[FilterCondition]:
+        return [FilterCondition.parse(expression) for expression in self.filters or []]
+
+
+# Keyset pagination, ``cursor`` is the ``next_cursor`` of the previous page
+class KeysetParams(BaseModel):
+    limit: int = Field(50, gt=0, le=200)
+    cursor: str | None = Field(None)
+
+
+# Page of keyset pagination, ``next_cursor`` is None on the last page
+class Page(BaseModel, Generic[ItemType]):
+    data: list[ItemType]
+    next_cursor: str | None
+
+
+# Ids of ``POST /{resource}/batch_get``, one query however many ids
+class BatchGetRequest(BaseModel):
+    ids: list[UUID4] = Field(min_length=1, max_length=1000)
+
+
+# Found objects in the order of the requested ids, and the ids that weren't found
+class BatchGetResponse(BaseModel, Generic[ItemType]):
+    data: list[ItemType]
+    missing: list[UUID4]
+
+
+# Rows of a bulk operation, either by ``ids`` or by ``filters`` like ``FilterParams``
+class BulkSelection(BaseModel):
+    ids: list[UUID4] | None = Field(None, min_length=1, max_length=100_000)
+    filters: list[str] | None = Field(
+        None,
+        min_length=1,
+        description="Conditions as `column:operator:value`, like `FilterParams`.",
+    )
+
+    @field_validator("filters")
+    @classmethod
+    def validate_filters(cls, filters: list[str] | None) -> list[str] | None:
+        return FilterParams.validate_filters(filters)
+
+    @model_validator(mode="after")
+    def _exactly_one_selection(self) -> Self:
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filters'")
+        return self
+
+
+# Only the fields given in ``values`` are set
+class BulkUpdateRequest(BulkSelection, Generic[ItemType]):
+    values: ItemType
+
+    @model_validator(mode="after")
+    def _has_values(self) -> Self:
+        if isinstance(self.values, BaseModel) and not self.values.model_fields_set:
+            raise ValueError("Provide at least one field in 'values'")
+        return self
 
 
 # JSON payload containing access token
@@ -22,3 +126,23 @@ class TokenPayload(BaseModel):
 # Generic message
 class Message(BaseModel):
     message: str
+
+
+# One dependency of the readiness probe
+class DependencyCheck(BaseModel):
+    ok: bool
+    latency_ms: float | None = None
+    detail: str | None = None
+
+
+class Readiness(BaseModel):
+    ready: bool
+    checks: dict[str, DependencyCheck]
+
+
+# Event loop lag samples of this worker, buckets by upper bound in ms, cumulative
+class LoopLagHistogram(BaseModel):
+    buckets: dict[str, int]
+    count: int
+    sum_ms: float
+    max_ms: float
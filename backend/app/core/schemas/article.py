@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Annotated
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field, PlainValidator
+
+from app.core.schemas.field_validators import datetime_hour_utc_offset
+
+
+# Shared article props
+class _BaseArticle(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    tenant_id: UUID
+    title: str = Field(max_length=500)
+    body: str
+    language: str = Field(max_length=10)
+    url: str | None = Field(None, max_length=2048)
+    published_at: datetime | None = None
+
+
+# Properties to receive on creation
+class ArticleCreate(_BaseArticle):
+    pass
+
+
+# Properties to receive on update
+class ArticleUpdate(_BaseArticle):
+    pass
+
+
+# Properties shared by models stored in DB
+class _ArticleInDbBase(_BaseArticle):
+    id: UUID
+    created_at: Annotated[str | None, PlainValidator(datetime_hour_utc_offset)]
+
+
+# Properties to return to client
+class ArticlePublic(_ArticleInDbBase):
+    pass
+
+
+# Properties stored in DB
+class ArticleInDb(_ArticleInDbBase):
+    pass
+
+
+# Query parameters for hybrid article search
+class ArticleSearchParams(BaseModel):
+    q: str = Field(min_length=1, max_length=1000)
+    tenant_id: UUID
+    language: str | None = Field(None, max_length=10)
+    limit: int = Field(10, gt=0, le=100)
+
+
+# Article with its fused relevance score
+class ArticleSearchResult(BaseModel):
+    article: ArticlePublic
+    score: float
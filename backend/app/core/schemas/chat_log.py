@@ -1,9 +1,9 @@
 from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, PlainValidator
+from pydantic import AfterValidator, BaseModel, ConfigDict, PlainValidator
 
-from app.core.schemas.field_validators import datetime_hour_utc_offset
+from app.core.schemas.field_validators import datetime_hour_utc_offset, not_null
 
 
 # Shared session props
@@ -25,6 +25,17 @@ class ChatLogUpdate(_BaseChatLog):
     pass
 
 
+# Properties to receive on bulk update, only the given fields are set
+class ChatLogBulkUpdate(BaseModel):
+    chat_session_id: Annotated[UUID | None, AfterValidator(not_null)] = None
+
+
+# Properties to receive on generation, the response is generated
+class ChatLogGenerate(BaseModel):
+    chat_session_id: UUID
+    prompt: str
+
+
 # Properties shared by models stored in DB
 class _ChatLogInDbBase(_BaseChatLog):
     id: UUID
@@ -1,9 +1,11 @@
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, PlainValidator
+from pydantic import AfterValidator, BaseModel, ConfigDict, PlainValidator
 
-from app.core.schemas.field_validators import datetime_hour_utc_offset
+from app.core.schemas.api import KeysetParams
+from app.core.schemas.chat_log import ChatLogPublic
+from app.core.schemas.field_validators import datetime_hour_utc_offset, not_null
 
 
 # Shared session props
@@ -24,6 +26,12 @@ class ChatSessionUpdate(_BaseChatSession):
     pass
 
 
+# Properties to receive on bulk update, only the given fields are set
+class ChatSessionBulkUpdate(BaseModel):
+    user_id: Annotated[UUID | None, AfterValidator(not_null)] = None
+    tenant_id: Annotated[UUID | None, AfterValidator(not_null)] = None
+
+
 # Properties shared by models stored in DB
 class _ChatSessionInDbBase(_BaseChatSession):
     id: UUID
@@ -35,6 +43,16 @@ class ChatSessionPublic(_ChatSessionInDbBase):
     pass
 
 
+# Properties to return to client, ``chat_logs`` only if included
+class ChatSessionWithChatLogs(ChatSessionPublic):
+    chat_logs: list[ChatLogPublic] | None = None
+
+
 # Properties stored in DB
 class ChatSessionInDb(_ChatSessionInDbBase):
     pass
+
+
+# Keyset pagination of chat sessions, ``include=chat_logs`` adds their chat logs
+class ChatSessionPageParams(KeysetParams):
+    include: Literal["chat_logs"] | None = None
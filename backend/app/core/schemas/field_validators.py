@@ -1,4 +1,7 @@
 from datetime import datetime, timezone
+from typing import TypeVar
+
+T = TypeVar("T")
 
 
 def datetime_hour_utc_offset(timestamp: datetime | None):
@@ -10,3 +13,10 @@ def datetime_hour_utc_offset(timestamp: datetime | None):
     utc_value = timestamp.astimezone(timezone.utc)
     # Format as ISO 8601 string with +00:00 offset
     return utc_value.isoformat()
+
+
+def not_null(value: T | None) -> T:
+    """For fields that can be left out, but not set to null."""
+    if value is None:
+        raise ValueError("Value can be left out, but not null")
+    return value
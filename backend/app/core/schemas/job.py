@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+# Properties to return to client, ``progress`` is reported by the job handler
+class JobPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    kind: str
+    status: str
+    progress: dict[str, Any]
+    attempts: int
+    last_error: str | None
+    created_at: datetime
+    updated_at: datetime | None
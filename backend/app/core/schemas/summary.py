@@ -0,0 +1,23 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+from typing_extensions import Self
+
+
+# Either a text or a stored article to summarize
+class SummarizeRequest(BaseModel):
+    text: str | None = Field(None, min_length=1)
+    article_id: UUID | None = None
+    max_words: int | None = Field(None, gt=0, le=1000)
+
+    @model_validator(mode="after")
+    def _exactly_one_source(self) -> Self:
+        if (self.text is None) == (self.article_id is None):
+            raise ValueError("Provide exactly one of 'text' or 'article_id'")
+        return self
+
+
+class SummarizeResponse(BaseModel):
+    summary: str
+    chunks: int
+    cached_chunks: int
@@ -23,6 +23,11 @@ class TenantUpdate(_BaseTenant):
     pass
 
 
+# Properties to receive on bulk update, only the given fields are set
+class TenantBulkUpdate(BaseModel):
+    settings: dict[str, Any] | None = None
+
+
 # Properties shared by models stored in DB
 class _TenantInDbBase(_BaseTenant):
     id: UUID
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+
+# Segments to translate, e.g. the paragraphs of an article
+class TranslationRequest(BaseModel):
+    segments: list[str] = Field(min_length=1, max_length=1000)
+    source_language: str = Field(max_length=10)
+    target_language: str = Field(max_length=10)
+
+
+# Translations in the same order as the requested segments
+class TranslationResponse(BaseModel):
+    translations: list[str]
+    source_language: str
+    target_language: str
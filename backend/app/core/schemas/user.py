@@ -2,6 +2,7 @@ from typing import Annotated
 from uuid import UUID
 
 from pydantic import (
+    AfterValidator,
     BaseModel,
     ConfigDict,
     EmailStr,
@@ -9,7 +10,7 @@ from pydantic import (
     PlainValidator,
 )
 
-from app.core.schemas.field_validators import datetime_hour_utc_offset
+from app.core.schemas.field_validators import datetime_hour_utc_offset, not_null
 
 
 # Shared properties
@@ -34,6 +35,14 @@ class UserUpdate(_BaseUser):
     tenant_id: UUID
 
 
+# Properties to receive via API on bulk update, only the given fields are set
+class UserBulkUpdate(BaseModel):
+    full_name: str | None = Field(None, max_length=70)
+    role: Annotated[str | None, AfterValidator(not_null)] = Field(None, max_length=30)
+    settings: dict[str, str] | None = None
+    tenant_id: Annotated[UUID | None, AfterValidator(not_null)] = None
+
+
 class UserUpdateSettings(BaseModel):
     settings: dict[str, str]
 
@@ -1,5 +1,10 @@
-from app.core.models import ChatLog, ChatSession, Tenant, User
+from sqlalchemy import select
+
+from app.core.models import Article, ChatLog, ChatSession, Tenant, User
 from app.core.schemas import (
+    ArticleCreate,
+    ArticlePublic,
+    ArticleUpdate,
     ChatLogCreate,
     ChatLogPublic,
     ChatLogUpdate,
@@ -24,6 +29,7 @@ CRUD_tenants = CRUDBase[
     model=Tenant,
     schema=TenantPublic,
     create_schema=TenantCreate,
+    tenant_condition=lambda tenant_id: Tenant.id == tenant_id,
 )
 
 
@@ -36,6 +42,7 @@ CRUD_chat_sessions = CRUDBase[
     model=ChatSession,
     schema=ChatSessionPublic,
     create_schema=ChatSessionCreate,
+    tenant_condition=lambda tenant_id: ChatSession.tenant_id == tenant_id,
 )
 
 CRUD_chat_logs = CRUDBase[
@@ -47,6 +54,10 @@ CRUD_chat_logs = CRUDBase[
     model=ChatLog,
     schema=ChatLogPublic,
     create_schema=ChatLogCreate,
+    # Chat logs belong to the tenant of their chat session
+    tenant_condition=lambda tenant_id: ChatLog.chat_session_id.in_(
+        select(ChatSession.id).where(ChatSession.tenant_id == tenant_id)
+    ),
 )
 
 
@@ -59,4 +70,18 @@ CRUD_users = CRUDBase[
     model=User,
     schema=UserPublic,
     create_schema=UserCreate,
+    tenant_condition=lambda tenant_id: User.tenant_id == tenant_id,
+)
+
+
+CRUD_articles = CRUDBase[
+    Article,
+    ArticlePublic,
+    ArticleCreate,
+    ArticleUpdate,
+](
+    model=Article,
+    schema=ArticlePublic,
+    create_schema=ArticleCreate,
+    tenant_condition=lambda tenant_id: Article.tenant_id == tenant_id,
 )
@@ -1,19 +1,44 @@
-from collections.abc import Sequence
+import base64
+import json
+import time
+from collections.abc import Callable, Sequence
 from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Any, Generic, Literal, TypeVar, overload
+from uuid import UUID
 
 from pydantic import UUID4, BaseModel, TypeAdapter
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.exc import ArgumentError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import Select, asc, delete, desc, func, select
+from sqlalchemy.sql import (
+    Select,
+    any_,
+    asc,
+    bindparam,
+    delete,
+    desc,
+    func,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.elements import BindParameter, ColumnElement
 
-from app.core.schemas import FilterParams
+from app.core.config import settings
+from app.core.schemas import FilterParams, KeysetParams
+from app.crud.filters import compile_filter, is_indexed
+from app.crud.tenancy import current_tenant_id
 from app.exceptions import (
     DbObjAlreadyExistsError,
     DbObjNotFoundError,
     DbTooManyItemsDeleteError,
     GeneralDbError,
+    InvalidFilterError,
+    InvalidPageCursorError,
+    TenantAccessDeniedError,
 )
 
 ModelType = TypeVar("ModelType", bound=Any)
@@ -28,6 +53,7 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
         model: type[ModelType],
         schema: type[SchemaType],
         create_schema: type[CreateSchemaType],
+        tenant_condition: Callable[[UUID], ColumnElement[bool]] | None = None,
     ):
         """
         Async CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -40,13 +66,46 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
             A Pydantic schema class
         :param create_schema: CreateSchemaType
             Create schema for Pydantic class
+        :param tenant_condition: Callable[[UUID], ColumnElement[bool]] | None
+            Condition for the rows of a tenant, applied to every read, update and
+            delete while ``current_tenant_id`` is set. None for unscoped models
         """
         self.model = model
         self.schema = schema
         self.create_schema = create_schema
+        self.tenant_condition = tenant_condition
 
         self.validate = TypeAdapter(SchemaType | list[SchemaType]).validate_python
 
+        # (monotonic time, estimated rows) of the last row estimate
+        self._row_estimate: tuple[float, float] | None = None
+
+    def _scoped(self, stmt: Any) -> Any:
+        """Adds the tenant condition of ``current_tenant_id`` to ``stmt``, if set."""
+        tenant_id = current_tenant_id.get()
+        if tenant_id is None or self.tenant_condition is None:
+            return stmt
+        return stmt.where(self.tenant_condition(tenant_id))
+
+    def check_tenant(
+        self, model_dict_list: list[dict[str, Any]], *, function_name: str
+    ) -> None:
+        """Rejects rows with a ``tenant_id`` other than ``current_tenant_id``, if set."""
+        tenant_id = current_tenant_id.get()
+        if tenant_id is None:
+            return
+        for model_dict in model_dict_list:
+            if (
+                "tenant_id" in model_dict
+                and model_dict["tenant_id"] is not None
+                and str(model_dict["tenant_id"]) != str(tenant_id)
+            ):
+                raise TenantAccessDeniedError(
+                    model_table_name=self.model.__tablename__,
+                    function_name=function_name,
+                    class_name=self.__class__.__name__,
+                )
+
     @asynccontextmanager
     async def _optional_transaction(self, db: AsyncSession):
         """Context manager that reuses existing transaction or starts a new one."""
@@ -56,6 +115,60 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
         else:
             yield
 
+    async def _estimated_row_count(self, db: AsyncSession) -> float:
+        """Planner estimate of the rows in the table, partitions included."""
+        now = time.monotonic()
+        if self._row_estimate is not None:
+            estimated_at, rows = self._row_estimate
+            if now - estimated_at < settings.FILTER_ROW_ESTIMATE_TTL_SECONDS:
+                return rows
+
+        stmt = text(
+            "SELECT coalesce(sum(greatest(reltuples, 0)), 0) FROM pg_class"
+            " WHERE oid = CAST(:table_name AS regclass)"
+            " OR oid IN (SELECT inhrelid FROM pg_inherits"
+            " WHERE inhparent = CAST(:table_name AS regclass))"
+        )
+        async with self._optional_transaction(db):
+            result = await db.execute(stmt, {"table_name": self.model.__tablename__})
+        rows = float(result.scalar_one())
+
+        self._row_estimate = (now, rows)
+        return rows
+
+    async def _apply_filter_conditions(
+        self, db: AsyncSession, stmt: Select, *, filter_params: FilterParams
+    ) -> Select:
+        """
+        Adds the ``filter_params.filters`` conditions to ``stmt``.
+
+        Conditions no index can evaluate are rejected on tables estimated larger than
+        ``settings.FILTER_UNINDEXED_MAX_ROWS``, they would scan the whole table.
+        """
+        table = self.model.__table__
+        conditions = filter_params.filter_conditions
+        for condition in conditions:
+            stmt = stmt.where(compile_filter(table, condition))
+
+        unindexed = [
+            condition for condition in conditions if not is_indexed(table, condition)
+        ]
+        if (
+            unindexed
+            and await self._estimated_row_count(db) > settings.FILTER_UNINDEXED_MAX_ROWS
+        ):
+            raise InvalidFilterError(
+                condition=unindexed[0],
+                reason=(
+                    f"The table '{table.name}' is too large to filter without an "
+                    "index, combine it with a filter on an indexed column"
+                ),
+                function_name=self._get_multi.__name__,
+                class_name=self.__class__.__name__,
+            )
+
+        return stmt
+
     def _apply_filter_params(
         self, stmt: Select, *, model: type[ModelType], filter_params: FilterParams
     ) -> Select:
@@ -164,7 +277,7 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
         *,
         filter_params: FilterParams | None = None,
     ) -> Sequence[ModelType] | None:
-        stmt = select(self.model)
+        stmt = self._scoped(select(self.model))
 
         if filters is not None:
             stmt = stmt.filter_by(**filters)
@@ -175,6 +288,10 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
             )
 
         async with self._optional_transaction(db):
+            if filter_params and filter_params.filters:
+                stmt = await self._apply_filter_conditions(
+                    db, stmt, filter_params=filter_params
+                )
             db_objs_result = await db.execute(stmt)
 
         db_objs: Sequence[ModelType] = db_objs_result.scalars().all()
@@ -216,11 +333,106 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
         self.validate(db_objs)
         return db_objs
 
+    def _ids_param(self, ids: Sequence[UUID]) -> BindParameter:
+        return bindparam("ids", list(ids), type_=ARRAY(self.model.id.type))
+
+    async def get_many(
+        self, db: AsyncSession, ids: Sequence[UUID]
+    ) -> tuple[list[ModelType], list[UUID]]:
+        """
+        Objects by ``ids`` with one ``WHERE id = ANY(:ids)``, bound as a single array
+        parameter so the statement is the same for any number of ids.
+
+        Returns the found objects in the order of ``ids``, duplicates once, and the
+        ids that weren't found.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        stmt = self._scoped(
+            select(self.model).where(self.model.id == any_(self._ids_param(unique_ids)))
+        )
+
+        async with self._optional_transaction(db):
+            db_objs_result = await db.execute(stmt)
+
+        db_objs_by_id = {db_obj.id: db_obj for db_obj in db_objs_result.scalars()}
+        db_objs = [
+            db_objs_by_id[obj_id] for obj_id in unique_ids if obj_id in db_objs_by_id
+        ]
+        missing = [obj_id for obj_id in unique_ids if obj_id not in db_objs_by_id]
+
+        self.validate(db_objs)
+        return db_objs, missing
+
+    def _encode_cursor(self, db_obj: ModelType) -> str:
+        key = json.dumps([db_obj.created_at.isoformat(), str(db_obj.id)])
+        return base64.urlsafe_b64encode(key.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> tuple[datetime, UUID]:
+        try:
+            created_at, obj_id = json.loads(base64.urlsafe_b64decode(cursor))
+            return datetime.fromisoformat(created_at), UUID(obj_id)
+        except (ValueError, TypeError) as e:
+            raise InvalidPageCursorError(
+                function_name=self.get_page.__name__,
+                class_name=self.__class__.__name__,
+            ) from e
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        filters: dict[str, Any],
+        *,
+        keyset_params: KeysetParams,
+        descending: bool = False,
+        options: Sequence[ExecutableOption] = (),
+    ) -> tuple[Sequence[ModelType], str | None]:
+        """
+        Keyset pagination ordered by ``(created_at, id)``, for models with ``created_at``.
+
+        Unlike offsets, a page costs the same wherever it is, with an index on
+        ``(<filter column>, created_at)``. ``options``, e.g. ``selectinload``, load
+        relationships of the page.
+
+        Returns the objects and the cursor of the next page, None on the last page.
+        """
+        keys = (self.model.created_at, self.model.id)
+        order = desc if descending else asc
+
+        stmt = self._scoped(select(self.model)).filter_by(**filters).options(*options)
+        if keyset_params.cursor is not None:
+            cursor_keys = self._decode_cursor(keyset_params.cursor)
+            stmt = stmt.where(
+                tuple_(*keys) < cursor_keys
+                if descending
+                else tuple_(*keys) > cursor_keys
+            )
+        stmt = stmt.order_by(*(order(key) for key in keys)).limit(
+            keyset_params.limit + 1
+        )
+
+        async with self._optional_transaction(db):
+            db_objs_result = await db.execute(stmt)
+
+        db_objs = db_objs_result.scalars().all()
+        if len(db_objs) <= keyset_params.limit:
+            return db_objs, None
+
+        db_objs = db_objs[: keyset_params.limit]
+        return db_objs, self._encode_cursor(db_objs[-1])
+
     async def get_count_all(
         self,
         db: AsyncSession,
+        *,
+        filter_params: FilterParams | None = None,
     ) -> int:
-        count_statement = select(func.count()).select_from(self.model)
+        """Counts all rows, or the rows matching ``filter_params.filters``."""
+        count_statement = self._scoped(select(func.count()).select_from(self.model))
+        if filter_params is not None:
+            for condition in filter_params.filter_conditions:
+                count_statement = count_statement.where(
+                    compile_filter(self.model.__table__, condition)
+                )
         async with self._optional_transaction(db):
             count = await db.execute(count_statement)
 
@@ -234,8 +446,7 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
         *,
         obj_in: ...,
         return_nothing: Literal[False] = False,
-    ) -> list[ModelType]:
-        ...
+    ) -> list[ModelType]: ...
 
     @overload
     async def create(
@@ -244,8 +455,7 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
         *,
         obj_in: ...,
         return_nothing: Literal[True],
-    ) -> None:
-        ...
+    ) -> None: ...
 
     async def create(
         self,
@@ -262,6 +472,7 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
             model_dict_list = [obj.model_dump() for obj in obj_in]
         else:
             model_dict_list = [obj_in.model_dump()]
+        self.check_tenant(model_dict_list, function_name=self.create.__name__)
 
         created_objects = await self._create_bulk(
             db, model_dict_list=model_dict_list, return_nothing=return_nothing
@@ -290,9 +501,10 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
         """Update object by id (pk) for object"""
 
         update_data = obj_in.model_dump()
+        self.check_tenant([update_data], function_name=self.update.__name__)
 
         filter = {"id": obj_id}
-        stmt = select(self.model).filter_by(**filter)
+        stmt = self._scoped(select(self.model)).filter_by(**filter)
         async with self._optional_transaction(db):
             db_objs_result = await db.execute(stmt)
             db_obj: ModelType | None = db_objs_result.scalar()
@@ -323,7 +535,7 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
     ) -> Sequence[ModelType]:
         """Can delete multiple objects, but with a specified limit"""
 
-        stmt = select(self.model).filter_by(**filters)
+        stmt = self._scoped(select(self.model)).filter_by(**filters)
         if filter_params and filter_params.sort_columns:
             stmt = self._apply_filter_params(
                 stmt, model=self.model, filter_params=filter_params
@@ -348,8 +560,101 @@ class CRUDBase(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType
                     class_name=self.__class__.__name__,
                 )
 
-            stmt = delete(self.model).filter_by(**filters)
+            stmt = self._scoped(delete(self.model)).filter_by(**filters)
             await db.execute(stmt)
             await db.flush()
         self.validate(db_objs)
         return db_objs
+
+    def _chunk_condition(
+        self,
+        *,
+        ids: Sequence[UUID] | None,
+        filter_params: FilterParams | None,
+        after_id: UUID | None,
+        chunk_size: int,
+    ) -> ColumnElement[bool]:
+        """
+        The first ``chunk_size`` rows by ``id`` after ``after_id``, of ``ids`` or
+        matching ``filter_params.filters``.
+        """
+        stmt = self._scoped(select(self.model.id))
+        if ids is not None:
+            stmt = stmt.where(self.model.id == any_(self._ids_param(ids)))
+        if filter_params is not None:
+            for condition in filter_params.filter_conditions:
+                stmt = stmt.where(compile_filter(self.model.__table__, condition))
+        if after_id is not None:
+            stmt = stmt.where(self.model.id > after_id)
+        stmt = stmt.order_by(self.model.id).limit(chunk_size)
+
+        return self.model.id.in_(stmt.scalar_subquery())
+
+    async def delete_chunk(
+        self,
+        db: AsyncSession,
+        *,
+        ids: Sequence[UUID] | None = None,
+        filter_params: FilterParams | None = None,
+        after_id: UUID | None = None,
+        chunk_size: int,
+    ) -> list[UUID]:
+        """
+        Deletes up to ``chunk_size`` rows of ``ids`` or matching
+        ``filter_params.filters``, with ``id`` after ``after_id``.
+
+        Unlike ``delete`` there is no deletion limit. Bulk jobs call it chunk by chunk,
+        each in a short transaction, so locks are held for one chunk at a time.
+
+        Returns the deleted ids in ascending order, the last is the next ``after_id``.
+        """
+        condition = self._chunk_condition(
+            ids=ids,
+            filter_params=filter_params,
+            after_id=after_id,
+            chunk_size=chunk_size,
+        )
+        stmt = (
+            delete(self.model)
+            .where(condition)
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._optional_transaction(db):
+            result = await db.execute(stmt)
+
+        return sorted(result.scalars().all())
+
+    async def update_chunk(
+        self,
+        db: AsyncSession,
+        *,
+        values: dict[str, Any],
+        ids: Sequence[UUID] | None = None,
+        filter_params: FilterParams | None = None,
+        after_id: UUID | None = None,
+        chunk_size: int,
+    ) -> list[UUID]:
+        """
+        Sets ``values`` on up to ``chunk_size`` rows, selected like ``delete_chunk``.
+
+        Returns the updated ids in ascending order, the last is the next ``after_id``.
+        """
+        self.check_tenant([values], function_name=self.update_chunk.__name__)
+        condition = self._chunk_condition(
+            ids=ids,
+            filter_params=filter_params,
+            after_id=after_id,
+            chunk_size=chunk_size,
+        )
+        stmt = (
+            update(self.model)
+            .where(condition)
+            .values(values)
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._optional_transaction(db):
+            result = await db.execute(stmt)
+
+        return sorted(result.scalars().all())
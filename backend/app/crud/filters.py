@@ -0,0 +1,122 @@
+import json
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Column, ColumnElement, Table, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.schemas import FilterCondition
+from app.exceptions import InvalidFilterError
+
+_RANGE_TYPES = (datetime, int, float)
+
+
+def index_leading_columns(table: Table, *, using: str = "btree") -> set[str]:
+    """
+    Columns that lead the pk, a unique constraint or a non partial index of ``table``,
+    i.e. that an index can look up. ``using`` is the index method.
+    """
+    leading = set()
+    if using == "btree":
+        leading.add(table.primary_key.columns.values()[0].name)
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint) and constraint.columns:
+                leading.add(constraint.columns.values()[0].name)
+
+    for index in table.indexes:
+        options = index.dialect_options["postgresql"]
+        if options["where"] is not None or (options["using"] or "btree") != using:
+            continue
+        name = getattr(index.expressions[0], "name", None)
+        if name is not None:
+            leading.add(name)
+
+    return leading
+
+
+def is_indexed(table: Table, condition: FilterCondition) -> bool:
+    """If an index of ``table`` can evaluate ``condition``."""
+    if condition.operator == "contains":
+        return condition.column in index_leading_columns(table, using="gin")
+    # Btree indexes can't evaluate ``ilike`` with a leading wildcard
+    if condition.operator == "ilike":
+        return False
+    return condition.column in index_leading_columns(table)
+
+
+def _python_type(column: Column) -> type:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return object
+
+
+def _coerce(column: Column, value: str) -> Any:
+    python_type = _python_type(column)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    if python_type is bool:
+        if value not in ("true", "false"):
+            raise ValueError(f"'{value}' is not true or false")
+        return value == "true"
+    if python_type in (int, float):
+        return python_type(value)
+    return value
+
+
+def compile_filter(table: Table, condition: FilterCondition) -> ColumnElement[bool]:
+    """Validates ``condition`` against the columns of ``table`` and compiles it."""
+    column = table.columns.get(condition.column)
+    if column is None:
+        raise InvalidFilterError(
+            function_name=compile_filter.__name__,
+            condition=condition,
+            reason=f"No column named '{condition.column}'",
+        )
+
+    operator = condition.operator
+    python_type = _python_type(column)
+    is_jsonb = isinstance(column.type, JSONB)
+    if (
+        (operator == "contains") != is_jsonb
+        or (operator in ("gt", "gte", "lt", "lte") and python_type not in _RANGE_TYPES)
+        or (operator == "ilike" and python_type is not str)
+        or python_type is object
+    ):
+        raise InvalidFilterError(
+            function_name=compile_filter.__name__,
+            condition=condition,
+            reason=f"Operator '{operator}' is not supported for column '{column.name}'",
+        )
+
+    try:
+        if operator == "contains":
+            contained = json.loads(condition.value)
+            if not isinstance(contained, dict | list):
+                raise ValueError("Expected a JSON object or array")
+            return column.contains(contained)
+        if operator == "ilike":
+            return column.ilike(condition.value)
+        if operator == "in":
+            return column.in_(
+                [_coerce(column, value) for value in condition.value.split(",")]
+            )
+
+        value = _coerce(column, condition.value)
+    except ValueError as e:
+        raise InvalidFilterError(
+            function_name=compile_filter.__name__, condition=condition, reason=str(e)
+        ) from e
+
+    if operator == "eq":
+        return column == value
+    if operator == "gt":
+        return column > value
+    if operator == "gte":
+        return column >= value
+    if operator == "lt":
+        return column < value
+    return column <= value
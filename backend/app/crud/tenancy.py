@@ -0,0 +1,20 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from uuid import UUID
+
+# Tenant that CRUD operations of the current request or job are scoped to, None is
+# unscoped. Set per request by ``app.api.deps.scope_to_token_tenant``.
+current_tenant_id: ContextVar[UUID | None] = ContextVar(
+    "current_tenant_id", default=None
+)
+
+
+@contextmanager
+def tenant_scope(tenant_id: UUID | None) -> Iterator[None]:
+    """Scopes CRUD operations inside the block to ``tenant_id``, None unscopes them."""
+    token = current_tenant_id.set(tenant_id)
+    try:
+        yield
+    finally:
+        current_tenant_id.reset(token)
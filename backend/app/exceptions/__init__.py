@@ -4,12 +4,18 @@ from app.exceptions.model_exceptions.db_exceptions import (
     DbObjNotFoundError,
     DbTooManyItemsDeleteError,
     GeneralDbError,
+    InvalidFilterError,
+    InvalidPageCursorError,
+    TenantAccessDeniedError,
 )
 from app.exceptions.model_exceptions.user_exceptions import (
     BadLoginCredentialsError,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError,
     InvalidPasswordError,
     NewPasswordIsSameError,
     NotAuthenticatedError,
+    RateLimitExceededError,
     SuperUserNotAllowedToChangeActiveSelfError,
     SuperUserNotAllowedToDeleteSelfError,
     UpdateExisitingMeValuesError,
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import starlette.status as status
 
@@ -6,6 +6,9 @@ from app.core.models import User as model_User
 from app.exceptions import MediaMarketAPIError
 from app.logs.logger import logger
 
+if TYPE_CHECKING:
+    from app.core.schemas import FilterCondition
+
 HIDDEN_TABLE_LIST = [model_User.__tablename__]
 
 
@@ -143,3 +146,71 @@ class DbTooManyItemsDeleteError(_DbErrorLogBase):
             class_name=class_name,
             detail=detail,
         )
+
+
+class InvalidPageCursorError(MediaMarketAPIError):
+    """Exception raised for keyset pagination cursors that can't be decoded."""
+
+    def __init__(
+        self,
+        *,
+        function_name: str | None = "Unknown function",
+        class_name: str | None = None,
+        status_code: int = status.HTTP_400_BAD_REQUEST,
+    ):
+        detail = "The page cursor is invalid, use the 'next_cursor' of a previous page"
+        super().__init__(
+            status_code=status_code,
+            function_name=function_name,
+            class_name=class_name,
+            detail=detail,
+        )
+
+
+class InvalidFilterError(MediaMarketAPIError):
+    """Exception raised for filter conditions that can't be applied to a table."""
+
+    def __init__(
+        self,
+        *,
+        condition: "FilterCondition",
+        reason: str,
+        function_name: str | None = "Unknown function",
+        class_name: str | None = None,
+        status_code: int = status.HTTP_400_BAD_REQUEST,
+    ):
+        detail = (
+            f"Invalid filter '{condition.column}:{condition.operator}:"
+            f"{condition.value}'. {reason}"
+        )
+        super().__init__(
+            status_code=status_code,
+            function_name=function_name,
+            class_name=class_name,
+            detail=detail,
+        )
+
+
+class TenantAccessDeniedError(MediaMarketAPIError):
+    """Exception raised for objects outside the tenant the request is scoped to."""
+
+    def __init__(
+        self,
+        *,
+        model_table_name: str | None = None,
+        detail: str | None = None,
+        function_name: str | None = "Unknown function",
+        class_name: str | None = None,
+        status_code: int = status.HTTP_403_FORBIDDEN,
+    ):
+        if detail is None:
+            detail = (
+                f"Objects in the table '{model_table_name}' can't be created or moved "
+                "outside the tenant of the token."
+            )
+        super().__init__(
+            status_code=status_code,
+            function_name=function_name,
+            class_name=class_name,
+            detail=detail,
+        )
@@ -222,3 +222,64 @@ class UserEmailRequiredError(MediaMarketAPIError):
             class_name=class_name,
             detail=detail,
         )
+
+
+class RateLimitExceededError(MediaMarketAPIError):
+    """Exception raised when the tenant or the user of the token is over a rate limit."""
+
+    def __init__(
+        self,
+        *,
+        headers: dict[str, str] | None = None,
+        function_name: str | None = "Unknown function",
+        class_name: str | None = None,
+        status_code: int = status.HTTP_429_TOO_MANY_REQUESTS,
+    ):
+        detail = "Too many requests. Retry after the seconds in the Retry-After header"
+        super().__init__(
+            status_code=status_code,
+            function_name=function_name,
+            class_name=class_name,
+            detail=detail,
+            headers=headers,
+        )
+
+
+class IdempotencyKeyInProgressError(MediaMarketAPIError):
+    """Exception raised when a request with the same Idempotency-Key is still running."""
+
+    def __init__(
+        self,
+        *,
+        retry_after_seconds: int = 1,
+        function_name: str | None = "Unknown function",
+        class_name: str | None = None,
+        status_code: int = status.HTTP_409_CONFLICT,
+    ):
+        detail = "A request with this Idempotency-Key is still in progress"
+        super().__init__(
+            status_code=status_code,
+            function_name=function_name,
+            class_name=class_name,
+            detail=detail,
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
+
+
+class IdempotencyKeyReusedError(MediaMarketAPIError):
+    """Exception raised when an Idempotency-Key is sent with a different request."""
+
+    def __init__(
+        self,
+        *,
+        function_name: str | None = "Unknown function",
+        class_name: str | None = None,
+        status_code: int = status.HTTP_422_UNPROCESSABLE_ENTITY,
+    ):
+        detail = "This Idempotency-Key was already used for a different request"
+        super().__init__(
+            status_code=status_code,
+            function_name=function_name,
+            class_name=class_name,
+            detail=detail,
+        )
@@ -2,10 +2,10 @@ import logging
 import logging.config
 from pathlib import Path
 
-import yaml
-
 
 def setup_logging():
+    import yaml
+
     # Determine the path to config.yml relative to the current directory
     config_path = Path(__file__).parent / "config" / "config.yml"
 
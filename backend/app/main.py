@@ -1,3 +1,4 @@
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -12,22 +13,68 @@ from app.api.exception_handlers import (
     unhandled_exception_handler,
 )
 from app.api.main import api_router
+from app.compression import CompressionMiddleware
+from app.concurrency import (
+    AIMDLimit,
+    ConcurrencyLimitMiddleware,
+    PriorityClass,
+    api_priority_rules,
+)
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import close_qdrant_client, engine, get_qdrant_client
 from app.core.security import azure_scheme
 from app.logs.logger import setup_logging
 from app.middleware import (
+    TaskNameMiddleware,
     log_request_middleware,
 )
+from app.services.generation import chat_generator
+from app.services.job_handlers import job_worker
+from app.services.loop_lag import loop_lag_monitor
+from app.services.translation import translation_batcher
+from app.services.warmup import warm_up
 
 
 @asynccontextmanager
 async def lifespan(
-    app: FastAPI,  # noqa: ARG001
+    app: FastAPI,
 ) -> AsyncGenerator[None, None]:
     setup_logging()
+    # Clients are built here rather than on import, which keeps imports fast for
+    # workers and scripts that don't need them
+    get_qdrant_client()
     await azure_scheme.openid_config.load_config()
+    # In the background, so the health check answers meanwhile, ``/utils/ready``
+    # waits for it
+    warm_up_task = None
+    if settings.WARMUP_ENABLED:
+        warm_up_task = asyncio.create_task(warm_up.run(build_openapi=app.openapi))
+    else:
+        warm_up.finished = True
+    monitor_task = (
+        asyncio.create_task(loop_lag_monitor.run())
+        if settings.LOOP_LAG_MONITOR_ENABLED
+        else None
+    )
+    # Development convenience, deployments run the worker as its own service
+    worker_task = (
+        asyncio.create_task(job_worker.run())
+        if settings.JOB_WORKER_IN_PROCESS
+        else None
+    )
     yield
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+        await asyncio.gather(warm_up_task, return_exceptions=True)
+    if monitor_task is not None:
+        monitor_task.cancel()
+        await asyncio.gather(monitor_task, return_exceptions=True)
+    if worker_task is not None:
+        job_worker.stop()
+        await worker_task
+    await translation_batcher.aclose()
+    await chat_generator.aclose()
+    await close_qdrant_client()
     await engine.dispose()
 
 
@@ -42,7 +89,43 @@ app = FastAPI(
     },
 )
 
-# Set all CORS enabled origins
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    encodings=settings.COMPRESSION_ENCODINGS,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_level=settings.COMPRESSION_BROTLI_LEVEL,
+    zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+)
+
+if settings.CONCURRENCY_LIMIT_ENABLED:
+    app.add_middleware(
+        ConcurrencyLimitMiddleware,
+        limit=AIMDLimit(
+            initial_limit=settings.CONCURRENCY_LIMIT_INITIAL,
+            min_limit=settings.CONCURRENCY_LIMIT_MIN,
+            max_limit=settings.CONCURRENCY_LIMIT_MAX,
+            backoff_ratio=settings.CONCURRENCY_LIMIT_BACKOFF_RATIO,
+        ),
+        priority_classes=[
+            PriorityClass("interactive", 1.0, settings.CONCURRENCY_LATENCY_TARGET_MS),
+            PriorityClass(
+                "heavy",
+                settings.CONCURRENCY_HEAVY_SHARE,
+                settings.CONCURRENCY_HEAVY_LATENCY_TARGET_MS,
+            ),
+            PriorityClass("external", settings.CONCURRENCY_EXTERNAL_SHARE, None),
+        ],
+        rules=api_priority_rules(settings.API_V1_STR),
+        default_priority="interactive",
+        retry_after_seconds=settings.CONCURRENCY_RETRY_AFTER_SECONDS,
+    )
+
+if settings.LOOP_DEBUG:
+    app.add_middleware(TaskNameMiddleware)
+
+# Set all CORS enabled origins. Added after the middleware above so it wraps them,
+# their responses, like the 503 of the concurrency limit, get the CORS headers too
 if settings.all_cors_origins:
     app.add_middleware(
         CORSMiddleware,
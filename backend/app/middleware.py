@@ -1,7 +1,9 @@
+import asyncio
 import http
 import time
 
 from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.api.deps import (
     get_user_ip_from_header,
@@ -48,3 +50,23 @@ async def log_request_middleware(request: Request, call_next):
     if process_time > 10000:
         logger_request.warning("Request took longer than 10 seconds.")
     return response
+
+
+class TaskNameMiddleware:
+    """
+    Names the task handling a request after its method and path, e.g.
+    ``GET /api/v1/tenants/``, so asyncio's slow callback warnings and the stack
+    dumps of ``LoopLagMonitor`` tell which route blocked the event loop.
+
+    Must run inside ``log_request_middleware``, which hands the request to
+    another task.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        task = asyncio.current_task()
+        if scope["type"] == "http" and task is not None:
+            task.set_name(f"{scope['method']} {scope['path']}")
+        await self.app(scope, receive, send)
@@ -0,0 +1,243 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.schemas import (
+    BulkSelection,
+    ChatLogBulkUpdate,
+    ChatSessionBulkUpdate,
+    FilterParams,
+    TenantBulkUpdate,
+    UserBulkUpdate,
+)
+from app.crud import CRUD_chat_logs, CRUD_chat_sessions, CRUD_tenants, CRUD_users
+from app.crud.base import CRUDBase
+from app.crud.filters import compile_filter
+from app.crud.tenancy import current_tenant_id, tenant_scope
+from app.exceptions import DbObjNotFoundError, TenantAccessDeniedError
+from app.services.jobs import enqueue_job, get_progress, report_progress
+
+BULK_DELETE = "bulk_delete"
+BULK_UPDATE = "bulk_update"
+
+# Called with the table name and the ids of each deleted chunk, in its transaction
+DeleteHook = Callable[[AsyncSession, str, Sequence[UUID]], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class BulkResource:
+    crud: CRUDBase[Any, Any, Any, Any]
+    update_schema: type[BaseModel]
+    # CRUDs of the rows that fields of ``update_schema`` reference, by field name
+    references: Mapping[str, CRUDBase[Any, Any, Any, Any]] = field(default_factory=dict)
+
+
+# Resources with bulk endpoints, by table name
+bulk_resources = {
+    resource.crud.model.__tablename__: resource
+    for resource in (
+        BulkResource(crud=CRUD_tenants, update_schema=TenantBulkUpdate),
+        BulkResource(crud=CRUD_users, update_schema=UserBulkUpdate),
+        BulkResource(
+            crud=CRUD_chat_sessions,
+            update_schema=ChatSessionBulkUpdate,
+            references={"user_id": CRUD_users},
+        ),
+        BulkResource(
+            crud=CRUD_chat_logs,
+            update_schema=ChatLogBulkUpdate,
+            references={"chat_session_id": CRUD_chat_sessions},
+        ),
+    )
+}
+
+
+def _selection_payload(
+    crud: CRUDBase[Any, Any, Any, Any], selection: BulkSelection
+) -> dict[str, Any]:
+    # Invalid filters fail the request rather than the job
+    filter_params = FilterParams(filters=selection.filters)
+    for condition in filter_params.filter_conditions:
+        compile_filter(crud.model.__table__, condition)
+
+    tenant_id = current_tenant_id.get()
+    return {
+        "table": crud.model.__tablename__,
+        # The job runs scoped to the tenant of the request that enqueued it
+        "tenant_id": str(tenant_id) if tenant_id is not None else None,
+        "ids": [str(obj_id) for obj_id in selection.ids]
+        if selection.ids is not None
+        else None,
+        "filters": selection.filters,
+    }
+
+
+async def enqueue_bulk_delete(
+    db: AsyncSession,
+    *,
+    crud: CRUDBase[Any, Any, Any, Any],
+    selection: BulkSelection,
+) -> UUID:
+    """Enqueues a ``bulk_delete`` job of the rows of ``selection``, returns its id."""
+    return await enqueue_job(
+        db,
+        kind=BULK_DELETE,
+        payload=_selection_payload(crud, selection),
+        tenant_id=current_tenant_id.get(),
+    )
+
+
+async def _check_references(
+    db: AsyncSession, crud: CRUDBase[Any, Any, Any, Any], values: dict[str, Any]
+) -> None:
+    """
+    Rejects ``values`` referencing rows that don't exist, or that are outside the
+    tenant the request is scoped to, e.g. chat logs moved to another tenant's chat
+    session. ``check_tenant`` only sees ``tenant_id``.
+    """
+    references = bulk_resources[crud.model.__tablename__].references
+    for field_name, referenced_crud in references.items():
+        if values.get(field_name) is None:
+            continue
+        _, missing = await referenced_crud.get_many(db, [values[field_name]])
+        if not missing:
+            continue
+        if current_tenant_id.get() is not None:
+            raise TenantAccessDeniedError(
+                model_table_name=crud.model.__tablename__,
+                function_name=enqueue_bulk_update.__name__,
+            )
+        raise DbObjNotFoundError(
+            model_table_name=referenced_crud.model.__tablename__,
+            obj_indicator={"id": values[field_name]},
+            function_name=enqueue_bulk_update.__name__,
+        )
+
+
+async def enqueue_bulk_update(
+    db: AsyncSession,
+    *,
+    crud: CRUDBase[Any, Any, Any, Any],
+    selection: BulkSelection,
+    values: BaseModel,
+) -> UUID:
+    """
+    Enqueues a ``bulk_update`` job setting the given fields of ``values`` on the rows
+    of ``selection``, returns its id.
+    """
+    payload = _selection_payload(crud, selection)
+    # Moving rows to another tenant fails the request rather than the job
+    crud.check_tenant(
+        [values.model_dump(exclude_unset=True)],
+        function_name=enqueue_bulk_update.__name__,
+    )
+    await _check_references(db, crud, values.model_dump(exclude_unset=True))
+    payload["values"] = values.model_dump(mode="json", exclude_unset=True)
+    return await enqueue_job(
+        db, kind=BULK_UPDATE, payload=payload, tenant_id=current_tenant_id.get()
+    )
+
+
+async def _run_bulk(
+    db: AsyncSession,
+    payload: dict[str, Any],
+    *,
+    values: dict[str, Any] | None,
+    on_delete: DeleteHook | None = None,
+) -> None:
+    """
+    Deletes, or updates with ``values``, the selected rows in chunks of
+    ``settings.BULK_CHUNK_SIZE``. Each chunk commits in its own transaction together
+    with the progress, so a retried job resumes after the last committed chunk.
+
+    Rows are walked in ``id`` order. Rows matching ``filters`` are the ones matching
+    when their chunk runs, rows added behind the current position are skipped.
+    """
+    crud = bulk_resources[payload["table"]].crud
+    ids = sorted(UUID(obj_id) for obj_id in payload["ids"] or [])
+    filter_params = FilterParams(filters=payload["filters"]) if not ids else None
+
+    progress = await get_progress(db)
+    if not progress:
+        total = (
+            len(ids)
+            if not filter_params
+            else await crud.get_count_all(db, filter_params=filter_params)
+        )
+        progress = {"total": total, "processed": 0, "after_id": None}
+    after_id = UUID(progress["after_id"]) if progress["after_id"] else None
+
+    while True:
+        chunk_ids = None
+        if not filter_params:
+            chunk_ids = [
+                obj_id for obj_id in ids if after_id is None or obj_id > after_id
+            ][: settings.BULK_CHUNK_SIZE]
+            if not chunk_ids:
+                break
+
+        async with db.begin():
+            if values is None:
+                processed_ids = await crud.delete_chunk(
+                    db,
+                    ids=chunk_ids,
+                    filter_params=filter_params,
+                    after_id=after_id,
+                    chunk_size=settings.BULK_CHUNK_SIZE,
+                )
+                if on_delete is not None and processed_ids:
+                    await on_delete(db, payload["table"], processed_ids)
+            else:
+                processed_ids = await crud.update_chunk(
+                    db,
+                    values=values,
+                    ids=chunk_ids,
+                    filter_params=filter_params,
+                    after_id=after_id,
+                    chunk_size=settings.BULK_CHUNK_SIZE,
+                )
+            if chunk_ids:
+                # Ids that don't exist move the position too
+                after_id = chunk_ids[-1]
+            elif processed_ids:
+                after_id = processed_ids[-1]
+            else:
+                break
+
+            progress = {
+                **progress,
+                "processed": progress["processed"] + len(processed_ids),
+                "after_id": str(after_id),
+            }
+            await report_progress(db, progress)
+
+        # Leaves room for other transactions between chunks
+        await asyncio.sleep(settings.BULK_CHUNK_PAUSE_SECONDS)
+
+
+def _payload_tenant_scope(payload: dict[str, Any]) -> AbstractContextManager[None]:
+    tenant_id = payload.get("tenant_id")
+    return tenant_scope(UUID(tenant_id) if tenant_id else None)
+
+
+async def bulk_delete(
+    db: AsyncSession, payload: dict[str, Any], *, on_delete: DeleteHook | None = None
+) -> None:
+    with _payload_tenant_scope(payload):
+        await _run_bulk(db, payload, values=None, on_delete=on_delete)
+
+
+async def bulk_update(db: AsyncSession, payload: dict[str, Any]) -> None:
+    update_schema = bulk_resources[payload["table"]].update_schema
+    values = update_schema.model_validate(payload["values"]).model_dump(
+        exclude_unset=True
+    )
+    with _payload_tenant_scope(payload):
+        await _run_bulk(db, payload, values=values)
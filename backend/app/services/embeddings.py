@@ -0,0 +1,53 @@
+import hashlib
+import math
+import re
+from typing import Protocol
+
+from app.core.config import settings
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder(Protocol):
+    """Turns texts into dense vectors of length ``dimension``."""
+
+    dimension: int
+
+    async def embed(self, texts: list[str]) -> list[list[float]]: ...
+
+
+class HashingEmbedder:
+    """
+    Local, dependency free embedder using the hashing trick on lowercased tokens.
+
+    Not semantic, but deterministic and cheap, which makes it usable for tests,
+    benchmarks and deployments without an embedding provider.
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimension
+        for token in _TOKEN_PATTERN.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm == 0:
+            return vector
+        return [value / norm for value in vector]
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in texts]
+
+
+def get_embedder() -> Embedder:
+    if settings.EMBEDDING_PROVIDER == "hashing":
+        return HashingEmbedder(dimension=settings.EMBEDDING_DIMENSION)
+    raise ValueError(f"Unknown embedding provider: {settings.EMBEDDING_PROVIDER}")
+
+
+embedder = get_embedder()
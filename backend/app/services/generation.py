@@ -0,0 +1,172 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Any, Protocol
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.models import ChatLog
+from app.logs.logger import logger
+from app.services.job_handlers import enqueue_index_chat_logs
+
+
+class GenerationProvider(Protocol):
+    """Generates a response to a prompt, yielding tokens as they are produced."""
+
+    def stream(self, prompt: str) -> AsyncIterator[str]: ...
+
+
+class LocalGenerationProvider:
+    """
+    Stand-in provider echoing the prompt back word by word.
+
+    Used for local development and tests.
+    """
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        for word in f"Echo: {prompt}".split(" "):
+            yield f"{word} "
+            await asyncio.sleep(0)
+
+
+def format_sse(event: str, data: dict[str, Any]) -> str:
+    """Formats one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class ChatGenerator:
+    def __init__(
+        self,
+        *,
+        provider: GenerationProvider,
+        session_factory: async_sessionmaker[AsyncSession],
+        checkpoint_tokens: int,
+    ):
+        """
+        Streams generated responses as server-sent events, persists them as chat logs.
+
+        The chat log row is written in a background task after the stream ends, so
+        neither the first nor the last byte waits on the database. With
+        ``checkpoint_tokens`` > 0 the partial response is also upserted every
+        ``checkpoint_tokens`` tokens. Writes for one chat log run in order, the last
+        one also enqueues its ``index_chat_logs`` job.
+
+        :param provider: GenerationProvider
+            Provider generating the tokens
+        :param session_factory: async_sessionmaker
+            Sessions for writing the chat logs
+        :param checkpoint_tokens: int
+            Tokens between checkpoints, 0 disables checkpoints
+        """
+        self.provider = provider
+        self.session_factory = session_factory
+        self.checkpoint_tokens = checkpoint_tokens
+
+        self._write_tasks: set[asyncio.Task[None]] = set()
+
+    async def _upsert(
+        self,
+        *,
+        chat_log_id: UUID,
+        chat_session_id: UUID,
+        prompt: str,
+        response_text: str,
+        created_at: datetime,
+        index: bool = False,
+    ) -> None:
+        stmt = insert(ChatLog).values(
+            id=chat_log_id,
+            created_at=created_at,
+            chat_session_id=chat_session_id,
+            prompt=prompt,
+            response_text=response_text,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChatLog.id, ChatLog.created_at],
+            set_={"response_text": stmt.excluded.response_text},
+        )
+        async with self.session_factory() as db:
+            async with db.begin():
+                if not index:
+                    await db.execute(stmt)
+                    return
+                chat_log = (await db.execute(stmt.returning(ChatLog))).scalar_one()
+                await enqueue_index_chat_logs(db, chat_logs=[chat_log])
+
+    def _write_done(self, task: asyncio.Task[None]) -> None:
+        self._write_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Could not persist generated chat log: {task.exception()}")
+
+    def _schedule_write(
+        self, previous: asyncio.Task[None] | None, **values: Any
+    ) -> asyncio.Task[None]:
+        async def write() -> None:
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            await self._upsert(**values)
+
+        task = asyncio.create_task(write())
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_done)
+        return task
+
+    async def stream(
+        self, *, chat_log_id: UUID, chat_session_id: UUID, prompt: str
+    ) -> AsyncIterator[str]:
+        """
+        Yields a ``token`` event per token, then ``done`` with the chat log id.
+
+        If the provider fails an ``error`` event is sent. The response generated
+        so far is persisted in all cases, also when the client disconnects.
+        """
+        tokens: list[str] = []
+        last_write: asyncio.Task[None] | None = None
+        # Fixed up front, ``created_at`` is part of the key the checkpoints upsert on
+        values = {
+            "chat_log_id": chat_log_id,
+            "chat_session_id": chat_session_id,
+            "prompt": prompt,
+            "created_at": datetime.now(timezone.utc),
+        }
+        try:
+            async for token in self.provider.stream(prompt):
+                tokens.append(token)
+                yield format_sse("token", {"text": token})
+
+                if self.checkpoint_tokens and len(tokens) % self.checkpoint_tokens == 0:
+                    last_write = self._schedule_write(
+                        last_write, **values, response_text="".join(tokens)
+                    )
+            yield format_sse("done", {"chat_log_id": str(chat_log_id)})
+        except Exception as e:
+            logger.error(f"Generation failed for chat log {chat_log_id}: {e}")
+            yield format_sse("error", {"detail": "Generation failed"})
+        finally:
+            if tokens:
+                self._schedule_write(
+                    last_write, **values, response_text="".join(tokens), index=True
+                )
+
+    async def aclose(self) -> None:
+        """Waits for pending chat log writes."""
+        if self._write_tasks:
+            await asyncio.gather(*self._write_tasks, return_exceptions=True)
+
+
+def get_generation_provider() -> GenerationProvider:
+    if settings.GENERATION_PROVIDER == "local":
+        return LocalGenerationProvider()
+    raise ValueError(f"Unknown generation provider: {settings.GENERATION_PROVIDER}")
+
+
+chat_generator = ChatGenerator(
+    provider=get_generation_provider(),
+    session_factory=AsyncSessionLocal,
+    checkpoint_tokens=settings.GENERATION_CHECKPOINT_TOKENS,
+)
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import NamedTuple
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.models import IdempotencyKey
+from app.exceptions import IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+
+
+class StoredResponse(NamedTuple):
+    status_code: int
+    media_type: str | None
+    body: bytes
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int,
+        claim_timeout_seconds: int,
+        wait_seconds: float,
+        poll_interval_seconds: float,
+    ):
+        """
+        Keys of requests sent with an ``Idempotency-Key`` header and their responses,
+        in the ``idempotency_keys`` table.
+
+        The first request claims its key, retries of it wait until it's done and
+        then get its response, instead of running the request again.
+
+        :param ttl_seconds: int
+            Keys and their responses are kept this long
+        :param claim_timeout_seconds: int
+            Claims older than this are taken over, the request that claimed the key
+            died before it completed or released it
+        :param wait_seconds: float
+            Retries wait this long for the request in progress, then get a 409
+        :param poll_interval_seconds: float
+            Retries check this often whether the request in progress is done
+        """
+        self.ttl_seconds = ttl_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+
+    async def _try_claim(
+        self, db: AsyncSession, *, owner: str, key: str, request_hash: str
+    ) -> bool:
+        now = func.now()
+        values = {
+            "request_hash": request_hash,
+            "status_code": None,
+            "media_type": None,
+            "response_body": None,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl_seconds),
+        }
+        # Concurrent claims conflict on the primary key, only one of them inserts
+        stmt = (
+            insert(IdempotencyKey)
+            .values(owner=owner, key=key, **values)
+            .on_conflict_do_update(
+                index_elements=[IdempotencyKey.owner, IdempotencyKey.key],
+                set_=values,
+                where=or_(
+                    IdempotencyKey.expires_at < now,
+                    and_(
+                        IdempotencyKey.status_code.is_(None),
+                        IdempotencyKey.created_at
+                        < now - timedelta(seconds=self.claim_timeout_seconds),
+                    ),
+                ),
+            )
+            .returning(IdempotencyKey.key)
+        )
+        async with db.begin():
+            return (await db.execute(stmt)).scalar_one_or_none() is not None
+
+    async def claim(
+        self, db: AsyncSession, *, owner: str, key: str, request_hash: str
+    ) -> StoredResponse | None:
+        """
+        Claims ``key`` for a request, returns None if it's claimed, the request
+        should run and then be completed or released.
+
+        Returns the stored response if the key is already completed. While another
+        request holds the key, waits for it up to ``wait_seconds``, then raises
+        ``IdempotencyKeyInProgressError``. A key sent with a different request raises
+        ``IdempotencyKeyReusedError``.
+        """
+        stmt = select(
+            IdempotencyKey.request_hash,
+            IdempotencyKey.status_code,
+            IdempotencyKey.media_type,
+            IdempotencyKey.response_body,
+        ).where(IdempotencyKey.owner == owner, IdempotencyKey.key == key)
+
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            if await self._try_claim(
+                db, owner=owner, key=key, request_hash=request_hash
+            ):
+                return None
+
+            async with db.begin():
+                row = (await db.execute(stmt)).one_or_none()
+            # None when the holder released the key meanwhile, claimed next round
+            if row is not None:
+                if row.request_hash != request_hash:
+                    raise IdempotencyKeyReusedError(
+                        function_name=self.claim.__name__,
+                        class_name=self.__class__.__name__,
+                    )
+                if row.status_code is not None:
+                    return StoredResponse(
+                        status_code=row.status_code,
+                        media_type=row.media_type,
+                        body=row.response_body or b"",
+                    )
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgressError(
+                    retry_after_seconds=max(1, round(self.wait_seconds)),
+                    function_name=self.claim.__name__,
+                    class_name=self.__class__.__name__,
+                )
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def complete(
+        self, db: AsyncSession, *, owner: str, key: str, response: StoredResponse
+    ) -> None:
+        """Stores the response of the request holding ``key``."""
+        stmt = (
+            update(IdempotencyKey)
+            .where(IdempotencyKey.owner == owner, IdempotencyKey.key == key)
+            .values(
+                status_code=response.status_code,
+                media_type=response.media_type,
+                response_body=response.body,
+            )
+        )
+        async with db.begin():
+            await db.execute(stmt)
+
+    async def release(self, db: AsyncSession, *, owner: str, key: str) -> None:
+        """Deletes the claim of a failed request, so a retry runs it again."""
+        stmt = delete(IdempotencyKey).where(
+            IdempotencyKey.owner == owner,
+            IdempotencyKey.key == key,
+            IdempotencyKey.status_code.is_(None),
+        )
+        async with db.begin():
+            await db.execute(stmt)
+
+    async def delete_expired(self, db: AsyncSession) -> int:
+        """Deletes the expired keys, returns how many."""
+        stmt = delete(IdempotencyKey).where(IdempotencyKey.expires_at < func.now())
+        async with db.begin():
+            result = await db.execute(stmt)
+        return result.rowcount  # type: ignore[attr-defined, no-any-return]
+
+
+idempotency_store = IdempotencyStore(
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    claim_timeout_seconds=settings.IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+    poll_interval_seconds=settings.IDEMPOTENCY_POLL_INTERVAL_SECONDS,
+)
@@ -0,0 +1,164 @@
+from collections import defaultdict
+from collections.abc import Sequence
+from functools import partial
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.models import ChatLog, ChatSession
+from app.crud.tenancy import current_tenant_id
+from app.services.bulk import BULK_DELETE, BULK_UPDATE, bulk_delete, bulk_update
+from app.services.embeddings import embedder
+from app.services.jobs import JobHandler, JobWorker, enqueue_job
+from app.services.user_data import ERASE_USER, UserDataManager
+from app.services.vector_store import VectorCollection
+
+INDEX_CHAT_LOGS = "index_chat_logs"
+DELETE_CHAT_LOG_POINTS = "delete_chat_log_points"
+
+chat_log_collection = VectorCollection(
+    embedder=embedder,
+    name=settings.CHAT_LOGS_COLLECTION_NAME,
+    payload_indexes=("tenant_id", "chat_session_id"),
+)
+
+
+async def index_chat_logs(db: AsyncSession, payload: dict[str, Any]) -> None:
+    """Embeds the chat logs ``payload["chat_log_ids"]`` into ``chat_log_collection``."""
+    chat_log_ids = [UUID(chat_log_id) for chat_log_id in payload["chat_log_ids"]]
+
+    stmt = (
+        select(ChatLog, ChatSession.tenant_id)
+        .join(ChatSession, ChatSession.id == ChatLog.chat_session_id)
+        .where(ChatLog.id.in_(chat_log_ids))
+    )
+    async with db.begin():
+        rows = (await db.execute(stmt)).tuples().all()
+
+    # Chat logs deleted since the job was enqueued are skipped
+    await chat_log_collection.upsert(
+        [
+            (
+                chat_log.id,
+                f"{chat_log.prompt}\n{chat_log.response_text}",
+                {
+                    "tenant_id": str(tenant_id),
+                    "chat_session_id": str(chat_log.chat_session_id),
+                },
+            )
+            for chat_log, tenant_id in rows
+        ]
+    )
+
+
+async def enqueue_index_chat_logs(
+    db: AsyncSession, *, chat_logs: Sequence[ChatLog]
+) -> None:
+    """
+    Enqueues ``index_chat_logs`` jobs in the open transaction of ``db``.
+
+    One job per tenant, so the tenant concurrency limit of the workers applies.
+    """
+    if not chat_logs:
+        return
+
+    chat_session_ids = {chat_log.chat_session_id for chat_log in chat_logs}
+    result = await db.execute(
+        select(ChatSession.id, ChatSession.tenant_id).where(
+            ChatSession.id.in_(chat_session_ids)
+        )
+    )
+    tenant_by_session = dict(result.tuples().all())
+
+    chat_log_ids_by_tenant: dict[UUID, list[str]] = defaultdict(list)
+    for chat_log in chat_logs:
+        tenant_id = tenant_by_session[chat_log.chat_session_id]
+        chat_log_ids_by_tenant[tenant_id].append(str(chat_log.id))
+
+    for tenant_id, chat_log_ids in chat_log_ids_by_tenant.items():
+        await enqueue_job(
+            db,
+            kind=INDEX_CHAT_LOGS,
+            payload={"chat_log_ids": chat_log_ids},
+            tenant_id=tenant_id,
+        )
+
+
+async def delete_chat_log_points(db: AsyncSession, payload: dict[str, Any]) -> None:  # noqa: ARG001
+    """
+    Deletes the points of the chat logs ``payload["chat_log_ids"]``, and of all chat
+    logs of the chat sessions ``payload["chat_session_ids"]``.
+    """
+    await chat_log_collection.delete(
+        [UUID(chat_log_id) for chat_log_id in payload.get("chat_log_ids", [])]
+    )
+    for chat_session_id in payload.get("chat_session_ids", []):
+        await chat_log_collection.delete_where(chat_session_id=chat_session_id)
+
+
+async def enqueue_delete_chat_log_points(
+    db: AsyncSession,
+    *,
+    chat_log_ids: Sequence[UUID] = (),
+    chat_session_ids: Sequence[UUID] = (),
+) -> None:
+    """
+    Enqueues a ``delete_chat_log_points`` job in the open transaction of ``db``, so
+    the points are only deleted once the rows are.
+    """
+    if not chat_log_ids and not chat_session_ids:
+        return
+
+    await enqueue_job(
+        db,
+        kind=DELETE_CHAT_LOG_POINTS,
+        payload={
+            "chat_log_ids": [str(chat_log_id) for chat_log_id in chat_log_ids],
+            "chat_session_ids": [
+                str(chat_session_id) for chat_session_id in chat_session_ids
+            ],
+        },
+        tenant_id=current_tenant_id.get(),
+    )
+
+
+async def _delete_points_of_chunk(
+    db: AsyncSession, table: str, ids: Sequence[UUID]
+) -> None:
+    if table == ChatLog.__tablename__:
+        await enqueue_delete_chat_log_points(db, chat_log_ids=ids)
+    elif table == ChatSession.__tablename__:
+        await enqueue_delete_chat_log_points(db, chat_session_ids=ids)
+
+
+user_data_manager = UserDataManager(
+    session_factory=AsyncSessionLocal,
+    chat_log_points=chat_log_collection,
+    export_batch_size=settings.USER_EXPORT_BATCH_SIZE,
+    export_gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    erase_chunk_size=settings.BULK_CHUNK_SIZE,
+    erase_pause_seconds=settings.BULK_CHUNK_PAUSE_SECONDS,
+)
+
+JOB_HANDLERS: dict[str, JobHandler] = {
+    INDEX_CHAT_LOGS: index_chat_logs,
+    DELETE_CHAT_LOG_POINTS: delete_chat_log_points,
+    BULK_DELETE: partial(bulk_delete, on_delete=_delete_points_of_chunk),
+    BULK_UPDATE: bulk_update,
+    ERASE_USER: user_data_manager.erase,
+}
+
+job_worker = JobWorker(
+    handlers=JOB_HANDLERS,
+    session_factory=AsyncSessionLocal,
+    concurrency=settings.JOB_WORKER_CONCURRENCY,
+    tenant_concurrency=settings.JOB_TENANT_CONCURRENCY,
+    poll_interval_seconds=settings.JOB_POLL_INTERVAL_SECONDS,
+    retry_attempts=settings.JOB_RETRY_ATTEMPTS,
+    retry_wait_seconds=settings.JOB_RETRY_WAIT_SECONDS,
+    lock_timeout_seconds=settings.JOB_LOCK_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,374 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
+
+from app.core.config import settings
+from app.core.models import Job
+from app.crud.tenancy import current_tenant_id
+from app.exceptions import DbObjNotFoundError
+from app.logs.logger import logger
+
+JobHandler = Callable[[AsyncSession, dict[str, Any]], Awaitable[None]]
+
+# Id of the job the current task runs, set by ``JobWorker.execute``
+current_job_id: ContextVar[UUID | None] = ContextVar("current_job_id", default=None)
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    *,
+    kind: str,
+    payload: dict[str, Any],
+    tenant_id: UUID | None = None,
+    priority: int = 0,
+) -> UUID:
+    """
+    Adds a job to the queue, returns its id.
+
+    Joins the transaction of ``db`` if one is open, so a job enqueued together
+    with the rows it works on is only visible to workers once they are committed.
+    """
+    stmt = (
+        insert(Job)
+        .values(
+            kind=kind,
+            payload=payload,
+            tenant_id=tenant_id,
+            priority=priority,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+        )
+        .returning(Job.id)
+    )
+    if not db.in_transaction():
+        async with db.begin():
+            result = await db.execute(stmt)
+    else:
+        result = await db.execute(stmt)
+
+    return result.scalar_one()
+
+
+async def get_job(db: AsyncSession, job_id: UUID) -> Job:
+    """
+    Raises `DbObjNotFoundError` if the job doesn't exist, or belongs to another
+    tenant than ``current_tenant_id``.
+    """
+    stmt = select(Job).where(Job.id == job_id)
+    tenant_id = current_tenant_id.get()
+    if tenant_id is not None:
+        stmt = stmt.where(Job.tenant_id == tenant_id)
+    if not db.in_transaction():
+        async with db.begin():
+            result = await db.execute(stmt)
+    else:
+        result = await db.execute(stmt)
+
+    job = result.scalar_one_or_none()
+    if job is None:
+        raise DbObjNotFoundError(
+            model_table_name=Job.__tablename__,
+            obj_indicator={"id": job_id},
+            function_name=get_job.__name__,
+        )
+    return job
+
+
+async def get_progress(db: AsyncSession) -> dict[str, Any]:
+    """Progress stored for the current job, to resume where a failed attempt stopped."""
+    job_id = current_job_id.get()
+    if job_id is None:
+        return {}
+
+    stmt = select(Job.progress).where(Job.id == job_id)
+    if not db.in_transaction():
+        async with db.begin():
+            result = await db.execute(stmt)
+    else:
+        result = await db.execute(stmt)
+
+    return result.scalar_one_or_none() or {}
+
+
+async def report_progress(db: AsyncSession, progress: dict[str, Any]) -> None:
+    """
+    Stores ``progress`` on the current job, does nothing outside a job.
+
+    Joins the transaction of ``db`` if one is open, so the progress commits together
+    with the work it reports. Also renews the job lock, so long jobs that report
+    progress aren't requeued as abandoned.
+    """
+    job_id = current_job_id.get()
+    if job_id is None:
+        return
+
+    stmt = (
+        update(Job)
+        .where(Job.id == job_id)
+        .values(progress=progress, locked_at=func.now())
+    )
+    if not db.in_transaction():
+        async with db.begin():
+            await db.execute(stmt)
+    else:
+        await db.execute(stmt)
+
+
+@dataclass
+class ClaimedJob:
+    id: UUID
+    kind: str
+    payload: dict[str, Any]
+    tenant_id: UUID | None
+    attempts: int
+    max_attempts: int
+
+
+class JobWorker:
+    def __init__(
+        self,
+        *,
+        handlers: Mapping[str, JobHandler],
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int,
+        tenant_concurrency: int,
+        poll_interval_seconds: float,
+        retry_attempts: int,
+        retry_wait_seconds: float,
+        lock_timeout_seconds: int,
+    ):
+        """
+        Runs jobs from the ``jobs`` table, several worker processes can run side by side.
+
+        Jobs are claimed in priority order with ``SELECT ... FOR UPDATE SKIP LOCKED``,
+        skipping tenants which already have ``tenant_concurrency`` running jobs. The
+        tenant limit is checked when claiming, so concurrent claims can briefly exceed it.
+
+        A failing handler is retried in-process with exponential backoff (tenacity).
+        When it keeps failing, the job is requeued with a delay until it has used
+        ``Job.max_attempts`` claims, then it's marked failed.
+
+        :param handlers: Mapping[str, JobHandler]
+            Handler for each job kind
+        :param session_factory: async_sessionmaker
+            Sessions for claiming jobs and for the handlers
+        :param concurrency: int
+            Max jobs running at once in this worker
+        :param tenant_concurrency: int
+            Max jobs of one tenant running at once across workers
+        :param poll_interval_seconds: float
+            Wait between polls while the queue is empty
+        :param retry_attempts: int
+            In-process attempts of a handler per claim
+        :param retry_wait_seconds: float
+            Base of the exponential wait between in-process attempts
+        :param lock_timeout_seconds: int
+            Running jobs locked for longer are requeued, e.g. after a worker crash
+        """
+        self.handlers = handlers
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.tenant_concurrency = tenant_concurrency
+        self.poll_interval_seconds = poll_interval_seconds
+        self.retry_attempts = retry_attempts
+        self.retry_wait_seconds = retry_wait_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+
+        self._running: set[asyncio.Task[None]] = set()
+        self._stopping = asyncio.Event()
+
+    async def claim(self, limit: int) -> list[ClaimedJob]:
+        """Marks up to ``limit`` queued jobs as running and returns them."""
+        saturated_tenants = (
+            select(Job.tenant_id)
+            .where(Job.status == "running", Job.tenant_id.is_not(None))
+            .group_by(Job.tenant_id)
+            .having(func.count() >= self.tenant_concurrency)
+        )
+        stmt = (
+            select(Job)
+            .where(
+                Job.status == "queued",
+                Job.run_after <= func.now(),
+                or_(Job.tenant_id.is_(None), Job.tenant_id.not_in(saturated_tenants)),
+            )
+            .order_by(Job.priority.desc(), Job.run_after)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        async with self.session_factory() as db:
+            async with db.begin():
+                candidates = (await db.execute(stmt)).scalars().all()
+                tenant_ids = {job.tenant_id for job in candidates if job.tenant_id}
+
+                running_per_tenant: dict[UUID, int] = {}
+                if tenant_ids:
+                    running = await db.execute(
+                        select(Job.tenant_id, func.count())
+                        .where(Job.status == "running", Job.tenant_id.in_(tenant_ids))
+                        .group_by(Job.tenant_id)
+                    )
+                    running_per_tenant = dict(running.tuples().all())
+
+                claimed: list[Job] = []
+                for job in candidates:
+                    if job.tenant_id is not None:
+                        running_count = running_per_tenant.get(job.tenant_id, 0)
+                        if running_count >= self.tenant_concurrency:
+                            continue
+                        running_per_tenant[job.tenant_id] = running_count + 1
+                    claimed.append(job)
+
+                attempts: dict[UUID, int] = {}
+                if claimed:
+                    # Attempts as counted by the row, the loaded jobs aren't
+                    # synchronized with the update
+                    result = await db.execute(
+                        update(Job)
+                        .where(Job.id.in_([job.id for job in claimed]))
+                        .values(
+                            status="running",
+                            attempts=Job.attempts + 1,
+                            locked_at=func.now(),
+                        )
+                        .returning(Job.id, Job.attempts)
+                        .execution_options(synchronize_session=False)
+                    )
+                    attempts = dict(result.tuples().all())
+
+        return [
+            ClaimedJob(
+                id=job.id,
+                kind=job.kind,
+                payload=job.payload,
+                tenant_id=job.tenant_id,
+                attempts=attempts[job.id],
+                max_attempts=job.max_attempts,
+            )
+            for job in claimed
+        ]
+
+    async def _finish(self, job: ClaimedJob, *, error: Exception | None) -> None:
+        if error is None:
+            values: dict[str, Any] = {"status": "succeeded", "last_error": None}
+        elif job.attempts < job.max_attempts:
+            delay = timedelta(seconds=self.retry_wait_seconds * 2**job.attempts)
+            values = {
+                "status": "queued",
+                "last_error": str(error),
+                "run_after": func.now() + delay,
+            }
+        else:
+            values = {"status": "failed", "last_error": str(error)}
+
+        async with self.session_factory() as db:
+            async with db.begin():
+                await db.execute(
+                    update(Job).where(Job.id == job.id).values(locked_at=None, **values)
+                )
+
+    async def execute(self, job: ClaimedJob) -> None:
+        handler = self.handlers.get(job.kind)
+        error: Exception | None = None
+        job_id_token = current_job_id.set(job.id)
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind '{job.kind}'")
+
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(self.retry_attempts),
+                wait=wait_exponential(multiplier=self.retry_wait_seconds),
+                reraise=True,
+            ):
+                with attempt:
+                    async with self.session_factory() as db:
+                        await handler(db, job.payload)
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+            error = e
+        finally:
+            current_job_id.reset(job_id_token)
+
+        await self._finish(job, error=error)
+
+    async def requeue_abandoned(self) -> None:
+        """Requeues or fails running jobs whose lock timed out."""
+        abandoned = Job.locked_at < func.now() - timedelta(
+            seconds=self.lock_timeout_seconds
+        )
+        async with self.session_factory() as db:
+            async with db.begin():
+                await db.execute(
+                    update(Job)
+                    .where(Job.status == "running", abandoned)
+                    .values(
+                        status="queued",
+                        locked_at=None,
+                        last_error="Job lock timed out",
+                    )
+                    .where(Job.attempts < Job.max_attempts)
+                )
+                await db.execute(
+                    update(Job)
+                    .where(Job.status == "running", abandoned)
+                    .values(
+                        status="failed",
+                        locked_at=None,
+                        last_error="Job lock timed out",
+                    )
+                )
+
+    def _start(self, job: ClaimedJob) -> None:
+        task = asyncio.create_task(self.execute(job))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def run_once(self) -> int:
+        """Claims jobs up to the free capacity and starts them, returns the number started."""
+        capacity = self.concurrency - len(self._running)
+        if capacity <= 0:
+            return 0
+
+        jobs = await self.claim(capacity)
+        for job in jobs:
+            self._start(job)
+        return len(jobs)
+
+    async def run(self) -> None:
+        """Polls for jobs until ``stop`` is called, then waits for running jobs."""
+        self._stopping.clear()
+        await self.requeue_abandoned()
+        last_requeue = asyncio.get_running_loop().time()
+
+        while not self._stopping.is_set():
+            try:
+                started = await self.run_once()
+                now = asyncio.get_running_loop().time()
+                if now - last_requeue > self.lock_timeout_seconds / 2:
+                    await self.requeue_abandoned()
+                    last_requeue = now
+            except Exception as e:
+                logger.error(f"Job worker could not poll the queue: {e}")
+                started = 0
+
+            if started == 0:
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=self.poll_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def stop(self) -> None:
+        self._stopping.set()
@@ -0,0 +1,170 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Sequence
+
+from app.core.config import settings
+from app.core.schemas import LoopLagHistogram
+from app.logs.logger import logger
+
+
+class LagHistogram:
+    def __init__(self, bounds_ms: Sequence[float]):
+        """
+        Counts of lag samples by upper bound in milliseconds, cumulative in the
+        snapshot like Prometheus histograms, with an implicit ``+Inf`` bucket.
+        """
+        self.bounds_ms = sorted(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, lag_ms: float) -> None:
+        self.counts[bisect_left(self.bounds_ms, lag_ms)] += 1
+        self.count += 1
+        self.sum_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def snapshot(self) -> LoopLagHistogram:
+        buckets = {}
+        cumulative = 0
+        labels = [f"{bound:g}" for bound in self.bounds_ms] + ["+Inf"]
+        for label, count in zip(labels, self.counts, strict=True):
+            cumulative += count
+            buckets[label] = cumulative
+        return LoopLagHistogram(
+            buckets=buckets,
+            count=self.count,
+            sum_ms=round(self.sum_ms, 3),
+            max_ms=round(self.max_ms, 3),
+        )
+
+
+class LoopLagMonitor:
+    def __init__(
+        self,
+        *,
+        interval_seconds: float,
+        buckets_ms: Sequence[float],
+        window_seconds: float,
+        debug: bool,
+        slow_callback_ms: float,
+        stack_dump_threshold_ms: float,
+    ):
+        """
+        Samples how late the event loop wakes up from a sleep, the time every
+        request on this worker waits for whatever blocks the loop, e.g. bcrypt or
+        validating a huge list in a route.
+
+        In debug mode it also turns on asyncio's debug mode, which logs callbacks
+        taking longer than ``slow_callback_ms`` with their task, named after the
+        route by ``TaskNameMiddleware``. A watchdog thread then logs the stack of the
+        event loop's thread while the loop is blocked longer than
+        ``stack_dump_threshold_ms``, once per threshold, catching the blocking code
+        in the act.
+
+        :param interval_seconds: float
+            Time between samples
+        :param buckets_ms: Sequence[float]
+            Upper bounds of the histogram buckets
+        :param window_seconds: float
+            Samples this recent count for ``recent_max_ms``
+        :param debug: bool
+            Slow callback logging and stack dumps, with asyncio's debug mode
+            overhead
+        :param slow_callback_ms: float
+            In debug mode, callbacks running longer than this are logged
+        :param stack_dump_threshold_ms: float
+            In debug mode, the loop's stack is logged once it's blocked this long,
+            and again for every further threshold it stays blocked
+        """
+        self.interval_seconds = interval_seconds
+        self.window_seconds = window_seconds
+        self.debug = debug
+        self.slow_callback_ms = slow_callback_ms
+        self.stack_dump_threshold_ms = stack_dump_threshold_ms
+
+        self.histogram = LagHistogram(buckets_ms)
+        # (time, lag_ms) of the samples within the window
+        self._recent: deque[tuple[float, float]] = deque()
+        # When the loop should wake up from the current sample's sleep
+        self._wake_at = time.monotonic()
+        self._stopped = threading.Event()
+
+    def _observe(self, lag_ms: float) -> None:
+        now = time.monotonic()
+        self.histogram.observe(lag_ms)
+        self._recent.append((now, lag_ms))
+        while self._recent[0][0] < now - self.window_seconds:
+            self._recent.popleft()
+
+    def recent_max_ms(self) -> float | None:
+        """Largest lag of the last ``window_seconds``, None without samples."""
+        since = time.monotonic() - self.window_seconds
+        return max(
+            (lag_ms for sampled_at, lag_ms in self._recent if sampled_at >= since),
+            default=None,
+        )
+
+    def _dump_stack(self, loop: asyncio.AbstractEventLoop, thread_id: int) -> None:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            return
+        task = asyncio.current_task(loop)
+        blocked_ms = (time.monotonic() - self._wake_at) * 1000
+        logger.warning(
+            f"Event loop blocked for {blocked_ms:.0f}ms"
+            f" in task {task.get_name() if task else None}:\n"
+            + "".join(traceback.format_stack(frame))
+        )
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, thread_id: int) -> None:
+        threshold_seconds = self.stack_dump_threshold_ms / 1000
+        last_dump = 0.0
+        while not self._stopped.wait(threshold_seconds / 4):
+            now = time.monotonic()
+            if (
+                now - self._wake_at > threshold_seconds
+                and now - last_dump > threshold_seconds
+            ):
+                self._dump_stack(loop, thread_id)
+                last_dump = now
+
+    async def run(self) -> None:
+        """Samples until cancelled."""
+        loop = asyncio.get_running_loop()
+        if self.debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.slow_callback_ms / 1000
+            self._stopped.clear()
+            threading.Thread(
+                target=self._watch,
+                args=(loop, threading.get_ident()),
+                name="loop-lag-watchdog",
+                daemon=True,
+            ).start()
+
+        try:
+            while True:
+                self._wake_at = time.monotonic() + self.interval_seconds
+                await asyncio.sleep(self.interval_seconds)
+                lag_seconds = time.monotonic() - self._wake_at
+                self._observe(max(0.0, lag_seconds * 1000))
+        finally:
+            # The watchdog exits within a quarter of the threshold
+            self._stopped.set()
+
+
+loop_lag_monitor = LoopLagMonitor(
+    interval_seconds=settings.LOOP_LAG_SAMPLE_INTERVAL_SECONDS,
+    buckets_ms=settings.LOOP_LAG_BUCKETS_MS,
+    window_seconds=settings.LOOP_LAG_WINDOW_SECONDS,
+    debug=settings.LOOP_DEBUG,
+    slow_callback_ms=settings.LOOP_SLOW_CALLBACK_MS,
+    stack_dump_threshold_ms=settings.LOOP_STACK_DUMP_THRESHOLD_MS,
+)
@@ -0,0 +1,196 @@
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.logs.logger import logger
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` after the month of ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class MonthlyPartitionManager:
+    def __init__(
+        self,
+        *,
+        table_name: str,
+        session_factory: async_sessionmaker[AsyncSession],
+        months_ahead: int,
+        retention_months: int | None,
+    ):
+        """
+        Creates and drops the monthly partitions of a table partitioned by
+        ``RANGE (created_at)``. Partitions are named ``<table>_y<YYYY>m<MM>`` and
+        bounded by UTC month starts.
+
+        Retention drops whole partitions, which is O(1) compared to deleting rows
+        and leaves no dead tuples to vacuum.
+
+        Rows of months without a partition land in the default partition
+        ``<table>_default``, they're moved to their partition once it's created.
+
+        :param table_name: str
+            Name of the partitioned table
+        :param session_factory: async_sessionmaker
+            Sessions for the DDL
+        :param months_ahead: int
+            Partitions kept created after the current month
+        :param retention_months: int | None
+            Months kept before the current month, older partitions are dropped.
+            None keeps all
+        """
+        self.table_name = table_name
+        self.session_factory = session_factory
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+
+        self.default_partition_name = f"{table_name}_default"
+        self._name_pattern = re.compile(
+            rf"^{re.escape(table_name)}_y(\d{{4}})m(\d{{2}})$"
+        )
+
+    def partition_name(self, month: date) -> str:
+        return f"{self.table_name}_y{month.year:04d}m{month.month:02d}"
+
+    async def _lock(self, db: AsyncSession) -> None:
+        """Serializes maintenance of the table across processes."""
+        await db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"partitions:{self.table_name}"},
+        )
+
+    async def _default_partition_exists(self, db: AsyncSession) -> bool:
+        result = await db.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"),
+            {"name": self.default_partition_name},
+        )
+        return bool(result.scalar_one())
+
+    async def get_partitions(self, db: AsyncSession) -> dict[date, str]:
+        """Monthly partitions by month, the default partition is left out."""
+        result = await db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits"
+                " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                " WHERE pg_inherits.inhparent = CAST(:table_name AS regclass)"
+            ),
+            {"table_name": self.table_name},
+        )
+        partitions = {}
+        for name in result.scalars():
+            match = self._name_pattern.match(name)
+            if match:
+                partitions[date(int(match[1]), int(match[2]), 1)] = name
+        return partitions
+
+    async def _create_partition(
+        self, db: AsyncSession, name: str, lower: datetime, upper: datetime
+    ) -> None:
+        lower_bound, upper_bound = lower.isoformat(), upper.isoformat()
+        bounds = f"FOR VALUES FROM ('{lower_bound}') TO ('{upper_bound}')"
+        in_range = f"created_at >= '{lower_bound}' AND created_at < '{upper_bound}'"
+        has_default_rows = False
+        if await self._default_partition_exists(db):
+            has_default_rows = (
+                await db.execute(
+                    text(
+                        f'SELECT EXISTS (SELECT 1 FROM "{self.default_partition_name}"'
+                        f" WHERE {in_range})"
+                    )
+                )
+            ).scalar_one()
+        if not has_default_rows:
+            await db.execute(
+                text(f'CREATE TABLE "{name}" PARTITION OF "{self.table_name}" {bounds}')
+            )
+            return
+
+        # Postgres refuses a partition whose range has rows in the default
+        # partition, e.g. when the job runs after the month began, so they're moved
+        # to the new table before it's attached
+        await db.execute(
+            text(f'CREATE TABLE "{name}" (LIKE "{self.table_name}" INCLUDING DEFAULTS)')
+        )
+        result = await db.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{self.default_partition_name}"'
+                f" WHERE {in_range} RETURNING *)"
+                f' INSERT INTO "{name}" SELECT * FROM moved'
+            )
+        )
+        await db.execute(
+            text(f'ALTER TABLE "{self.table_name}" ATTACH PARTITION "{name}" {bounds}')
+        )
+        moved = result.rowcount  # type: ignore[attr-defined]
+        logger.warning(
+            f"Moved {moved} rows of {self.default_partition_name} to the new"
+            f" partition {name}"
+        )
+
+    async def create_partitions(self, today: date | None = None) -> list[str]:
+        """Creates the missing partitions from the current month on, returns their names."""
+        current_month = (today or datetime.now(timezone.utc).date()).replace(day=1)
+
+        created = []
+        async with self.session_factory() as db:
+            async with db.begin():
+                await self._lock(db)
+                existing = await self.get_partitions(db)
+
+                for months in range(self.months_ahead + 1):
+                    month = add_months(current_month, months)
+                    if month in existing:
+                        continue
+                    lower = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+                    next_month = add_months(month, 1)
+                    upper = datetime(
+                        next_month.year, next_month.month, 1, tzinfo=timezone.utc
+                    )
+                    name = self.partition_name(month)
+                    await self._create_partition(db, name, lower, upper)
+                    created.append(name)
+
+        return created
+
+    async def drop_expired_partitions(self, today: date | None = None) -> list[str]:
+        """Drops the partitions older than the retention, returns their names."""
+        if self.retention_months is None:
+            return []
+        current_month = (today or datetime.now(timezone.utc).date()).replace(day=1)
+        oldest_kept = add_months(current_month, -self.retention_months)
+
+        dropped = []
+        async with self.session_factory() as db:
+            async with db.begin():
+                await self._lock(db)
+                existing = await self.get_partitions(db)
+
+                for month, name in sorted(existing.items()):
+                    if month >= oldest_kept:
+                        break
+                    await db.execute(text(f'DROP TABLE "{name}"'))
+                    dropped.append(name)
+
+        return dropped
+
+    async def maintain(self) -> None:
+        created = await self.create_partitions()
+        dropped = await self.drop_expired_partitions()
+        if created or dropped:
+            logger.info(
+                f"Partitions of {self.table_name} created: {created}, dropped: {dropped}"
+            )
+
+
+chat_log_partitions = MonthlyPartitionManager(
+    table_name="chat_logs",
+    session_factory=AsyncSessionLocal,
+    months_ahead=settings.CHAT_LOG_PARTITIONS_AHEAD,
+    retention_months=settings.CHAT_LOG_RETENTION_MONTHS,
+)
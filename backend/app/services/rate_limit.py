@@ -0,0 +1,259 @@
+import math
+import time
+from collections.abc import Mapping
+from fnmatch import fnmatchcase
+from typing import Literal, NamedTuple, Protocol
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.models import Tenant
+from app.logs.logger import logger
+from app.services.cache import LRUCache
+
+Scope = Literal["tenant", "user"]
+
+
+class RateLimit(NamedTuple):
+    # Requests in a burst
+    capacity: float
+    # Sustained requests per second
+    refill_per_second: float
+
+
+# Limits of each scope, by route name pattern, e.g. "get_all_*"
+RouteLimits = Mapping[str, Mapping[Scope, RateLimit]]
+
+_route_limits_adapter = TypeAdapter(dict[str, dict[Scope, RateLimit]])
+
+
+class BucketState(NamedTuple):
+    allowed: bool
+    limit: RateLimit
+    # Tokens left after this request
+    tokens: float
+
+    @property
+    def retry_after_seconds(self) -> int:
+        """Seconds until a request is allowed again, 0 if this one was."""
+        if self.allowed:
+            return 0
+        return math.ceil((1 - self.tokens) / self.limit.refill_per_second)
+
+    @property
+    def reset_seconds(self) -> int:
+        """Seconds until the bucket is full again."""
+        missing = self.limit.capacity - self.tokens
+        return math.ceil(missing / self.limit.refill_per_second)
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(int(self.limit.capacity)),
+            "RateLimit-Remaining": str(max(0, math.floor(self.tokens))),
+            "RateLimit-Reset": str(self.reset_seconds),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after_seconds)
+        return headers
+
+
+class BucketStore(Protocol):
+    async def take(self, key: str, limit: RateLimit) -> BucketState:
+        """Takes a token from the bucket ``key``, if it has one."""
+        ...
+
+
+class LocalBucketStore:
+    def __init__(self, *, maxsize: int):
+        """
+        Buckets in this process, so each worker allows the limit on its own.
+
+        :param maxsize: int
+            Buckets kept, the least recently used bucket is dropped, which refills
+            it. Make it larger than the tenants and users active at once
+        """
+        self._buckets: LRUCache[str, tuple[float, float]] = LRUCache(maxsize)
+
+    async def take(self, key: str, limit: RateLimit) -> BucketState:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key) or (limit.capacity, now)
+        tokens = min(
+            limit.capacity, tokens + (now - updated_at) * limit.refill_per_second
+        )
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets.set(key, (tokens, now))
+        return BucketState(allowed=allowed, limit=limit, tokens=tokens)
+
+
+class PostgresBucketStore:
+    def __init__(self, *, session_factory: async_sessionmaker[AsyncSession]):
+        """
+        Buckets in the ``rate_limit_buckets`` table, shared by all workers. Each take
+        is one atomic upsert, one more round trip per request.
+
+        :param session_factory: async_sessionmaker
+        """
+        self.session_factory = session_factory
+
+    async def take(self, key: str, limit: RateLimit) -> BucketState:
+        refilled = (
+            "LEAST(:capacity, rate_limit_buckets.tokens + :refill_per_second"
+            " * EXTRACT(EPOCH FROM clock_timestamp() - rate_limit_buckets.updated_at))"
+        )
+        # Returns no row when the bucket is empty, the WHERE is evaluated on the
+        # latest row version, so concurrent takes don't overdraw it
+        take_stmt = text(
+            "INSERT INTO rate_limit_buckets (key, tokens, updated_at)"
+            " VALUES (:key, :capacity - 1, clock_timestamp())"
+            " ON CONFLICT (key) DO UPDATE"
+            f" SET tokens = {refilled} - 1, updated_at = clock_timestamp()"
+            f" WHERE {refilled} >= 1"
+            " RETURNING tokens"
+        )
+        params = {
+            "key": key,
+            "capacity": limit.capacity,
+            "refill_per_second": limit.refill_per_second,
+        }
+        async with self.session_factory() as db, db.begin():
+            tokens = (await db.execute(take_stmt, params)).scalar_one_or_none()
+            if tokens is not None:
+                return BucketState(allowed=True, limit=limit, tokens=tokens)
+
+            bucket_stmt = text(
+                f"SELECT {refilled} FROM rate_limit_buckets WHERE key = :key"
+            )
+            tokens = (await db.execute(bucket_stmt, params)).scalar_one()
+        return BucketState(allowed=False, limit=limit, tokens=tokens)
+
+
+def _match(
+    route_limits: RouteLimits, route_name: str
+) -> tuple[str, Mapping[Scope, RateLimit]] | None:
+    for pattern, limits in route_limits.items():
+        if fnmatchcase(route_name, pattern):
+            return pattern, limits
+    return None
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        *,
+        store: BucketStore,
+        route_limits: RouteLimits,
+        tenant_settings_ttl_seconds: float,
+        tenant_settings_cache_size: int,
+    ):
+        """
+        Token bucket rate limits per route, for the tenant and for the user of the
+        token, so one tenant's batch job can't starve the others.
+
+        Tenants override the limits with ``Tenant.settings["rate_limits"]``, in the
+        format of ``route_limits``. Their patterns are matched before the default
+        ones, and a matching pattern without a scope leaves that scope unlimited.
+
+        :param store: BucketStore
+            Where the buckets are kept, ``LocalBucketStore`` per worker or
+            ``PostgresBucketStore`` for limits across workers
+        :param route_limits: RouteLimits
+            Limits of the scopes "tenant" and "user", by route name pattern, the
+            first pattern matching the route applies, e.g.
+            ``{"get_all_*": {"user": RateLimit(20, 2)}, "*": {...}}``
+        :param tenant_settings_ttl_seconds: float
+            Tenant overrides are read from the database at most this often
+        :param tenant_settings_cache_size: int
+            Tenants whose overrides are cached
+        """
+        self.store = store
+        self.route_limits = route_limits
+        self.tenant_settings_ttl_seconds = tenant_settings_ttl_seconds
+
+        self._tenant_limits: LRUCache[str, tuple[float, RouteLimits]] = LRUCache(
+            tenant_settings_cache_size
+        )
+
+    async def tenant_limits(
+        self, db: AsyncSession, entra_tenant_id: str
+    ) -> RouteLimits:
+        """The overrides in the settings of the tenant ``entra_tenant_id``."""
+        cached = self._tenant_limits.get(entra_tenant_id)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+        stmt = select(Tenant.settings).where(Tenant.entra_tenant_id == entra_tenant_id)
+        async with db.begin():
+            tenant_settings = (await db.execute(stmt)).scalar_one_or_none() or {}
+        try:
+            limits = _route_limits_adapter.validate_python(
+                tenant_settings.get("rate_limits", {})
+            )
+        except ValidationError as e:
+            logger.warning(
+                f"Ignoring invalid rate limits of tenant {entra_tenant_id}: {e}"
+            )
+            limits = {}
+
+        self._tenant_limits.set(
+            entra_tenant_id,
+            (time.monotonic() + self.tenant_settings_ttl_seconds, limits),
+        )
+        return limits
+
+    async def take(
+        self,
+        db: AsyncSession,
+        *,
+        route_name: str,
+        entra_tenant_id: str | None,
+        user_id: str,
+    ) -> BucketState | None:
+        """
+        Takes a token of the route's buckets of the user, then of the tenant.
+
+        Returns the state of the first bucket that was empty, otherwise the one with
+        the fewest tokens left, or None if no limit applies.
+        """
+        overrides: RouteLimits = {}
+        if entra_tenant_id is not None:
+            overrides = await self.tenant_limits(db, entra_tenant_id)
+        match = _match(overrides, route_name) or _match(self.route_limits, route_name)
+        if match is None:
+            return None
+        pattern, limits = match
+
+        # The user first, a user at its own limit doesn't use up the tenant's
+        keys: list[tuple[Scope, str]] = [("user", user_id)]
+        if entra_tenant_id is not None:
+            keys.append(("tenant", entra_tenant_id))
+
+        states = []
+        for scope, scope_id in keys:
+            if scope not in limits:
+                continue
+            state = await self.store.take(
+                f"{scope}:{scope_id}:{pattern}", limits[scope]
+            )
+            if not state.allowed:
+                return state
+            states.append(state)
+        return min(states, key=lambda state: state.tokens, default=None)
+
+
+def _store() -> BucketStore:
+    if settings.RATE_LIMIT_STORE == "postgres":
+        return PostgresBucketStore(session_factory=AsyncSessionLocal)
+    return LocalBucketStore(maxsize=settings.RATE_LIMIT_LOCAL_BUCKETS)
+
+
+rate_limiter = RateLimiter(
+    store=_store(),
+    route_limits=_route_limits_adapter.validate_python(settings.RATE_LIMITS),
+    tenant_settings_ttl_seconds=settings.RATE_LIMIT_TENANT_SETTINGS_TTL_SECONDS,
+    tenant_settings_cache_size=settings.RATE_LIMIT_TENANT_SETTINGS_CACHE_SIZE,
+)
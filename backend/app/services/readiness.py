@@ -0,0 +1,159 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.db import engine, get_qdrant_client
+from app.core.schemas import DependencyCheck, Readiness
+from app.logs.logger import logger
+from app.services.loop_lag import LoopLagMonitor, loop_lag_monitor
+from app.services.warmup import WarmUp, warm_up
+
+if TYPE_CHECKING:
+    from qdrant_client import AsyncQdrantClient
+
+
+def _ms_since(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def _failure(name: str, e: BaseException) -> DependencyCheck:
+    if isinstance(e, asyncio.TimeoutError):
+        logger.warning(f"Readiness check of {name} timed out")
+        return DependencyCheck(ok=False, detail="Timed out")
+    # The probe is public, the error only goes to the logs
+    logger.error(f"Readiness check of {name} failed: {e!r}")
+    return DependencyCheck(ok=False, detail="Unavailable")
+
+
+class ReadinessProbe:
+    def __init__(
+        self,
+        *,
+        engine: AsyncEngine,
+        qdrant_client: Callable[[], "AsyncQdrantClient"],
+        warm_up: WarmUp,
+        loop_lag_monitor: LoopLagMonitor,
+        cache_ttl_seconds: float,
+        max_pool_wait_ms: float,
+        max_loop_lag_ms: float,
+        timeout_seconds: float,
+    ):
+        """
+        Checks whether this process should get traffic: the warm-up is done, a pool
+        connection is checked out quickly, Qdrant answers and the event loop isn't
+        lagging. Long pool waits and loop lag come before request timeouts, so
+        reporting them lets the load balancer shed traffic in time.
+
+        :param engine: AsyncEngine
+            Engine whose pool is checked
+        :param qdrant_client: Callable[[], AsyncQdrantClient]
+            Returns the client to check, e.g. ``get_qdrant_client``
+        :param warm_up: WarmUp
+            Not ready before it's finished
+        :param loop_lag_monitor: LoopLagMonitor
+            Its recent samples are compared to ``max_loop_lag_ms``
+        :param cache_ttl_seconds: float
+            Probes within this share one round of checks
+        :param max_pool_wait_ms: float
+            Not ready when checking out a pool connection takes longer
+        :param max_loop_lag_ms: float
+            Not ready when the event loop ran callbacks this late in the monitor's
+            window
+        :param timeout_seconds: float
+            A dependency not answering within this is reported down
+        """
+        self.engine = engine
+        self.qdrant_client = qdrant_client
+        self.warm_up = warm_up
+        self.loop_lag_monitor = loop_lag_monitor
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.max_pool_wait_ms = max_pool_wait_ms
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.timeout_seconds = timeout_seconds
+
+        self._lock = asyncio.Lock()
+        self._checked_at = 0.0
+        self._readiness: Readiness | None = None
+
+    async def _check_postgres(self) -> DependencyCheck:
+        start = time.perf_counter()
+        async with self.engine.connect() as conn:
+            pool_wait_ms = _ms_since(start)
+            await conn.execute(text("SELECT 1"))
+        ok = pool_wait_ms <= self.max_pool_wait_ms
+        if not ok:
+            logger.warning(
+                f"Pool checkout took {pool_wait_ms} ms, {self.engine.pool.status()}"
+            )
+        return DependencyCheck(ok=ok, latency_ms=pool_wait_ms)
+
+    async def _check_qdrant(self) -> DependencyCheck:
+        start = time.perf_counter()
+        await self.qdrant_client().get_collections()
+        return DependencyCheck(ok=True, latency_ms=_ms_since(start))
+
+    async def _check_loop_lag(self) -> DependencyCheck:
+        # The loop answers this probe after any block is over, the monitor's
+        # samples show whether it blocked lately
+        lag_ms = self.loop_lag_monitor.recent_max_ms()
+        if lag_ms is None:
+            return DependencyCheck(ok=True, detail="No recent samples")
+        return DependencyCheck(
+            ok=lag_ms <= self.max_loop_lag_ms, latency_ms=round(lag_ms, 2)
+        )
+
+    async def _timed(
+        self, name: str, check: Callable[[], Awaitable[DependencyCheck]]
+    ) -> DependencyCheck:
+        try:
+            return await asyncio.wait_for(check(), self.timeout_seconds)
+        except Exception as e:
+            return _failure(name, e)
+
+    async def _check(self) -> Readiness:
+        postgres, qdrant, loop_lag = await asyncio.gather(
+            self._timed("postgres", self._check_postgres),
+            self._timed("qdrant", self._check_qdrant),
+            self._timed("loop_lag", self._check_loop_lag),
+        )
+        checks = {
+            "warm_up": DependencyCheck(ok=self.warm_up.finished),
+            "postgres": postgres,
+            "qdrant": qdrant,
+            "loop_lag": loop_lag,
+        }
+        return Readiness(
+            ready=all(check.ok for check in checks.values()), checks=checks
+        )
+
+    async def check(self) -> Readiness:
+        """
+        The readiness of this process, checked at most once per
+        ``cache_ttl_seconds``. Concurrent probes wait for the same round of checks.
+        """
+        async with self._lock:
+            readiness = self._readiness
+            if (
+                readiness is None
+                or time.monotonic() - self._checked_at >= self.cache_ttl_seconds
+            ):
+                readiness = self._readiness = await self._check()
+                self._checked_at = time.monotonic()
+            return readiness
+
+
+readiness_probe = ReadinessProbe(
+    engine=engine,
+    qdrant_client=get_qdrant_client,
+    warm_up=warm_up,
+    loop_lag_monitor=loop_lag_monitor,
+    cache_ttl_seconds=settings.READINESS_CACHE_TTL_SECONDS,
+    max_pool_wait_ms=settings.READINESS_MAX_POOL_WAIT_MS,
+    max_loop_lag_ms=settings.READINESS_MAX_LOOP_LAG_MS,
+    timeout_seconds=settings.READINESS_TIMEOUT_SECONDS,
+)
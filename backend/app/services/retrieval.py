@@ -0,0 +1,155 @@
+import asyncio
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.models import Article
+from app.core.schemas import ArticlePublic, ArticleSearchParams, ArticleSearchResult
+from app.services.embeddings import embedder
+from app.services.vector_store import VectorCollection
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[UUID]], *, k: int
+) -> list[tuple[UUID, float]]:
+    """
+    Fuse ranked id lists with reciprocal rank fusion.
+
+    Every id scores ``sum(1 / (k + rank))`` over the rankings it appears in
+    (rank starting at 1). Only ranks are used, so retrievers with incomparable
+    scores (``ts_rank_cd`` and cosine similarity) can be combined.
+
+    Returns ``(id, score)`` pairs sorted by descending score.
+    """
+    scores: dict[UUID, float] = {}
+    for ranking in rankings:
+        for rank, obj_id in enumerate(ranking, start=1):
+            scores[obj_id] = scores.get(obj_id, 0.0) + 1.0 / (k + rank)
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class ArticleRetriever:
+    def __init__(
+        self,
+        *,
+        collection: VectorCollection,
+        rrf_k: int,
+        candidates_per_retriever: int,
+    ):
+        """
+        Hybrid article retriever.
+
+        Combines Postgres full text search on ``Article.search_vector`` (GIN index)
+        with dense vector search in Qdrant, fused by reciprocal rank fusion.
+
+        :param collection: VectorCollection
+            Vector collection with one point per article
+        :param rrf_k: int
+            Constant ``k`` for reciprocal rank fusion
+        :param candidates_per_retriever: int
+            Number of candidates each retriever contributes before fusing
+        """
+        self.collection = collection
+        self.rrf_k = rrf_k
+        self.candidates_per_retriever = candidates_per_retriever
+
+    async def index(self, articles: Sequence[Article]) -> None:
+        """Upserts one vector per article, payload holds the filterable fields."""
+        await self.collection.upsert(
+            [
+                (
+                    article.id,
+                    f"{article.title}\n{article.body}",
+                    {"tenant_id": str(article.tenant_id), "language": article.language},
+                )
+                for article in articles
+            ]
+        )
+
+    async def remove(self, article_ids: Sequence[UUID]) -> None:
+        await self.collection.delete(article_ids)
+
+    async def text_search(
+        self, db: AsyncSession, *, params: ArticleSearchParams
+    ) -> list[UUID]:
+        """Ranks articles by ``ts_rank_cd`` over the GIN indexed ``search_vector``."""
+        # Same text search config as the generated ``search_vector`` column
+        query = func.websearch_to_tsquery(
+            literal_column("'simple'::regconfig"), params.q
+        )
+        rank = func.ts_rank_cd(Article.search_vector, query)
+
+        stmt = (
+            select(Article.id)
+            .where(
+                Article.tenant_id == params.tenant_id,
+                Article.search_vector.op("@@")(query),
+            )
+            .order_by(rank.desc())
+            .limit(self.candidates_per_retriever)
+        )
+        if params.language is not None:
+            stmt = stmt.where(Article.language == params.language)
+
+        if not db.in_transaction():
+            async with db.begin():
+                result = await db.execute(stmt)
+        else:
+            result = await db.execute(stmt)
+
+        return list(result.scalars().all())
+
+    async def vector_search(self, *, params: ArticleSearchParams) -> list[UUID]:
+        """Ranks articles by cosine similarity of their vector to the query vector."""
+        match = {"tenant_id": str(params.tenant_id)}
+        if params.language is not None:
+            match["language"] = params.language
+
+        return await self.collection.query(
+            params.q, match=match, limit=self.candidates_per_retriever
+        )
+
+    async def search(
+        self, db: AsyncSession, *, params: ArticleSearchParams
+    ) -> list[ArticleSearchResult]:
+        """Hybrid search, both retrievers run concurrently."""
+        text_ranking, vector_ranking = await asyncio.gather(
+            self.text_search(db, params=params),
+            self.vector_search(params=params),
+        )
+        fused = reciprocal_rank_fusion([text_ranking, vector_ranking], k=self.rrf_k)
+        fused = fused[: params.limit]
+        if not fused:
+            return []
+
+        stmt = select(Article).where(Article.id.in_([obj_id for obj_id, _ in fused]))
+        if not db.in_transaction():
+            async with db.begin():
+                result = await db.execute(stmt)
+        else:
+            result = await db.execute(stmt)
+        articles = {article.id: article for article in result.scalars().all()}
+
+        # Articles deleted since they were indexed in Qdrant are skipped
+        return [
+            ArticleSearchResult(
+                article=ArticlePublic.model_validate(articles[obj_id]), score=score
+            )
+            for obj_id, score in fused
+            if obj_id in articles
+        ]
+
+
+article_retriever = ArticleRetriever(
+    collection=VectorCollection(
+        embedder=embedder,
+        name=settings.ARTICLES_COLLECTION_NAME,
+        payload_indexes=("tenant_id", "language"),
+    ),
+    rrf_k=settings.SEARCH_RRF_K,
+    candidates_per_retriever=settings.SEARCH_CANDIDATES_PER_RETRIEVER,
+)
@@ -0,0 +1,286 @@
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import NamedTuple, Protocol
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.models import SummaryCache
+from app.services.cache import LRUCache
+
+_PARAGRAPH_PATTERN = re.compile(r"\n\s*\n")
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def _split_long(unit: str, *, chunk_size: int) -> list[str]:
+    """Splits a paragraph longer than ``chunk_size`` on sentences, then hard."""
+    if len(unit) <= chunk_size:
+        return [unit]
+
+    parts: list[str] = []
+    for sentence in _SENTENCE_PATTERN.split(unit):
+        parts.extend(
+            sentence[start : start + chunk_size]
+            for start in range(0, len(sentence), chunk_size)
+        )
+    return parts
+
+
+def _is_boundary(unit: str) -> bool:
+    return hashlib.sha256(unit.encode()).digest()[0] % 4 == 0
+
+
+def chunk_text(text: str, *, chunk_size: int) -> list[str]:
+    """
+    Splits ``text`` into chunks of at most ``chunk_size`` characters on paragraphs.
+
+    Boundaries are content defined: a chunk at least half full also ends after
+    any paragraph whose hash is a boundary hash. An edit therefore only moves
+    boundaries until the next boundary paragraph, and the chunks after it keep
+    their content hash, and their cached summary.
+    """
+    units: list[str] = []
+    for paragraph in _PARAGRAPH_PATTERN.split(text):
+        paragraph = paragraph.strip()
+        if paragraph:
+            units.extend(_split_long(paragraph, chunk_size=chunk_size))
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_size = 0
+    for unit in units:
+        if current and current_size + len(unit) > chunk_size:
+            chunks.append("\n\n".join(current))
+            current, current_size = [], 0
+        current.append(unit)
+        current_size += len(unit) + 2
+        if current_size >= chunk_size // 2 and _is_boundary(unit):
+            chunks.append("\n\n".join(current))
+            current, current_size = [], 0
+    if current:
+        chunks.append("\n\n".join(current))
+
+    return chunks
+
+
+class SummaryKey(NamedTuple):
+    content_hash: str
+    provider: str
+    max_words: int
+
+
+class SummarizationProvider(Protocol):
+    """Summarizes one text in at most ``max_words`` words."""
+
+    name: str
+
+    async def summarize(self, text: str, *, max_words: int) -> str: ...
+
+
+class LocalSummarizationProvider:
+    """
+    Stand-in provider returning the leading words of the text.
+
+    Used for local development and tests.
+    """
+
+    name = "local"
+
+    async def summarize(self, text: str, *, max_words: int) -> str:
+        return " ".join(text.split()[:max_words])
+
+
+@dataclass
+class SummaryResult:
+    summary: str
+    chunks: int
+    cached_chunks: int
+
+
+class Summarizer:
+    def __init__(
+        self,
+        *,
+        provider: SummarizationProvider,
+        session_factory: async_sessionmaker[AsyncSession] | None,
+        chunk_size: int,
+        fan_out: int,
+        max_words: int,
+        lru_size: int,
+    ):
+        """
+        Map-reduce summarization of long texts.
+
+        Map: the text is chunked and chunks are summarized concurrently, at most
+        ``fan_out`` provider calls at a time per worker.
+        Reduce: chunk summaries are packed into chunks again and summarized, until
+        a single summary is left.
+
+        Every provider call is cached on the content hash of its input, in an
+        in-process LRU and in Postgres (``summary_cache``).
+
+        :param provider: SummarizationProvider
+            Provider doing the actual summarization
+        :param session_factory: async_sessionmaker | None
+            Sessions for the Postgres cache, ``None`` disables it
+        :param chunk_size: int
+            Max characters per provider call
+        :param fan_out: int
+            Max concurrent provider calls
+        :param max_words: int
+            Default max words of a summary
+        :param lru_size: int
+            Number of summaries kept in memory
+        """
+        self.provider = provider
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.max_words = max_words
+
+        self.lru: LRUCache[SummaryKey, str] = LRUCache(lru_size)
+        self._semaphore = asyncio.Semaphore(fan_out)
+
+    def _key(self, text: str, *, max_words: int) -> SummaryKey:
+        content_hash = hashlib.sha256(text.encode()).hexdigest()
+        return SummaryKey(content_hash, self.provider.name, max_words)
+
+    async def _load_cached(self, keys: list[SummaryKey]) -> dict[SummaryKey, str]:
+        if self.session_factory is None or not keys:
+            return {}
+
+        stmt = select(
+            SummaryCache.content_hash,
+            SummaryCache.provider,
+            SummaryCache.max_words,
+            SummaryCache.summary,
+        ).where(
+            tuple_(
+                SummaryCache.content_hash,
+                SummaryCache.provider,
+                SummaryCache.max_words,
+            ).in_([tuple(key) for key in keys])
+        )
+        async with self.session_factory() as db:
+            async with db.begin():
+                rows = (await db.execute(stmt)).all()
+
+        return {
+            SummaryKey(content_hash, provider, max_words): summary
+            for content_hash, provider, max_words, summary in rows
+        }
+
+    async def _store(self, summaries: dict[SummaryKey, str]) -> None:
+        if self.session_factory is None or not summaries:
+            return
+
+        stmt = (
+            insert(SummaryCache)
+            .values(
+                [
+                    {
+                        "content_hash": key.content_hash,
+                        "provider": key.provider,
+                        "max_words": key.max_words,
+                        "summary": summary,
+                    }
+                    for key, summary in summaries.items()
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_summary_cache_key")
+        )
+        async with self.session_factory() as db:
+            async with db.begin():
+                await db.execute(stmt)
+
+    async def _summarize_one(self, text: str, *, max_words: int) -> str:
+        async with self._semaphore:
+            return await self.provider.summarize(text, max_words=max_words)
+
+    async def _summarize_many(
+        self, texts: list[str], *, max_words: int
+    ) -> tuple[list[str], int]:
+        """Summarizes texts concurrently, returns the summaries and the cache hits."""
+        keys = [self._key(text, max_words=max_words) for text in texts]
+
+        found: dict[SummaryKey, str] = {}
+        for key in keys:
+            cached = self.lru.get(key)
+            if cached is not None:
+                found[key] = cached
+        found.update(await self._load_cached([k for k in keys if k not in found]))
+        cached_count = sum(1 for key in keys if key in found)
+
+        misses = {
+            key: text for key, text in zip(keys, texts, strict=True) if key not in found
+        }
+        new_summaries = await asyncio.gather(
+            *(
+                self._summarize_one(text, max_words=max_words)
+                for text in misses.values()
+            )
+        )
+        created = dict(zip(misses, new_summaries, strict=True))
+        await self._store(created)
+
+        found.update(created)
+        for key, summary in found.items():
+            self.lru.set(key, summary)
+
+        return [found[key] for key in keys], cached_count
+
+    def _pack(self, summaries: list[str]) -> list[str]:
+        """Packs summaries into reduce inputs of at most ``chunk_size`` characters."""
+        groups: list[list[str]] = [[]]
+        group_size = 0
+        for summary in summaries:
+            if groups[-1] and group_size + len(summary) > self.chunk_size:
+                groups.append([])
+                group_size = 0
+            groups[-1].append(summary)
+            group_size += len(summary) + 2
+
+        # Summaries longer than a chunk would never reduce, so pair them up
+        if len(groups) >= len(summaries):
+            groups = [summaries[i : i + 2] for i in range(0, len(summaries), 2)]
+
+        return ["\n\n".join(group) for group in groups]
+
+    async def summarize(
+        self, text: str, *, max_words: int | None = None
+    ) -> SummaryResult:
+        max_words = max_words or self.max_words
+
+        chunks = chunk_text(text, chunk_size=self.chunk_size) or [text]
+        summaries, cached_chunks = await self._summarize_many(
+            chunks, max_words=max_words
+        )
+
+        while len(summaries) > 1:
+            summaries, _ = await self._summarize_many(
+                self._pack(summaries), max_words=max_words
+            )
+
+        return SummaryResult(
+            summary=summaries[0], chunks=len(chunks), cached_chunks=cached_chunks
+        )
+
+
+def get_summarization_provider() -> SummarizationProvider:
+    if settings.SUMMARY_PROVIDER == "local":
+        return LocalSummarizationProvider()
+    raise ValueError(f"Unknown summarization provider: {settings.SUMMARY_PROVIDER}")
+
+
+summarizer = Summarizer(
+    provider=get_summarization_provider(),
+    session_factory=AsyncSessionLocal,
+    chunk_size=settings.SUMMARY_CHUNK_SIZE,
+    fan_out=settings.SUMMARY_FAN_OUT,
+    max_words=settings.SUMMARY_MAX_WORDS,
+    lru_size=settings.SUMMARY_LRU_SIZE,
+)
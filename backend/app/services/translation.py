@@ -0,0 +1,301 @@
+import asyncio
+import hashlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import NamedTuple, Protocol
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.models import TranslationCache
+from app.logs.logger import logger
+from app.services.cache import LRUCache
+
+
+class TranslationKey(NamedTuple):
+    source_hash: str
+    source_language: str
+    target_language: str
+
+
+def translation_key(
+    text: str, *, source_language: str, target_language: str
+) -> TranslationKey:
+    source_hash = hashlib.sha256(text.encode()).hexdigest()
+    return TranslationKey(source_hash, source_language, target_language)
+
+
+class TranslationProvider(Protocol):
+    """Translates a batch of segments, returning translations in the same order."""
+
+    async def translate(
+        self, segments: list[str], *, source_language: str, target_language: str
+    ) -> list[str]: ...
+
+
+class LocalTranslationProvider:
+    """
+    Stand-in provider which only tags each segment with the target language.
+
+    Used for local development and tests.
+    """
+
+    async def translate(
+        self,
+        segments: list[str],
+        *,
+        source_language: str,  # noqa: ARG002
+        target_language: str,
+    ) -> list[str]:
+        return [f"[{target_language}] {segment}" for segment in segments]
+
+
+@dataclass
+class _PendingSegment:
+    key: TranslationKey
+    text: str
+
+
+class TranslationBatcher:
+    def __init__(
+        self,
+        *,
+        provider: TranslationProvider,
+        session_factory: async_sessionmaker[AsyncSession] | None,
+        max_batch_size: int,
+        max_batch_chars: int,
+        max_wait_ms: float,
+        lru_size: int,
+    ):
+        """
+        Micro-batches concurrent translation requests into few provider calls.
+
+        A segment is looked up in an in-process LRU, then joins an identical segment
+        already in flight, and otherwise waits up to ``max_wait_ms`` for other segments
+        to be flushed together. A flush reads the Postgres cache (``translation_cache``)
+        once, groups the misses per language pair into provider calls and writes
+        the new translations back.
+
+        :param provider: TranslationProvider
+            Provider doing the actual translation
+        :param session_factory: async_sessionmaker | None
+            Sessions for the Postgres cache, ``None`` disables it
+        :param max_batch_size: int
+            Max segments per provider call, a full batch is flushed without waiting
+        :param max_batch_chars: int
+            Max characters per provider call
+        :param max_wait_ms: float
+            Max time a segment waits for a batch to fill up
+        :param lru_size: int
+            Number of translations kept in memory
+        """
+        self.provider = provider
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_wait_ms = max_wait_ms
+
+        self.lru: LRUCache[TranslationKey, str] = LRUCache(lru_size)
+        self._in_flight: dict[TranslationKey, asyncio.Future[str]] = {}
+        self._pending: list[_PendingSegment] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+
+    async def translate(
+        self, segments: list[str], *, source_language: str, target_language: str
+    ) -> list[str]:
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future[str]] = []
+        for segment in segments:
+            key = translation_key(
+                segment,
+                source_language=source_language,
+                target_language=target_language,
+            )
+            cached = self.lru.get(key)
+            if cached is not None:
+                future = loop.create_future()
+                future.set_result(cached)
+            elif key in self._in_flight:
+                future = self._in_flight[key]
+            else:
+                future = loop.create_future()
+                self._in_flight[key] = future
+                self._pending.append(_PendingSegment(key=key, text=segment))
+            futures.append(future)
+
+        self._schedule_flush(loop)
+
+        # Shielded, since futures can be shared with other requests
+        return list(await asyncio.gather(*(asyncio.shield(f) for f in futures)))
+
+    async def aclose(self) -> None:
+        """Flushes pending segments and waits for all flushes to finish."""
+        self._start_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        if len(self._pending) >= self.max_batch_size:
+            self._start_flush()
+        elif self._pending and self._flush_timer is None:
+            self._flush_timer = loop.call_later(
+                self.max_wait_ms / 1000, self._start_flush
+            )
+
+    def _start_flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def _resolve(self, key: TranslationKey, translation: str) -> None:
+        self.lru.set(key, translation)
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(translation)
+
+    def _fail(self, key: TranslationKey, exception: BaseException) -> None:
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_exception(exception)
+
+    def _chunks(
+        self, segments: list[_PendingSegment]
+    ) -> Iterator[list[_PendingSegment]]:
+        """Groups segments per language pair, bounded by batch size and characters."""
+        by_language_pair: dict[tuple[str, str], list[_PendingSegment]] = {}
+        for segment in segments:
+            language_pair = (segment.key.source_language, segment.key.target_language)
+            by_language_pair.setdefault(language_pair, []).append(segment)
+
+        for language_pair_segments in by_language_pair.values():
+            chunk: list[_PendingSegment] = []
+            chunk_chars = 0
+            for segment in language_pair_segments:
+                if chunk and (
+                    len(chunk) >= self.max_batch_size
+                    or chunk_chars + len(segment.text) > self.max_batch_chars
+                ):
+                    yield chunk
+                    chunk, chunk_chars = [], 0
+                chunk.append(segment)
+                chunk_chars += len(segment.text)
+            if chunk:
+                yield chunk
+
+    async def _load_cached(self, batch: list[_PendingSegment]) -> list[_PendingSegment]:
+        """Resolves segments found in the Postgres cache, returns the misses."""
+        if self.session_factory is None:
+            return batch
+
+        stmt = select(
+            TranslationCache.source_hash,
+            TranslationCache.source_language,
+            TranslationCache.target_language,
+            TranslationCache.translated_text,
+        ).where(
+            tuple_(
+                TranslationCache.source_hash,
+                TranslationCache.source_language,
+                TranslationCache.target_language,
+            ).in_([tuple(segment.key) for segment in batch])
+        )
+        async with self.session_factory() as db:
+            async with db.begin():
+                rows = (await db.execute(stmt)).all()
+
+        for source_hash, source_language, target_language, translated_text in rows:
+            key = TranslationKey(source_hash, source_language, target_language)
+            self._resolve(key, translated_text)
+
+        return [segment for segment in batch if segment.key in self._in_flight]
+
+    async def _translate_chunk(
+        self, chunk: list[_PendingSegment]
+    ) -> list[tuple[TranslationKey, str]]:
+        first_key = chunk[0].key
+        try:
+            translations = await self.provider.translate(
+                [segment.text for segment in chunk],
+                source_language=first_key.source_language,
+                target_language=first_key.target_language,
+            )
+        except Exception as e:
+            logger.error(f"Translation provider failed for {len(chunk)} segments: {e}")
+            for segment in chunk:
+                self._fail(segment.key, e)
+            return []
+
+        translated = list(
+            zip([segment.key for segment in chunk], translations, strict=True)
+        )
+        for key, translation in translated:
+            self._resolve(key, translation)
+        return translated
+
+    async def _store(self, translated: list[tuple[TranslationKey, str]]) -> None:
+        if self.session_factory is None or not translated:
+            return
+
+        stmt = (
+            insert(TranslationCache)
+            .values(
+                [
+                    {
+                        "source_hash": key.source_hash,
+                        "source_language": key.source_language,
+                        "target_language": key.target_language,
+                        "translated_text": translation,
+                    }
+                    for key, translation in translated
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_translation_cache_key")
+        )
+        async with self.session_factory() as db:
+            async with db.begin():
+                await db.execute(stmt)
+
+    async def _flush(self, batch: list[_PendingSegment]) -> None:
+        try:
+            misses = await self._load_cached(batch)
+            chunk_results = await asyncio.gather(
+                *(self._translate_chunk(chunk) for chunk in self._chunks(misses))
+            )
+        except Exception as e:
+            logger.error(f"Translation flush failed for {len(batch)} segments: {e}")
+            for segment in batch:
+                self._fail(segment.key, e)
+            return
+
+        try:
+            await self._store([item for result in chunk_results for item in result])
+        except Exception as e:
+            # Requests already got their translations, only the cache write is lost
+            logger.error(f"Could not store translations in the cache: {e}")
+
+
+def get_translation_provider() -> TranslationProvider:
+    if settings.TRANSLATION_PROVIDER == "local":
+        return LocalTranslationProvider()
+    raise ValueError(f"Unknown translation provider: {settings.TRANSLATION_PROVIDER}")
+
+
+translation_batcher = TranslationBatcher(
+    provider=get_translation_provider(),
+    session_factory=AsyncSessionLocal,
+    max_batch_size=settings.TRANSLATION_MAX_BATCH_SIZE,
+    max_batch_chars=settings.TRANSLATION_MAX_BATCH_CHARS,
+    max_wait_ms=settings.TRANSLATION_MAX_WAIT_MS,
+    lru_size=settings.TRANSLATION_LRU_SIZE,
+)
@@ -0,0 +1,181 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Protocol
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.compression import GzipCompressor
+from app.core.models import ChatLog, ChatSession, User
+from app.core.schemas import ChatLogPublic, ChatSessionPublic, FilterParams, UserPublic
+from app.crud import CRUD_chat_logs, CRUD_chat_sessions, CRUD_users
+from app.services.jobs import enqueue_job, get_progress, report_progress
+
+ERASE_USER = "erase_user"
+
+
+class PointStore(Protocol):
+    async def delete_where(self, **match: str) -> None: ...
+
+
+async def enqueue_erase_user(db: AsyncSession, *, user: User) -> UUID:
+    """Enqueues an ``erase_user`` job for ``user``, returns its id."""
+    return await enqueue_job(
+        db, kind=ERASE_USER, payload={"user_id": str(user.id)}, tenant_id=user.tenant_id
+    )
+
+
+class UserDataManager:
+    def __init__(
+        self,
+        *,
+        session_factory: async_sessionmaker[AsyncSession],
+        chat_log_points: PointStore,
+        export_batch_size: int,
+        export_gzip_level: int,
+        erase_chunk_size: int,
+        erase_pause_seconds: float,
+    ):
+        """
+        Exports and erases all data of a user: the user, its chat sessions and their
+        chat logs, including the chat log points in the vector db.
+
+        :param session_factory: async_sessionmaker
+            Sessions for the export stream and the erasure
+        :param chat_log_points: PointStore
+            Vector db points of the chat logs, with ``chat_session_id`` in the payload
+        :param export_batch_size: int
+            Rows fetched per round trip of the export's server-side cursors
+        :param export_gzip_level: int
+            1 - 9
+        :param erase_chunk_size: int
+            Rows deleted per transaction of the erasure
+        :param erase_pause_seconds: float
+            Pause between erasure transactions, leaves room for other writers
+        """
+        self.session_factory = session_factory
+        self.chat_log_points = chat_log_points
+        self.export_batch_size = export_batch_size
+        self.export_gzip_level = export_gzip_level
+        self.erase_chunk_size = erase_chunk_size
+        self.erase_pause_seconds = erase_pause_seconds
+
+    async def export(self, user_id: UUID) -> AsyncIterator[bytes]:
+        """
+        Gzip compressed NDJSON of the user, its chat sessions and their chat logs, one
+        ``{"table": ..., "data": ...}`` object per line.
+
+        Rows are read through server-side cursors, ``export_batch_size`` at a time, so
+        memory stays flat however much data the user has. All tables are read from
+        one repeatable read snapshot.
+        """
+        exports: list[tuple[str, type[BaseModel], Select[Any]]] = [
+            ("users", UserPublic, select(User).where(User.id == user_id)),
+            (
+                "chat_sessions",
+                ChatSessionPublic,
+                select(ChatSession)
+                .where(ChatSession.user_id == user_id)
+                .order_by(ChatSession.created_at, ChatSession.id),
+            ),
+            (
+                "chat_logs",
+                ChatLogPublic,
+                select(ChatLog)
+                .join(ChatSession, ChatSession.id == ChatLog.chat_session_id)
+                .where(ChatSession.user_id == user_id)
+                .order_by(ChatLog.chat_session_id, ChatLog.created_at, ChatLog.id),
+            ),
+        ]
+
+        compressor = GzipCompressor(self.export_gzip_level)
+        async with self.session_factory() as db:
+            async with db.begin():
+                await db.execute(
+                    text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                )
+                for table, schema, stmt in exports:
+                    result = await db.stream_scalars(
+                        stmt, execution_options={"yield_per": self.export_batch_size}
+                    )
+                    async for db_objs in result.partitions():
+                        lines = "".join(
+                            json.dumps(
+                                {
+                                    "table": table,
+                                    "data": schema.model_validate(db_obj).model_dump(
+                                        mode="json"
+                                    ),
+                                }
+                            )
+                            + "\n"
+                            for db_obj in db_objs
+                        )
+                        yield compressor.compress(lines.encode())
+        yield compressor.finish()
+
+    async def _erase_chat_session(
+        self, db: AsyncSession, chat_session_id: UUID, progress: dict[str, Any]
+    ) -> None:
+        filter_params = FilterParams(filters=[f"chat_session_id:eq:{chat_session_id}"])
+        after_id = None
+        while True:
+            async with db.begin():
+                deleted_ids = await CRUD_chat_logs.delete_chunk(
+                    db,
+                    filter_params=filter_params,
+                    after_id=after_id,
+                    chunk_size=self.erase_chunk_size,
+                )
+                if not deleted_ids:
+                    break
+                after_id = deleted_ids[-1]
+                progress["chat_logs"] += len(deleted_ids)
+                await report_progress(db, progress)
+            await asyncio.sleep(self.erase_pause_seconds)
+
+        # Before the session row, so a retry after a failure here finds the session
+        await self.chat_log_points.delete_where(chat_session_id=str(chat_session_id))
+
+        async with db.begin():
+            await CRUD_chat_sessions.delete_chunk(
+                db, ids=[chat_session_id], chunk_size=1
+            )
+            progress["chat_sessions"] += 1
+            await report_progress(db, progress)
+
+    async def erase(self, db: AsyncSession, payload: dict[str, Any]) -> None:
+        """
+        Job handler deleting the user ``payload["user_id"]`` and all its data.
+
+        Deleting the user row alone would cascade to every chat session and chat log
+        in one transaction, locking them all at once. Instead the chat logs are
+        deleted in keyset ordered chunks of ``erase_chunk_size``, each in a short
+        transaction with a pause after it, then each chat session, then the user.
+        A retried job continues with what's left.
+        """
+        user_id = UUID(payload["user_id"])
+        progress = await get_progress(db) or {"chat_sessions": 0, "chat_logs": 0}
+
+        chat_sessions_stmt = (
+            select(ChatSession.id)
+            .where(ChatSession.user_id == user_id)
+            .order_by(ChatSession.id)
+            .limit(self.erase_chunk_size)
+        )
+        while True:
+            async with db.begin():
+                result = await db.execute(chat_sessions_stmt)
+            chat_session_ids = result.scalars().all()
+            if not chat_session_ids:
+                break
+            for chat_session_id in chat_session_ids:
+                await self._erase_chat_session(db, chat_session_id, progress)
+
+        async with db.begin():
+            await CRUD_users.delete_chunk(db, ids=[user_id], chunk_size=1)
+            progress["erased"] = True
+            await report_progress(db, progress)
@@ -0,0 +1,133 @@
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from app.core.db import get_qdrant_client
+from app.services.embeddings import Embedder
+
+if TYPE_CHECKING:
+    from qdrant_client import AsyncQdrantClient
+    from qdrant_client.models import Filter
+
+
+def _match_filter(match: dict[str, str]) -> "Filter":
+    from qdrant_client import models as qdrant_models
+
+    return qdrant_models.Filter(
+        must=[
+            qdrant_models.FieldCondition(
+                key=key, match=qdrant_models.MatchValue(value=value)
+            )
+            for key, value in match.items()
+        ]
+    )
+
+
+class VectorCollection:
+    def __init__(
+        self,
+        *,
+        client: "AsyncQdrantClient | None" = None,
+        embedder: Embedder,
+        name: str,
+        payload_indexes: Sequence[str] = (),
+    ):
+        """
+        Qdrant collection with one point per db object, the object id as point id.
+
+        :param client: AsyncQdrantClient | None
+            Client for the vector db, None for the shared client of
+            ``app.core.db.get_qdrant_client``, looked up on first use
+        :param embedder: Embedder
+            Embeds the texts of the objects and queries
+        :param name: str
+            Name of the collection
+        :param payload_indexes: Sequence[str]
+            Payload fields that are filtered on, they get keyword indexes
+        """
+        self._client = client
+        self.embedder = embedder
+        self.name = name
+        self.payload_indexes = payload_indexes
+
+        self._ready = False
+
+    @property
+    def client(self) -> "AsyncQdrantClient":
+        return self._client if self._client is not None else get_qdrant_client()
+
+    async def ensure(self) -> None:
+        """Creates the collection and its payload indexes if they don't exist."""
+        if self._ready:
+            return
+        from qdrant_client import models as qdrant_models
+
+        if not await self.client.collection_exists(self.name):
+            await self.client.create_collection(
+                collection_name=self.name,
+                vectors_config=qdrant_models.VectorParams(
+                    size=self.embedder.dimension,
+                    distance=qdrant_models.Distance.COSINE,
+                ),
+            )
+            for field_name in self.payload_indexes:
+                await self.client.create_payload_index(
+                    collection_name=self.name,
+                    field_name=field_name,
+                    field_schema=qdrant_models.PayloadSchemaType.KEYWORD,
+                )
+        self._ready = True
+
+    async def upsert(self, items: Sequence[tuple[UUID, str, dict[str, Any]]]) -> None:
+        """Embeds and upserts ``(id, text, payload)`` items."""
+        if not items:
+            return
+        await self.ensure()
+
+        from qdrant_client import models as qdrant_models
+
+        vectors = await self.embedder.embed([text for _, text, _ in items])
+        points = [
+            qdrant_models.PointStruct(id=str(obj_id), vector=vector, payload=payload)
+            for (obj_id, _, payload), vector in zip(items, vectors, strict=True)
+        ]
+        await self.client.upsert(collection_name=self.name, points=points)
+
+    async def delete(self, ids: Sequence[UUID]) -> None:
+        if not ids:
+            return
+        await self.ensure()
+        from qdrant_client import models as qdrant_models
+
+        await self.client.delete(
+            collection_name=self.name,
+            points_selector=qdrant_models.PointIdsList(
+                points=[str(obj_id) for obj_id in ids]
+            ),
+        )
+
+    async def delete_where(self, **match: str) -> None:
+        """Deletes all points whose payload matches every ``field=value``."""
+        await self.ensure()
+        from qdrant_client import models as qdrant_models
+
+        await self.client.delete(
+            collection_name=self.name,
+            points_selector=qdrant_models.FilterSelector(filter=_match_filter(match)),
+        )
+
+    async def query(
+        self, text: str, *, match: dict[str, str], limit: int
+    ) -> list[UUID]:
+        """Ids of the points closest to ``text``, with payload matching ``match``."""
+        await self.ensure()
+
+        query_vector = (await self.embedder.embed([text]))[0]
+        response = await self.client.query_points(
+            collection_name=self.name,
+            query=query_vector,
+            query_filter=_match_filter(match),
+            limit=limit,
+            with_payload=False,
+        )
+        return [UUID(str(point.id)) for point in response.points]
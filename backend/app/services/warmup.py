@@ -0,0 +1,95 @@
+import asyncio
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.schemas import FilterParams
+from app.crud import (
+    CRUD_articles,
+    CRUD_chat_logs,
+    CRUD_chat_sessions,
+    CRUD_tenants,
+    CRUD_users,
+)
+from app.crud.base import CRUDBase
+from app.logs.logger import logger
+
+
+class WarmUp:
+    def __init__(
+        self,
+        *,
+        engine: AsyncEngine,
+        cruds: Sequence[CRUDBase[Any, Any, Any, Any]],
+        pool_connections: int,
+    ):
+        """
+        Moves the first request costs of a fresh process to before it's ready:
+        opening pool connections (TCP, TLS and auth), asyncpg's type introspection
+        and prepared statements, SQLAlchemy's compiled statement cache, the
+        ``TypeAdapter`` validators and the OpenAPI schema.
+
+        :param engine: AsyncEngine
+            Engine whose pool is warmed
+        :param cruds: Sequence[CRUDBase]
+            CRUD objects whose hot statements are prepared on every connection
+        :param pool_connections: int
+            Connections opened at once, connections above the pool size are
+            closed again when they're returned
+        """
+        self.engine = engine
+        self.cruds = cruds
+        self.pool_connections = pool_connections
+
+        self.finished = False
+
+    async def _prime(self, conn: AsyncConnection) -> None:
+        # asyncpg prepares and caches statements per connection
+        async with AsyncSession(bind=conn, autobegin=False) as db:
+            for crud in self.cruds:
+                await crud.get_many(db, [UUID(int=0)])
+                await crud.get_all(db, filter_params=FilterParams(limit=1))
+                await crud.get_count_all(db)
+
+    async def _open_and_prime(self) -> None:
+        async with self.engine.connect() as conn:
+            await self._prime(conn)
+
+    async def run(self, *, build_openapi: Callable[[], Any] | None = None) -> None:
+        """
+        Warms up, building the OpenAPI schema with ``build_openapi``, e.g.
+        ``app.openapi``, then sets ``finished``. Failures are logged rather than raised,
+        the process serves cold instead of not at all.
+        """
+        start = time.perf_counter()
+        try:
+            # Concurrently, so each task checks out a connection of its own
+            await asyncio.gather(
+                *(self._open_and_prime() for _ in range(self.pool_connections))
+            )
+            if build_openapi is not None:
+                build_openapi()
+        except Exception as e:
+            logger.error(f"Warm-up failed, serving without it: {e}")
+        else:
+            logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+        finally:
+            self.finished = True
+
+
+warm_up = WarmUp(
+    engine=engine,
+    cruds=[
+        CRUD_tenants,
+        CRUD_users,
+        CRUD_chat_sessions,
+        CRUD_chat_logs,
+        CRUD_articles,
+    ],
+    pool_connections=settings.WARMUP_POOL_CONNECTIONS,
+)
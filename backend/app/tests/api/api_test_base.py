@@ -74,6 +74,30 @@ class APITestBase(BaseTest):
 
         assert response.status_code == 401
 
+    @pytest.mark.asyncio
+    async def test_batch_get(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+        obj_create: Callable[[AsyncSession], Awaitable[ModelType]],
+    ) -> None:
+        obj_1 = await obj_create(db)
+        obj_2 = await obj_create(db)
+        missing_id = uuid4()
+
+        response = await client.post(
+            f"{settings.API_V1_STR}/{route}/batch_get",
+            headers=superuser_token_headers,
+            json={"ids": [str(obj_2.id), str(missing_id), str(obj_1.id)]},
+        )
+
+        assert response.status_code == 200
+        content = response.json()
+        assert [obj["id"] for obj in content["data"]] == [str(obj_2.id), str(obj_1.id)]
+        assert content["missing"] == [str(missing_id)]
+
     @pytest.mark.asyncio
     async def test_get_all(
         self,
@@ -121,6 +145,33 @@ class APITestBase(BaseTest):
             content = content[0]
         self.partial_fields_comparison(model_create_data, content)
 
+    @pytest.mark.asyncio
+    async def test_create_idempotent(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+        obj_model_create: Callable[[AsyncSession], Awaitable[CreateSchemaType]],
+    ) -> None:
+        url = f"{settings.API_V1_STR}/{route}/"
+        headers = {**superuser_token_headers, "Idempotency-Key": str(uuid4())}
+        model_create_data = (await obj_model_create(db)).model_dump(mode="json")
+        other_model_create_data = (await obj_model_create(db)).model_dump(mode="json")
+
+        response = await client.post(url, headers=headers, json=model_create_data)
+        retry_response = await client.post(url, headers=headers, json=model_create_data)
+        reused_response = await client.post(
+            url, headers=headers, json=other_model_create_data
+        )
+
+        assert response.status_code == 200
+        assert "Idempotent-Replayed" not in response.headers
+        assert retry_response.status_code == 200
+        assert retry_response.headers["Idempotent-Replayed"] == "true"
+        assert retry_response.json() == response.json()
+        assert reused_response.status_code == 422
+
     @pytest.mark.asyncio
     async def test_create_not_enough_permissions(
         self,
@@ -0,0 +1,101 @@
+from collections.abc import Awaitable, Callable
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.models import Article
+from app.core.schemas.article import ArticleCreate, ArticleUpdate
+from app.tests.api.api_test_base import APITestBase
+from app.tests.utils import (
+    create_random_article,
+    create_random_tenant,
+    model_random_create_article,
+    model_random_update_article,
+)
+
+
+@pytest.fixture(scope="module")
+def route() -> str:
+    return "articles"
+
+
+@pytest_asyncio.fixture(scope="module")
+async def obj_model_create() -> Callable[[AsyncSession], Awaitable[ArticleCreate]]:
+    async def random_create_article(
+        db: AsyncSession,
+    ) -> ArticleCreate:
+        return await model_random_create_article(db)
+
+    return random_create_article
+
+
+@pytest_asyncio.fixture(scope="module")
+async def obj_model_update() -> Callable[[AsyncSession], Awaitable[ArticleUpdate]]:
+    async def random_update_article(
+        db: AsyncSession,
+    ) -> ArticleUpdate:
+        return await model_random_update_article(db)
+
+    return random_update_article
+
+
+@pytest_asyncio.fixture(scope="module")
+async def obj_create() -> Callable[[AsyncSession], Awaitable[Article]]:
+    async def random_article(
+        db: AsyncSession,
+    ) -> Article:
+        return await create_random_article(db)
+
+    return random_article
+
+
+class TestAPIArticles(APITestBase):
+    @pytest.mark.asyncio
+    async def test_search(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+        obj_model_create: Callable[[AsyncSession], Awaitable[ArticleCreate]],
+    ) -> None:
+        tenant = await create_random_tenant(db)
+        other_tenant = await create_random_tenant(db)
+
+        matching = await obj_model_create(db)
+        matching.tenant_id = tenant.id
+        matching.title = "Election results in Bergen"
+        matching.language = "en"
+        other_language = matching.model_copy(update={"language": "no"})
+        other_tenant_article = matching.model_copy(
+            update={"tenant_id": other_tenant.id}
+        )
+
+        response = await client.post(
+            f"{settings.API_V1_STR}/{route}/",
+            headers=superuser_token_headers,
+            json=[
+                article.model_dump(mode="json")
+                for article in (matching, other_language, other_tenant_article)
+            ],
+        )
+        assert response.status_code == 200
+        matching_id = response.json()[0]["id"]
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/{route}/search",
+            headers=superuser_token_headers,
+            params={
+                "q": "bergen election",
+                "tenant_id": str(tenant.id),
+                "language": "en",
+            },
+        )
+
+        assert response.status_code == 200
+        content = response.json()
+        assert [result["article"]["id"] for result in content] == [matching_id]
+        assert content[0]["score"] > 0
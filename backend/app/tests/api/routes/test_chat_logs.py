@@ -1,14 +1,22 @@
-from collections.abc import Awaitable, Callable
+import json
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from uuid import uuid4
 
 import pytest
 import pytest_asyncio
-from sqlalchemy.ext.asyncio import AsyncSession
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from app.api.deps import get_chat_generator
+from app.core.config import settings
 from app.core.models import ChatLog
 from app.core.schemas.chat_log import ChatLogCreate, ChatLogUpdate
+from app.main import app
+from app.services.generation import ChatGenerator, LocalGenerationProvider
 from app.tests.api.api_test_base import APITestBase
 from app.tests.utils import (
     create_random_chat_log,
+    create_random_chat_session,
     model_random_create_chat_log,
     model_random_update_chat_log,
 )
@@ -49,5 +57,108 @@ async def obj_create() -> Callable[[AsyncSession], Awaitable[ChatLog]]:
     return random_chat_log
 
 
+@pytest_asyncio.fixture(scope="function")
+async def chat_generator(db_engine: AsyncEngine) -> AsyncGenerator[ChatGenerator, None]:
+    test_chat_generator = ChatGenerator(
+        provider=LocalGenerationProvider(),
+        session_factory=async_sessionmaker(
+            bind=db_engine, autobegin=False, expire_on_commit=False
+        ),
+        checkpoint_tokens=1,
+    )
+    app.dependency_overrides[get_chat_generator] = lambda: test_chat_generator
+    yield test_chat_generator
+    del app.dependency_overrides[get_chat_generator]
+
+
 class TestAPIChatLogs(APITestBase):
     skip_test_update = True
+
+    @pytest.mark.asyncio
+    async def test_get_all_filtered(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+    ) -> None:
+        chat_log = await create_random_chat_log(db)
+        await create_random_chat_log(db)
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/{route}/",
+            headers=superuser_token_headers,
+            params={
+                "filters": [
+                    f"chat_session_id:eq:{chat_log.chat_session_id}",
+                    "created_at:gte:2000-01-01T00:00:00+00:00",
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        assert [log["id"] for log in response.json()] == [str(chat_log.id)]
+
+    @pytest.mark.asyncio
+    async def test_get_all_invalid_filter(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+    ) -> None:
+        response = await client.get(
+            f"{settings.API_V1_STR}/{route}/",
+            headers=superuser_token_headers,
+            params={"filters": "prompt:gt:hello"},
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_generate(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+        chat_generator: ChatGenerator,
+    ) -> None:
+        chat_session = await create_random_chat_session(db)
+
+        async with client.stream(
+            "POST",
+            f"{settings.API_V1_STR}/{route}/generate",
+            headers=superuser_token_headers,
+            json={"chat_session_id": str(chat_session.id), "prompt": "hello world"},
+        ) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = [line async for line in response.aiter_lines() if line]
+
+        assert events[-2] == "event: done"
+        chat_log_id = json.loads(events[-1][len("data: ") :])["chat_log_id"]
+
+        await chat_generator.aclose()
+        get_response = await client.get(
+            f"{settings.API_V1_STR}/{route}/{chat_log_id}",
+            headers=superuser_token_headers,
+        )
+
+        assert get_response.status_code == 200
+        assert get_response.json()["response_text"] == "Echo: hello world "
+
+    @pytest.mark.asyncio
+    async def test_generate_chat_session_not_found(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        chat_generator: ChatGenerator,  # noqa: ARG002
+    ) -> None:
+        response = await client.post(
+            f"{settings.API_V1_STR}/{route}/generate",
+            headers=superuser_token_headers,
+            json={"chat_session_id": str(uuid4()), "prompt": "hello world"},
+        )
+
+        assert response.status_code == 404
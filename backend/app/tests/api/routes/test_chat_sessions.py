@@ -2,12 +2,15 @@ from collections.abc import Awaitable, Callable
 
 import pytest
 import pytest_asyncio
+from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.models import ChatSession
 from app.core.schemas.chat_session import ChatSessionCreate, ChatSessionUpdate
 from app.tests.api.api_test_base import APITestBase
 from app.tests.utils import (
+    create_random_chat_log,
     create_random_chat_session,
     model_random_create_chat_session,
     model_random_update_chat_session,
@@ -51,3 +54,56 @@ async def obj_create() -> Callable[[AsyncSession], Awaitable[ChatSession]]:
 
 class TestAPIChatSessions(APITestBase):
     skip_test_update = True
+
+    @pytest.mark.asyncio
+    async def test_get_chat_logs_paginated(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+    ) -> None:
+        chat_session = await create_random_chat_session(db)
+        chat_logs = [
+            await create_random_chat_log(db, {"chat_session": chat_session})
+            for _ in range(3)
+        ]
+        url = f"{settings.API_V1_STR}/{route}/{chat_session.id}/chat_logs"
+
+        first_response = await client.get(
+            url, headers=superuser_token_headers, params={"limit": 2}
+        )
+        first_page = first_response.json()
+        second_response = await client.get(
+            url,
+            headers=superuser_token_headers,
+            params={"limit": 2, "cursor": first_page["next_cursor"]},
+        )
+        second_page = second_response.json()
+
+        assert first_response.status_code == 200
+        assert second_response.status_code == 200
+        # Rows of one test share the transaction's created_at, the id breaks ties
+        assert [log["id"] for log in first_page["data"] + second_page["data"]] == [
+            str(chat_log.id)
+            for chat_log in sorted(chat_logs, key=lambda log: (log.created_at, log.id))
+        ]
+        assert second_page["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_chat_logs_invalid_cursor(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+    ) -> None:
+        chat_session = await create_random_chat_session(db)
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/{route}/{chat_session.id}/chat_logs",
+            headers=superuser_token_headers,
+            params={"cursor": "not-a-cursor"},
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,102 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.deps import get_summarizer
+from app.core.config import settings
+from app.core.models import SummaryCache
+from app.main import app
+from app.services.summarization import LocalSummarizationProvider, Summarizer
+from app.tests.utils import create_random_article
+
+
+@pytest_asyncio.fixture(scope="function")
+async def summarizer(db_engine: AsyncEngine) -> AsyncGenerator[Summarizer, None]:
+    test_summarizer = Summarizer(
+        provider=LocalSummarizationProvider(),
+        session_factory=async_sessionmaker(
+            bind=db_engine, autobegin=False, expire_on_commit=False
+        ),
+        chunk_size=200,
+        fan_out=4,
+        max_words=5,
+        lru_size=0,
+    )
+    app.dependency_overrides[get_summarizer] = lambda: test_summarizer
+    yield test_summarizer
+    del app.dependency_overrides[get_summarizer]
+
+
+class TestAPISummaries:
+    @pytest.mark.asyncio
+    async def test_summarize_text_uses_cache(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        db: AsyncSession,
+        summarizer: Summarizer,  # noqa: ARG002
+    ) -> None:
+        text = "\n\n".join(f"Paragraph {i} of a long article." * 4 for i in range(10))
+
+        first = await client.post(
+            f"{settings.API_V1_STR}/summarize/",
+            headers=superuser_token_headers,
+            json={"text": text},
+        )
+        second = await client.post(
+            f"{settings.API_V1_STR}/summarize/",
+            headers=superuser_token_headers,
+            json={"text": text},
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        first_content, second_content = first.json(), second.json()
+        assert first_content["summary"] == second_content["summary"]
+        assert first_content["chunks"] > 1
+        assert first_content["cached_chunks"] == 0
+        # The LRU is disabled, so the hits come from Postgres
+        assert second_content["cached_chunks"] == second_content["chunks"]
+
+        async with db.begin():
+            count = await db.execute(select(func.count()).select_from(SummaryCache))
+        assert count.one()[0] > first_content["chunks"]
+
+    @pytest.mark.asyncio
+    async def test_summarize_article(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        db: AsyncSession,
+        summarizer: Summarizer,  # noqa: ARG002
+    ) -> None:
+        article = await create_random_article(db)
+
+        response = await client.post(
+            f"{settings.API_V1_STR}/summarize/",
+            headers=superuser_token_headers,
+            json={"article_id": str(article.id), "max_words": 3},
+        )
+
+        assert response.status_code == 200
+        summary_words = response.json()["summary"].split()
+        assert summary_words[0] == article.title
+        assert len(summary_words) <= 3
+
+    @pytest.mark.asyncio
+    async def test_summarize_requires_one_source(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+    ) -> None:
+        response = await client.post(
+            f"{settings.API_V1_STR}/summarize/",
+            headers=superuser_token_headers,
+            json={},
+        )
+
+        assert response.status_code == 422
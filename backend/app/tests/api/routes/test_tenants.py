@@ -2,8 +2,10 @@ from collections.abc import Awaitable, Callable
 
 import pytest
 import pytest_asyncio
+from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.models import Tenant
 from app.core.schemas.tenant import TenantCreate, TenantUpdate
 from app.tests.api.api_test_base import APITestBase
@@ -51,3 +53,39 @@ async def obj_create() -> Callable[[AsyncSession], Awaitable[Tenant]]:
 
 class TestAPITenants(APITestBase):
     num_initial_objs = 1
+
+    @pytest.mark.asyncio
+    async def test_get_not_modified(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+    ) -> None:
+        tenant = await create_random_tenant(db)
+        url = f"{settings.API_V1_STR}/{route}/{tenant.id}"
+
+        response = await client.get(url, headers=superuser_token_headers)
+        etag = response.headers["ETag"]
+        not_modified_response = await client.get(
+            url, headers={**superuser_token_headers, "If-None-Match": etag}
+        )
+
+        tenant_update = await model_random_update_tenant(db)
+        await client.patch(
+            url,
+            headers=superuser_token_headers,
+            json=tenant_update.model_dump(mode="json"),
+        )
+        modified_response = await client.get(
+            url, headers={**superuser_token_headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert etag.startswith('W/"')
+        assert response.headers["Cache-Control"] == settings.CACHE_CONTROL
+        assert not_modified_response.status_code == 304
+        assert not_modified_response.content == b""
+        assert not_modified_response.headers["ETag"] == etag
+        assert modified_response.status_code == 200
+        assert modified_response.headers["ETag"] != etag
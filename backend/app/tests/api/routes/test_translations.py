@@ -0,0 +1,79 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.deps import get_translation_batcher
+from app.core.config import settings
+from app.core.models import TranslationCache
+from app.main import app
+from app.services.translation import LocalTranslationProvider, TranslationBatcher
+
+
+@pytest_asyncio.fixture(scope="function")
+async def batcher(db_engine: AsyncEngine) -> AsyncGenerator[TranslationBatcher, None]:
+    test_batcher = TranslationBatcher(
+        provider=LocalTranslationProvider(),
+        session_factory=async_sessionmaker(
+            bind=db_engine, autobegin=False, expire_on_commit=False
+        ),
+        max_batch_size=64,
+        max_batch_chars=10_000,
+        max_wait_ms=5,
+        lru_size=100,
+    )
+    app.dependency_overrides[get_translation_batcher] = lambda: test_batcher
+    yield test_batcher
+    await test_batcher.aclose()
+    del app.dependency_overrides[get_translation_batcher]
+
+
+class TestAPITranslations:
+    @pytest.mark.asyncio
+    async def test_translate(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        db: AsyncSession,
+        batcher: TranslationBatcher,
+    ) -> None:
+        body = {
+            "segments": ["First paragraph", "Second paragraph", "First paragraph"],
+            "source_language": "en",
+            "target_language": "no",
+        }
+
+        response = await client.post(
+            f"{settings.API_V1_STR}/translate/",
+            headers=superuser_token_headers,
+            json=body,
+        )
+
+        assert response.status_code == 200
+        content = response.json()
+        assert content["translations"] == [
+            "[no] First paragraph",
+            "[no] Second paragraph",
+            "[no] First paragraph",
+        ]
+
+        # Results outlive the in-process LRU through the Postgres cache
+        await batcher.aclose()
+        async with db.begin():
+            count = await db.execute(select(func.count()).select_from(TranslationCache))
+        assert count.one()[0] == 2
+
+    @pytest.mark.asyncio
+    async def test_translate_not_enough_permissions(
+        self,
+        client: AsyncClient,
+    ) -> None:
+        response = await client.post(
+            f"{settings.API_V1_STR}/translate/",
+            json={"segments": ["x"], "source_language": "en", "target_language": "no"},
+        )
+
+        assert response.status_code == 401
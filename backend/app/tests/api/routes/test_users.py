@@ -1,13 +1,19 @@
 from collections.abc import Awaitable, Callable
+from uuid import uuid4
 
 import pytest
 import pytest_asyncio
+from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.models import User
 from app.core.schemas.user import UserCreate, UserUpdate
 from app.tests.api.api_test_base import APITestBase
 from app.tests.utils import (
+    create_random_chat_log,
+    create_random_chat_session,
+    create_random_tenant,
     create_random_user,
     model_random_create_user,
     model_random_update_user,
@@ -51,3 +57,82 @@ async def obj_create() -> Callable[[AsyncSession], Awaitable[User]]:
 
 class TestAPIUsers(APITestBase):
     num_initial_objs = 1
+
+    @pytest.mark.asyncio
+    async def test_get_all_count_matches_filters(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+    ) -> None:
+        user = await create_random_user(db)
+        await create_random_user(db)
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/{route}/",
+            headers=superuser_token_headers,
+            params={"filters": f"email:eq:{user.email}"},
+        )
+
+        assert response.status_code == 200
+        users = response.json()
+        assert [user_public["id"] for user_public in users["data"]] == [str(user.id)]
+        assert users["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_chat_sessions_include_chat_logs(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+        db: AsyncSession,
+    ) -> None:
+        deps = {
+            "tenant": await create_random_tenant(db),
+            "user": await create_random_user(db),
+        }
+        session_with_log = await create_random_chat_session(db, deps)
+        empty_session = await create_random_chat_session(db, deps)
+        chat_log = await create_random_chat_log(db, {"chat_session": session_with_log})
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/{route}/{deps['user'].id}/chat_sessions",
+            headers=superuser_token_headers,
+            params={"include": "chat_logs"},
+        )
+
+        assert response.status_code == 200
+        page = response.json()
+        # Rows of one test share the transaction's created_at, the id breaks ties
+        chat_sessions = sorted(
+            [session_with_log, empty_session],
+            key=lambda session: (session.created_at, session.id),
+            reverse=True,
+        )
+        assert [session["id"] for session in page["data"]] == [
+            str(session.id) for session in chat_sessions
+        ]
+        chat_logs_by_session = {
+            session["id"]: [log["id"] for log in session["chat_logs"]]
+            for session in page["data"]
+        }
+        assert chat_logs_by_session == {
+            str(session_with_log.id): [str(chat_log.id)],
+            str(empty_session.id): [],
+        }
+        assert page["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_chat_sessions_user_not_found(
+        self,
+        client: AsyncClient,
+        superuser_token_headers: dict[str, str],
+        route: str,
+    ) -> None:
+        response = await client.get(
+            f"{settings.API_V1_STR}/{route}/{uuid4()}/chat_sessions",
+            headers=superuser_token_headers,
+        )
+
+        assert response.status_code == 404
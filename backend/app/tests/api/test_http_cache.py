@@ -0,0 +1,18 @@
+from app.api.http_cache import etag_matches, weak_etag
+
+
+def test_weak_etag_is_stable() -> None:
+    assert weak_etag("id", 1) == weak_etag("id", 1)
+    assert weak_etag("id", 1) != weak_etag("id", 2)
+
+
+def test_etag_matches() -> None:
+    etag = weak_etag("id")
+    opaque_tag = etag.removeprefix("W/")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(opaque_tag, etag)
+    assert etag_matches(f'W/"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('W/"other"', etag)
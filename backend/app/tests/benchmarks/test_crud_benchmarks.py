@@ -0,0 +1,174 @@
+"""
+``CRUDBase`` methods on ``chat_logs`` at growing table sizes, the scaling curve of
+the hot path. Needs pytest-benchmark and the test db, and is deselected by default:
+
+    pytest -m benchmark app/tests/benchmarks --benchmark-group-by=group,param
+    CRUD_BENCHMARK_ROWS=1000,100000 pytest -m benchmark app/tests/benchmarks
+
+Each table size is seeded once per module with ``app.tests.utils.bulk_data``, with
+one chat session per 10 chat logs, one user per 100 and one tenant per 10 000.
+"""
+
+import asyncio
+import os
+import random
+from collections.abc import Awaitable, Callable, Generator
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.schemas import ChatLogCreate, ChatLogUpdate, FilterParams
+from app.crud import CRUD_chat_logs
+from app.tests.test_db import reset_database
+from app.tests.utils.bulk_data import seed_tables
+
+pytest.importorskip("pytest_benchmark")
+
+ROW_COUNTS = [
+    int(rows)
+    for rows in os.environ.get("CRUD_BENCHMARK_ROWS", "1000,100000,1000000").split(",")
+]
+
+
+@dataclass
+class SeededDb:
+    loop: asyncio.AbstractEventLoop
+    session_factory: async_sessionmaker[AsyncSession]
+    rows: int
+    ids: dict[str, list[UUID]]
+
+    def run(self, call: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async def in_session() -> Any:
+            async with self.session_factory() as db:
+                return await call(db)
+
+        return self.loop.run_until_complete(in_session())
+
+
+async def analyze(db: AsyncSession) -> None:
+    # Planner statistics of the seeded tables, as autovacuum would collect them
+    async with db.begin():
+        await db.execute(text("ANALYZE"))
+
+
+@pytest.fixture(scope="module", params=ROW_COUNTS, ids=lambda rows: f"{rows}_rows")
+def seeded_db(
+    request: pytest.FixtureRequest, test_database: AsyncEngine
+) -> Generator[SeededDb, None, None]:
+    rows: int = request.param
+    loop = asyncio.new_event_loop()
+    session_factory = async_sessionmaker(
+        bind=test_database, autobegin=False, expire_on_commit=False
+    )
+
+    try:
+        seeded = SeededDb(loop=loop, session_factory=session_factory, rows=rows, ids={})
+        seeded.ids = seeded.run(
+            lambda db: seed_tables(
+                db,
+                n_tenants=max(1, rows // 10_000),
+                n_users=max(1, rows // 100),
+                n_chat_sessions=max(1, rows // 10),
+                n_chat_logs=rows,
+            )
+        )
+        seeded.run(analyze)
+        yield seeded
+    finally:
+        loop.run_until_complete(reset_database(test_database))
+        loop.close()
+
+
+def _random_chat_log_id(seeded_db: SeededDb, rng: random.Random) -> UUID:
+    return rng.choice(seeded_db.ids["chat_logs"])
+
+
+def _chat_log_in(seeded_db: SeededDb, rng: random.Random) -> dict[str, Any]:
+    return {
+        "chat_session_id": rng.choice(seeded_db.ids["chat_sessions"]),
+        "prompt": "Benchmark prompt",
+        "response_text": "Benchmark response " * rng.randint(5, 50),
+    }
+
+
+@pytest.mark.benchmark(group="create")
+def test_create(benchmark: Any, seeded_db: SeededDb) -> None:
+    rng = random.Random(0)
+
+    def create() -> Any:
+        obj_in = [ChatLogCreate(**_chat_log_in(seeded_db, rng)) for _ in range(100)]
+        return seeded_db.run(
+            lambda db: CRUD_chat_logs.create(db, obj_in=obj_in, return_nothing=True)
+        )
+
+    benchmark.pedantic(create, rounds=20, warmup_rounds=2)
+
+
+@pytest.mark.benchmark(group="get")
+def test_get(benchmark: Any, seeded_db: SeededDb) -> None:
+    rng = random.Random(0)
+
+    def get() -> Any:
+        chat_log_id = _random_chat_log_id(seeded_db, rng)
+        return seeded_db.run(lambda db: CRUD_chat_logs.get(db, {"id": chat_log_id}))
+
+    benchmark.pedantic(get, rounds=100, warmup_rounds=5)
+
+
+@pytest.mark.benchmark(group="get_all")
+def test_get_all_sorted_with_offset(benchmark: Any, seeded_db: SeededDb) -> None:
+    filter_params = FilterParams(
+        limit=100,
+        offset=seeded_db.rows // 2,
+        sort_columns=["created_at"],
+        sort_orders=["desc"],
+    )
+
+    def get_all() -> Any:
+        return seeded_db.run(
+            lambda db: CRUD_chat_logs.get_all(db, filter_params=filter_params)
+        )
+
+    benchmark.pedantic(get_all, rounds=10, warmup_rounds=1)
+
+
+@pytest.mark.benchmark(group="update")
+def test_update(benchmark: Any, seeded_db: SeededDb) -> None:
+    rng = random.Random(0)
+
+    def update() -> Any:
+        chat_log_id = _random_chat_log_id(seeded_db, rng)
+        obj_in = ChatLogUpdate(**_chat_log_in(seeded_db, rng))
+        return seeded_db.run(
+            lambda db: CRUD_chat_logs.update(db, obj_id=chat_log_id, obj_in=obj_in)
+        )
+
+    benchmark.pedantic(update, rounds=100, warmup_rounds=5)
+
+
+@pytest.mark.benchmark(group="delete")
+def test_delete(benchmark: Any, seeded_db: SeededDb) -> None:
+    # Every round deletes another chat log
+    chat_log_ids = iter(random.Random(0).sample(seeded_db.ids["chat_logs"], k=105))
+
+    def setup() -> tuple[tuple[UUID], dict[str, Any]]:
+        return (next(chat_log_ids),), {}
+
+    def delete(chat_log_id: UUID) -> Any:
+        return seeded_db.run(
+            lambda db: CRUD_chat_logs.delete(db, filters={"id": chat_log_id})
+        )
+
+    benchmark.pedantic(delete, setup=setup, rounds=100, warmup_rounds=5)
+
+
+@pytest.mark.benchmark(group="get_count_all")
+def test_get_count_all(benchmark: Any, seeded_db: SeededDb) -> None:
+    def get_count_all() -> Any:
+        return seeded_db.run(lambda db: CRUD_chat_logs.get_count_all(db))
+
+    benchmark.pedantic(get_count_all, rounds=10, warmup_rounds=1)
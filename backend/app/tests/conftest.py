@@ -1,47 +1,127 @@
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+from functools import wraps
+from typing import Any
 
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
-from app.api.deps import get_db
-from app.core.db import Base
-from app.core.init_db import init_db
+from app.api.deps import get_db, rate_limit
+from app.crud.base import CRUDBase
 from app.main import app
-from app.tests.test_db import test_engine
+from app.tests.test_db import (
+    create_test_engine,
+    create_worker_database,
+    drop_database,
+    reset_database,
+)
+from app.tests.utils.index_advisor import IndexAdvisor
 from app.tests.utils.utils import get_superuser_token_headers
 
 
-@pytest_asyncio.fixture(scope="function")
-async def db_engine() -> AsyncGenerator[AsyncEngine, None]:
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+@pytest.fixture(scope="session", autouse=True)
+def index_advisor() -> Generator[IndexAdvisor, None, None]:
+    """Fails the session if CRUD filtered on a column without an index."""
+    advisor = IndexAdvisor()
+
+    def record_filters(method):
+        @wraps(method)
+        async def wrapper(self: CRUDBase, *args: Any, **kwargs: Any) -> Any:
+            filters = kwargs.get("filters", args[1] if len(args) > 1 else None)
+            if filters:
+                advisor.record(self.model.__table__, filters.keys())
+            return await method(self, *args, **kwargs)
+
+        return wrapper
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(CRUDBase, "_get_multi", record_filters(CRUDBase._get_multi))
+        mp.setattr(CRUDBase, "get_page", record_filters(CRUDBase.get_page))
+        mp.setattr(CRUDBase, "delete", record_filters(CRUDBase.delete))
+        yield advisor
+
+    missing_indexes = advisor.missing_indexes()
+    assert not missing_indexes, f"CRUD filters on unindexed columns: {missing_indexes}"
+
 
-    # Uses CRUD_user, therefore AsyncSession
-    async with AsyncSession(test_engine) as db:
-        await init_db(db)
+def _run(coro: Any) -> Any:
+    # Own loop, session fixtures outlive the loops of the async tests
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
 
-    yield test_engine
 
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+@pytest.fixture(scope="session")
+def test_database() -> Generator[AsyncEngine, None, None]:
+    """
+    Engine of this test process' database, cloned once per session (per xdist
+    worker) from a template database with the schema and ``init_db`` objects.
+    """
+    database = _run(create_worker_database())
+    engine = create_test_engine(database)
+    yield engine
+    _run(engine.dispose())
+    _run(drop_database(database))
+
+
+@pytest.fixture(scope="function")
+def db_engine(test_database: AsyncEngine) -> Generator[AsyncEngine, None, None]:
+    """
+    For tests that commit, e.g. to share rows between sessions. The database is
+    reset afterwards, and ``db`` of such tests commits too.
+    """
+    yield test_database
+    _run(reset_database(test_database))
 
 
 @pytest_asyncio.fixture(scope="function")
-async def db(db_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
-    session = async_sessionmaker(
-        autocommit=False,
-        autoflush=False,
-        autobegin=False,
-        expire_on_commit=False,
-        bind=db_engine,
-    )
-
-    # NB: Needs to .begin() elsewhere
-    async with session() as db:
-        yield db
+async def session_factory(
+    db_engine: AsyncEngine,
+) -> async_sessionmaker[AsyncSession]:
+    """Sessions of their own for tests that commit, like the ones the app uses."""
+    return async_sessionmaker(bind=db_engine, autobegin=False, expire_on_commit=False)
 
-        await db.rollback()
+
+@pytest_asyncio.fixture(scope="function")
+async def db(
+    request: pytest.FixtureRequest, test_database: AsyncEngine
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session of the test. Unless the test uses ``db_engine``, it runs in one
+    connection's transaction that is rolled back afterwards, ``db.begin()`` and
+    commits only create and release SAVEPOINTs.
+    """
+    session_options: dict[str, Any] = {
+        "autoflush": False,
+        "autobegin": False,
+        "expire_on_commit": False,
+    }
+
+    if "db_engine" in request.fixturenames:
+        session = async_sessionmaker(
+            bind=request.getfixturevalue("db_engine"), **session_options
+        )
+        # NB: Needs to .begin() elsewhere
+        async with session() as db:
+            yield db
+
+            await db.rollback()
+        return
+
+    async with test_database.connect() as conn:
+        transaction = await conn.begin()
+        session = async_sessionmaker(
+            bind=conn, join_transaction_mode="create_savepoint", **session_options
+        )
+        # NB: Needs to .begin() elsewhere
+        async with session() as db:
+            yield db
+
+        await transaction.rollback()
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -50,6 +130,8 @@ async def client(db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    # Tested on their own, API tests send more requests than a user's burst
+    app.dependency_overrides[rate_limit] = lambda: None
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as c:
@@ -0,0 +1,54 @@
+from collections.abc import Awaitable, Callable
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import Article
+from app.core.schemas.article import ArticleCreate, ArticleUpdate
+from app.crud import CRUD_articles, CRUDBase
+from app.tests.crud.crud_test_base import CRUDTestBase
+from app.tests.utils import (
+    create_random_article,
+    model_random_create_article,
+    model_random_update_article,
+)
+
+
+@pytest.fixture(scope="module")
+def crud() -> CRUDBase:
+    return CRUD_articles
+
+
+@pytest_asyncio.fixture(scope="module")
+async def obj_model_create() -> Callable[[AsyncSession], Awaitable[ArticleCreate]]:
+    async def random_create_article(
+        db: AsyncSession,
+    ) -> ArticleCreate:
+        return await model_random_create_article(db)
+
+    return random_create_article
+
+
+@pytest_asyncio.fixture(scope="module")
+async def obj_model_update() -> Callable[[AsyncSession], Awaitable[ArticleUpdate]]:
+    async def random_update_article(
+        db: AsyncSession,
+    ) -> ArticleUpdate:
+        return await model_random_update_article(db)
+
+    return random_update_article
+
+
+@pytest_asyncio.fixture(scope="module")
+async def obj_create() -> Callable[[AsyncSession], Awaitable[Article]]:
+    async def random_article(
+        db: AsyncSession,
+    ) -> Article:
+        return await create_random_article(db)
+
+    return random_article
+
+
+class TestCRUDArticles(CRUDTestBase):
+    pass
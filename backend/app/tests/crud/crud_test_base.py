@@ -43,6 +43,24 @@ class CRUDTestBase(BaseTest):
         with pytest.raises(DbObjNotFoundError):
             await crud.get(db, filters=filter)
 
+    @pytest.mark.asyncio
+    async def test_get_many(
+        self,
+        db: AsyncSession,
+        obj_create: Callable[[AsyncSession], Awaitable[ModelType]],
+        crud: CRUDBase,
+    ) -> None:
+        obj_1 = await obj_create(db)
+        obj_2 = await obj_create(db)
+        missing_id = uuid4()
+
+        get_objs, missing = await crud.get_many(
+            db, [obj_2.id, missing_id, obj_1.id, obj_2.id]
+        )
+
+        assert [get_obj.id for get_obj in get_objs] == [obj_2.id, obj_1.id]
+        assert missing == [missing_id]
+
     @pytest.mark.asyncio
     async def test_get_all(
         self,
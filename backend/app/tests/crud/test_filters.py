@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.models import Article, ChatLog, Tenant
+from app.core.schemas import FilterCondition, FilterParams
+from app.crud.filters import compile_filter, is_indexed
+from app.exceptions import InvalidFilterError
+
+
+def _compile(table, expression: str) -> tuple[str, list]:
+    clause = compile_filter(table, FilterCondition.parse(expression))
+    compiled = clause.compile(dialect=postgresql.dialect())
+    return str(compiled), list(compiled.params.values())
+
+
+def test_compile_filters() -> None:
+    chat_session_ids = [uuid4(), uuid4()]
+
+    assert _compile(ChatLog.__table__, "created_at:gt:2025-01-01T00:00:00+00:00") == (
+        "chat_logs.created_at > %(created_at_1)s",
+        [datetime(2025, 1, 1, tzinfo=timezone.utc)],
+    )
+    assert _compile(
+        ChatLog.__table__,
+        f"chat_session_id:in:{chat_session_ids[0]},{chat_session_ids[1]}",
+    ) == (
+        "chat_logs.chat_session_id IN (__[POSTCOMPILE_chat_session_id_1])",
+        [chat_session_ids],
+    )
+    assert _compile(Tenant.__table__, "company_name:ilike:%acme%") == (
+        "tenants.company_name ILIKE %(company_name_1)s",
+        ["%acme%"],
+    )
+    assert _compile(Tenant.__table__, 'settings:contains:{"plan": "pro"}') == (
+        "tenants.settings @> %(settings_1)s::JSONB",
+        [{"plan": "pro"}],
+    )
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "missing:eq:1",
+        "company_name:gt:a",
+        "settings:eq:{}",
+        "created_at:ilike:2025",
+        "created_at:lt:yesterday",
+        "settings:contains:1",
+    ],
+)
+def test_invalid_filters_are_rejected(expression: str) -> None:
+    with pytest.raises(InvalidFilterError):
+        _compile(Tenant.__table__, expression)
+
+
+def test_filter_syntax_is_validated() -> None:
+    with pytest.raises(ValueError):
+        FilterParams(filters=["company_name"])
+    with pytest.raises(ValueError):
+        FilterParams(filters=["company_name:like:acme"])
+
+
+def test_is_indexed() -> None:
+    def condition(expression: str) -> FilterCondition:
+        return FilterCondition.parse(expression)
+
+    assert is_indexed(ChatLog.__table__, condition(f"chat_session_id:eq:{uuid4()}"))
+    assert not is_indexed(ChatLog.__table__, condition("prompt:eq:hello"))
+    assert not is_indexed(Article.__table__, condition("title:ilike:%news%"))
+    assert not is_indexed(Tenant.__table__, condition('settings:contains:{"a": 1}'))
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import Table
+
+from app.core.db import Base
+from app.core.models import Tenant
+from app.tests.utils.index_advisor import IndexAdvisor, unindexed_columns
+
+
+@pytest.mark.parametrize(
+    "table", Base.metadata.sorted_tables, ids=lambda table: table.name
+)
+def test_foreign_keys_are_indexed(table: Table) -> None:
+    """Lookups by parent and `ondelete="CASCADE"` would scan the table otherwise"""
+    fk_columns = [fk.parent.name for fk in table.foreign_keys]
+
+    assert unindexed_columns(table, fk_columns) == []
+
+
+@pytest.mark.parametrize(
+    "table",
+    [table for table in Base.metadata.sorted_tables if "tenant_id" in table.columns],
+    ids=lambda table: table.name,
+)
+def test_tenant_id_is_indexed(table: Table) -> None:
+    """Every tenant scoped query filters by `tenant_id` first"""
+    assert unindexed_columns(table, ["tenant_id"]) == []
+
+
+def test_index_advisor_reports_unindexed_filter_columns() -> None:
+    advisor = IndexAdvisor()
+    advisor.record(Tenant.__table__, ["id", "entra_tenant_id", "company_name"])
+
+    assert advisor.missing_indexes() == {"tenants": ["company_name"]}
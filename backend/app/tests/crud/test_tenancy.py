@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.routes.chat_sessions import create_chat_session
+from app.core.schemas import ChatSessionCreate
+from app.crud import CRUD_chat_logs, CRUD_chat_sessions, CRUD_tenants, CRUD_users
+from app.crud.tenancy import tenant_scope
+from app.exceptions import DbObjNotFoundError, TenantAccessDeniedError
+from app.tests.utils import (
+    create_random_chat_log,
+    create_random_chat_session,
+    create_random_tenant,
+    create_random_user,
+)
+from app.tests.utils.users import model_random_create_user
+
+
+@pytest.mark.asyncio
+async def test_reads_are_scoped_to_tenant(db: AsyncSession) -> None:
+    tenant = await create_random_tenant(db)
+    user = await create_random_user(db, {"tenant": tenant})
+    other_user = await create_random_user(db)
+
+    with tenant_scope(tenant.id):
+        tenants = await CRUD_tenants.get_all(db)
+        users, missing = await CRUD_users.get_many(db, [user.id, other_user.id])
+        users_count = await CRUD_users.get_count_all(db)
+        with pytest.raises(DbObjNotFoundError):
+            await CRUD_users.get(db, {"id": other_user.id})
+
+    assert [scoped_tenant.id for scoped_tenant in tenants] == [tenant.id]
+    assert [scoped_user.id for scoped_user in users] == [user.id]
+    assert missing == [other_user.id]
+    assert users_count == 1
+
+
+@pytest.mark.asyncio
+async def test_chat_logs_are_scoped_through_chat_sessions(db: AsyncSession) -> None:
+    tenant = await create_random_tenant(db)
+    chat_session = await create_random_chat_session(
+        db, {"tenant": tenant, "user": await create_random_user(db, {"tenant": tenant})}
+    )
+    chat_log_id = (await create_random_chat_log(db, {"chat_session": chat_session})).id
+    other_chat_log_id = (await create_random_chat_log(db)).id
+
+    with tenant_scope(tenant.id):
+        chat_logs = await CRUD_chat_logs.get_all(db)
+        # Read before the failed delete rolls back and expires them
+        chat_log_ids = [scoped_chat_log.id for scoped_chat_log in chat_logs]
+        with pytest.raises(DbObjNotFoundError):
+            await CRUD_chat_logs.delete(db, filters={"id": other_chat_log_id})
+
+    assert chat_log_ids == [chat_log_id]
+    assert await CRUD_chat_logs.get(db, {"id": other_chat_log_id})
+
+
+@pytest.mark.asyncio
+async def test_writes_to_other_tenants_are_denied(db: AsyncSession) -> None:
+    tenant = await create_random_tenant(db)
+    other_user_in = await model_random_create_user(db)
+    chat_session = await create_random_chat_session(db)
+
+    with tenant_scope(tenant.id):
+        with pytest.raises(TenantAccessDeniedError):
+            await CRUD_users.create(db, obj_in=other_user_in)
+        with pytest.raises(TenantAccessDeniedError):
+            await CRUD_chat_sessions.update_chunk(
+                db, values={"tenant_id": chat_session.tenant_id}, chunk_size=1
+            )
+
+
+@pytest.mark.asyncio
+async def test_chat_sessions_of_other_tenants_users_are_denied(
+    db: AsyncSession,
+) -> None:
+    tenant = await create_random_tenant(db)
+    other_user = await create_random_user(db)
+
+    with tenant_scope(tenant.id):
+        with pytest.raises(TenantAccessDeniedError):
+            await create_chat_session(
+                chat_sessions=ChatSessionCreate(
+                    user_id=other_user.id, tenant_id=tenant.id
+                ),
+                db=db,
+            )
@@ -0,0 +1,193 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.models import ChatLog, Job
+from app.core.schemas import BulkSelection, ChatLogBulkUpdate
+from app.crud import CRUD_chat_logs, CRUD_chat_sessions
+from app.crud.tenancy import tenant_scope
+from app.exceptions import DbObjNotFoundError, TenantAccessDeniedError
+from app.services.bulk import (
+    BULK_DELETE,
+    BULK_UPDATE,
+    bulk_delete,
+    bulk_update,
+    enqueue_bulk_delete,
+    enqueue_bulk_update,
+)
+from app.services.job_handlers import DELETE_CHAT_LOG_POINTS, JOB_HANDLERS
+from app.services.jobs import JobHandler, JobWorker
+from app.tests.utils import (
+    create_random_chat_log,
+    create_random_chat_session,
+    create_random_tenant,
+    create_random_user,
+)
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "BULK_CHUNK_SIZE", 2)
+    monkeypatch.setattr(settings, "BULK_CHUNK_PAUSE_SECONDS", 0)
+
+
+async def _run_job(
+    session_factory: async_sessionmaker[AsyncSession],
+    handlers: dict[str, JobHandler] | None = None,
+) -> Job:
+    worker = JobWorker(
+        handlers=handlers or {BULK_DELETE: bulk_delete, BULK_UPDATE: bulk_update},
+        session_factory=session_factory,
+        concurrency=1,
+        tenant_concurrency=1,
+        poll_interval_seconds=0.01,
+        retry_attempts=1,
+        retry_wait_seconds=0,
+        lock_timeout_seconds=60,
+    )
+    [claimed] = await worker.claim(1)
+    await worker.execute(claimed)
+
+    async with session_factory() as db:
+        async with db.begin():
+            return await db.get_one(Job, claimed.id)
+
+
+async def _chat_log_ids(db: AsyncSession, chat_session_id) -> set:
+    async with db.begin():
+        result = await db.execute(
+            select(ChatLog.id).where(ChatLog.chat_session_id == chat_session_id)
+        )
+    return set(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_by_ids_in_chunks(
+    db: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    chat_session = await create_random_chat_session(db)
+    chat_logs = [
+        await create_random_chat_log(db, {"chat_session": chat_session})
+        for _ in range(5)
+    ]
+    deleted_ids = [chat_log.id for chat_log in chat_logs[:3]]
+
+    selection = BulkSelection(ids=[*deleted_ids, uuid4()])
+    await enqueue_bulk_delete(db, crud=CRUD_chat_logs, selection=selection)
+    job = await _run_job(session_factory)
+
+    assert job.status == "succeeded"
+    assert job.progress["total"] == 4
+    assert job.progress["processed"] == 3
+    assert await _chat_log_ids(db, chat_session.id) == {
+        chat_log.id for chat_log in chat_logs[3:]
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_enqueues_point_deletion_per_chunk(
+    db: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    chat_sessions = [await create_random_chat_session(db) for _ in range(3)]
+    ids = sorted(chat_session.id for chat_session in chat_sessions)
+
+    await enqueue_bulk_delete(
+        db, crud=CRUD_chat_sessions, selection=BulkSelection(ids=ids)
+    )
+    job = await _run_job(session_factory, JOB_HANDLERS)
+
+    assert job.status == "succeeded"
+    async with db.begin():
+        result = await db.execute(
+            select(Job.payload)
+            .where(Job.kind == DELETE_CHAT_LOG_POINTS)
+            .order_by(Job.created_at)
+        )
+        payloads = result.scalars().all()
+    assert [payload["chat_session_ids"] for payload in payloads] == [
+        [str(obj_id) for obj_id in ids[:2]],
+        [str(ids[2])],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_by_filter(
+    db: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    chat_session = await create_random_chat_session(db)
+    other_chat_session = await create_random_chat_session(db)
+    chat_logs = [
+        await create_random_chat_log(db, {"chat_session": chat_session})
+        for _ in range(3)
+    ]
+
+    selection = BulkSelection(filters=[f"chat_session_id:eq:{chat_session.id}"])
+    await enqueue_bulk_update(
+        db,
+        crud=CRUD_chat_logs,
+        selection=selection,
+        values=ChatLogBulkUpdate(chat_session_id=other_chat_session.id),
+    )
+    job = await _run_job(session_factory)
+
+    assert job.status == "succeeded"
+    assert job.progress["total"] == job.progress["processed"] == 3
+    assert await _chat_log_ids(db, chat_session.id) == set()
+    assert await _chat_log_ids(db, other_chat_session.id) == {
+        chat_log.id for chat_log in chat_logs
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_resumes_after_reported_progress(
+    db: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    chat_session = await create_random_chat_session(db)
+    chat_logs = [
+        await create_random_chat_log(db, {"chat_session": chat_session})
+        for _ in range(4)
+    ]
+    ids = sorted(chat_log.id for chat_log in chat_logs)
+
+    job_id = await enqueue_bulk_delete(
+        db, crud=CRUD_chat_logs, selection=BulkSelection(ids=ids)
+    )
+    # As if an earlier attempt committed the first chunk, then failed
+    async with session_factory() as session:
+        async with session.begin():
+            job = await session.get_one(Job, job_id)
+            job.progress = {"total": 4, "processed": 2, "after_id": str(ids[1])}
+    job = await _run_job(session_factory)
+
+    assert job.progress["processed"] == 4
+    assert await _chat_log_ids(db, chat_session.id) == set(ids[:2])
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_foreign_references(db: AsyncSession) -> None:
+    tenant = await create_random_tenant(db)
+    chat_session = await create_random_chat_session(
+        db, {"tenant": tenant, "user": await create_random_user(db, {"tenant": tenant})}
+    )
+    await create_random_chat_log(db, {"chat_session": chat_session})
+    other_chat_session = await create_random_chat_session(db)
+    selection = BulkSelection(filters=[f"chat_session_id:eq:{chat_session.id}"])
+
+    with tenant_scope(tenant.id):
+        with pytest.raises(TenantAccessDeniedError):
+            await enqueue_bulk_update(
+                db,
+                crud=CRUD_chat_logs,
+                selection=selection,
+                values=ChatLogBulkUpdate(chat_session_id=other_chat_session.id),
+            )
+    with pytest.raises(DbObjNotFoundError):
+        await enqueue_bulk_update(
+            db,
+            crud=CRUD_chat_logs,
+            selection=selection,
+            values=ChatLogBulkUpdate(chat_session_id=uuid4()),
+        )
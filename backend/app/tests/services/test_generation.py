@@ -0,0 +1,127 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.models import ChatLog, Job
+from app.services.generation import ChatGenerator, LocalGenerationProvider
+from app.services.job_handlers import INDEX_CHAT_LOGS
+from app.tests.utils import create_random_chat_session
+
+
+class RecordingChatGenerator(ChatGenerator):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(session_factory=None, **kwargs)  # type: ignore[arg-type]
+        self.writes: list[str] = []
+
+    async def _upsert(self, *, response_text: str, **kwargs: Any) -> None:  # noqa: ARG002
+        self.writes.append(response_text)
+
+
+def _parse(events: list[str]) -> list[tuple[str, dict[str, Any]]]:
+    parsed = []
+    for event in events:
+        event_line, data_line = event.strip().split("\n")
+        parsed.append(
+            (event_line[len("event: ") :], json.loads(data_line[len("data: ") :]))
+        )
+    return parsed
+
+
+@pytest.mark.asyncio
+async def test_stream_tokens_then_persist() -> None:
+    generator = RecordingChatGenerator(
+        provider=LocalGenerationProvider(), checkpoint_tokens=0
+    )
+    chat_log_id = uuid4()
+
+    events = _parse(
+        [
+            event
+            async for event in generator.stream(
+                chat_log_id=chat_log_id, chat_session_id=uuid4(), prompt="hello world"
+            )
+        ]
+    )
+    await generator.aclose()
+
+    assert [name for name, _ in events] == ["token", "token", "token", "done"]
+    assert "".join(data["text"] for name, data in events if name == "token") == (
+        "Echo: hello world "
+    )
+    assert events[-1][1] == {"chat_log_id": str(chat_log_id)}
+    assert generator.writes == ["Echo: hello world "]
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_written_in_order() -> None:
+    generator = RecordingChatGenerator(
+        provider=LocalGenerationProvider(), checkpoint_tokens=2
+    )
+
+    async for _ in generator.stream(
+        chat_log_id=uuid4(), chat_session_id=uuid4(), prompt="a b c"
+    ):
+        pass
+    await generator.aclose()
+
+    assert generator.writes == ["Echo: a ", "Echo: a b c ", "Echo: a b c "]
+
+
+@pytest.mark.asyncio
+async def test_provider_failure_sends_error_and_keeps_partial_response() -> None:
+    class FailingProvider:
+        async def stream(self, prompt: str) -> AsyncIterator[str]:
+            yield prompt
+            raise RuntimeError("provider down")
+
+    generator = RecordingChatGenerator(provider=FailingProvider(), checkpoint_tokens=0)
+
+    events = _parse(
+        [
+            event
+            async for event in generator.stream(
+                chat_log_id=uuid4(), chat_session_id=uuid4(), prompt="partial"
+            )
+        ]
+    )
+    await generator.aclose()
+
+    assert [name for name, _ in events] == ["token", "error"]
+    assert generator.writes == ["partial"]
+
+
+@pytest.mark.asyncio
+async def test_last_write_enqueues_indexing(
+    db: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    chat_session = await create_random_chat_session(db)
+    generator = ChatGenerator(
+        provider=LocalGenerationProvider(),
+        session_factory=session_factory,
+        checkpoint_tokens=1,
+    )
+    chat_log_id = uuid4()
+
+    async for _ in generator.stream(
+        chat_log_id=chat_log_id, chat_session_id=chat_session.id, prompt="a b"
+    ):
+        pass
+    await generator.aclose()
+
+    async with db.begin():
+        response_text = await db.scalar(
+            select(ChatLog.response_text).where(ChatLog.id == chat_log_id)
+        )
+        jobs = (
+            await db.execute(select(Job).where(Job.kind == INDEX_CHAT_LOGS))
+        ).scalars()
+        payloads = [job.payload for job in jobs]
+
+    assert response_text == "Echo: a b "
+    # Checkpoints aren't indexed, only the complete response
+    assert payloads == [{"chat_log_ids": [str(chat_log_id)]}]
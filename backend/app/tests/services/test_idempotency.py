@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.exceptions import IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+from app.services.idempotency import IdempotencyStore, StoredResponse
+
+RESPONSE = StoredResponse(status_code=200, media_type="application/json", body=b"[]")
+
+
+def _store(**kwargs) -> IdempotencyStore:
+    options = {
+        "ttl_seconds": 60,
+        "claim_timeout_seconds": 60,
+        "wait_seconds": 0.2,
+        "poll_interval_seconds": 0.01,
+    }
+    options.update(kwargs)
+    return IdempotencyStore(**options)
+
+
+@pytest.mark.asyncio
+async def test_completed_key_replays_response(db: AsyncSession) -> None:
+    store = _store()
+
+    claimed = await store.claim(db, owner="a", key="k", request_hash="h")
+    await store.complete(db, owner="a", key="k", response=RESPONSE)
+    replayed = await store.claim(db, owner="a", key="k", request_hash="h")
+    # Keys of other owners don't collide
+    other_owner = await store.claim(db, owner="b", key="k", request_hash="h")
+
+    assert claimed is None
+    assert replayed == RESPONSE
+    assert other_owner is None
+
+
+@pytest.mark.asyncio
+async def test_key_of_a_different_request_is_rejected(db: AsyncSession) -> None:
+    store = _store()
+    await store.claim(db, owner="a", key="k", request_hash="h")
+    await store.complete(db, owner="a", key="k", response=RESPONSE)
+
+    with pytest.raises(IdempotencyKeyReusedError):
+        await store.claim(db, owner="a", key="k", request_hash="other")
+
+
+@pytest.mark.asyncio
+async def test_duplicate_waits_for_request_in_progress(db_engine: AsyncEngine) -> None:
+    session_factory = async_sessionmaker(bind=db_engine, autobegin=False)
+    store = _store(wait_seconds=5)
+
+    async def complete_later() -> None:
+        async with session_factory() as db:
+            await asyncio.sleep(0.05)
+            await store.complete(db, owner="a", key="k", response=RESPONSE)
+
+    async with session_factory() as db:
+        await store.claim(db, owner="a", key="k", request_hash="h")
+        replayed, _ = await asyncio.gather(
+            store.claim(db, owner="a", key="k", request_hash="h"), complete_later()
+        )
+
+    assert replayed == RESPONSE
+
+
+@pytest.mark.asyncio
+async def test_duplicate_of_a_stuck_request_conflicts(db: AsyncSession) -> None:
+    store = _store()
+    await store.claim(db, owner="a", key="k", request_hash="h")
+
+    with pytest.raises(IdempotencyKeyInProgressError):
+        await store.claim(db, owner="a", key="k", request_hash="h")
+
+
+@pytest.mark.asyncio
+async def test_released_and_timed_out_claims_are_claimed_again(
+    db: AsyncSession,
+) -> None:
+    store = _store()
+    await store.claim(db, owner="a", key="released", request_hash="h")
+    await store.release(db, owner="a", key="released")
+    await store.claim(db, owner="a", key="timed_out", request_hash="h")
+
+    assert await store.claim(db, owner="a", key="released", request_hash="h") is None
+    assert (
+        await _store(claim_timeout_seconds=-1).claim(
+            db, owner="a", key="timed_out", request_hash="h"
+        )
+        is None
+    )
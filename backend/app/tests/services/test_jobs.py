@@ -0,0 +1,130 @@
+from typing import Any
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.models import Job
+from app.services.jobs import JobHandler, JobWorker, enqueue_job
+from app.tests.utils import create_random_tenant
+
+
+def _worker(
+    session_factory: async_sessionmaker[AsyncSession],
+    handlers: dict[str, JobHandler] | None = None,
+    **kwargs: Any,
+) -> JobWorker:
+    options: dict[str, Any] = {
+        "concurrency": 10,
+        "tenant_concurrency": 2,
+        "poll_interval_seconds": 0.01,
+        "retry_attempts": 1,
+        "retry_wait_seconds": 0,
+        "lock_timeout_seconds": 60,
+    }
+    options.update(kwargs)
+    return JobWorker(
+        handlers=handlers or {}, session_factory=session_factory, **options
+    )
+
+
+async def _get_job(session_factory: async_sessionmaker[AsyncSession], job_id) -> Job:
+    async with session_factory() as db:
+        async with db.begin():
+            return (await db.execute(select(Job).where(Job.id == job_id))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_claim_orders_by_priority(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as db:
+        low_id = await enqueue_job(db, kind="noop", payload={}, priority=0)
+        high_id = await enqueue_job(db, kind="noop", payload={}, priority=10)
+
+    worker = _worker(session_factory)
+    claimed = await worker.claim(1)
+
+    assert [job.id for job in claimed] == [high_id]
+    assert (await _get_job(session_factory, high_id)).status == "running"
+    assert (await _get_job(session_factory, low_id)).status == "queued"
+
+
+@pytest.mark.asyncio
+async def test_claim_respects_tenant_concurrency(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as db:
+        busy_tenant = await create_random_tenant(db)
+        other_tenant = await create_random_tenant(db)
+        for _ in range(3):
+            await enqueue_job(db, kind="noop", payload={}, tenant_id=busy_tenant.id)
+        other_id = await enqueue_job(
+            db, kind="noop", payload={}, tenant_id=other_tenant.id
+        )
+
+    worker = _worker(session_factory, tenant_concurrency=2)
+    first_claim = await worker.claim(10)
+    second_claim = await worker.claim(10)
+
+    tenant_ids = [job.tenant_id for job in first_claim]
+    assert tenant_ids.count(busy_tenant.id) == 2
+    assert other_id in {job.id for job in first_claim}
+    assert second_claim == []
+
+
+@pytest.mark.asyncio
+async def test_execute_retries_then_succeeds(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    calls: list[dict[str, Any]] = []
+
+    async def flaky(db: AsyncSession, payload: dict[str, Any]) -> None:  # noqa: ARG001
+        calls.append(payload)
+        if len(calls) < 2:
+            raise RuntimeError("temporary")
+
+    async with session_factory() as db:
+        job_id = await enqueue_job(db, kind="flaky", payload={"n": 1})
+
+    worker = _worker(session_factory, {"flaky": flaky}, retry_attempts=2)
+    [job] = await worker.claim(1)
+    await worker.execute(job)
+
+    assert calls == [{"n": 1}, {"n": 1}]
+    assert (await _get_job(session_factory, job_id)).status == "succeeded"
+
+
+@pytest.mark.asyncio
+async def test_failing_job_is_requeued_then_failed(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async def failing(db: AsyncSession, payload: dict[str, Any]) -> None:  # noqa: ARG001
+        raise RuntimeError("permanent")
+
+    async with session_factory() as db:
+        job_id = await enqueue_job(db, kind="failing", payload={})
+    async with session_factory() as db:
+        async with db.begin():
+            job = await db.get(Job, job_id)
+            job.max_attempts = 2
+
+    worker = _worker(session_factory, {"failing": failing})
+    [claimed] = await worker.claim(1)
+    await worker.execute(claimed)
+
+    job = await _get_job(session_factory, job_id)
+    assert job.status == "queued"
+    assert job.last_error == "permanent"
+
+    # Skip the backoff delay
+    async with session_factory() as db:
+        async with db.begin():
+            job = await db.get(Job, job_id)
+            job.run_after = job.created_at
+    [claimed] = await worker.claim(1)
+    await worker.execute(claimed)
+
+    job = await _get_job(session_factory, job_id)
+    assert job.status == "failed"
+    assert job.attempts == 2
@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.main import app
+from app.services import loop_lag
+from app.services.loop_lag import LagHistogram, LoopLagMonitor
+
+
+class RecordingLogger:
+    def __init__(self) -> None:
+        self.warnings: list[str] = []
+
+    def warning(self, message: str) -> None:
+        self.warnings.append(message)
+
+
+def _monitor(*, debug: bool = False) -> LoopLagMonitor:
+    return LoopLagMonitor(
+        interval_seconds=0.01,
+        buckets_ms=[10, 100, 1000],
+        window_seconds=60,
+        debug=debug,
+        slow_callback_ms=50,
+        stack_dump_threshold_ms=100,
+    )
+
+
+def block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = LagHistogram([100, 10])
+
+    for lag_ms in (1, 10, 50, 5000):
+        histogram.observe(lag_ms)
+
+    snapshot = histogram.snapshot()
+    assert snapshot.buckets == {"10": 2, "100": 3, "+Inf": 4}
+    assert snapshot.count == 4
+    assert snapshot.sum_ms == 5061
+    assert snapshot.max_ms == 5000
+
+
+@pytest.mark.asyncio
+async def test_monitor_records_blocked_loop() -> None:
+    monitor = _monitor()
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+
+    block_loop(0.2)
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    snapshot = monitor.histogram.snapshot()
+    assert snapshot.count > 1
+    assert snapshot.max_ms >= 100
+    assert snapshot.buckets["100"] < snapshot.buckets["+Inf"]
+
+
+@pytest.mark.asyncio
+async def test_debug_monitor_dumps_stack_of_blocked_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recording_logger = RecordingLogger()
+    monkeypatch.setattr(loop_lag, "logger", recording_logger)
+    loop = asyncio.get_running_loop()
+    monitor = _monitor(debug=True)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+
+    try:
+        asyncio.current_task().set_name("GET /slow")  # type: ignore[union-attr]
+        block_loop(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        loop.set_debug(False)
+
+    assert recording_logger.warnings
+    assert "in task GET /slow" in recording_logger.warnings[0]
+    assert "block_loop" in recording_logger.warnings[0]
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_route_needs_token() -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get(f"{settings.API_V1_STR}/utils/loop-lag")
+
+    assert response.status_code == 401
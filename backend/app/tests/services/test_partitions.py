@@ -0,0 +1,107 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.services.partitions import MonthlyPartitionManager, add_months
+from app.tests.utils import create_random_chat_log
+
+
+def _manager(
+    session_factory: async_sessionmaker[AsyncSession], retention_months: int | None
+) -> MonthlyPartitionManager:
+    return MonthlyPartitionManager(
+        table_name="chat_logs",
+        session_factory=session_factory,
+        months_ahead=2,
+        retention_months=retention_months,
+    )
+
+
+def test_add_months() -> None:
+    assert add_months(date(2026, 11, 1), 1) == date(2026, 12, 1)
+    assert add_months(date(2026, 12, 1), 1) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_is_idempotent(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    manager = _manager(session_factory, retention_months=None)
+
+    created = await manager.create_partitions(today=date(2026, 11, 17))
+    created_again = await manager.create_partitions(today=date(2026, 11, 17))
+
+    assert created == [
+        "chat_logs_y2026m11",
+        "chat_logs_y2026m12",
+        "chat_logs_y2027m01",
+    ]
+    assert created_again == []
+
+
+@pytest.mark.asyncio
+async def test_rows_are_routed_to_their_month(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    today = datetime.now(timezone.utc).date()
+    await _manager(session_factory, retention_months=None).create_partitions(today)
+
+    async with session_factory() as db:
+        chat_log = await create_random_chat_log(db)
+        async with db.begin():
+            result = await db.execute(
+                text("SELECT tableoid::regclass::text FROM chat_logs WHERE id = :id"),
+                {"id": chat_log.id},
+            )
+
+    assert result.scalar_one() == f"chat_logs_y{today.year:04d}m{today.month:02d}"
+
+
+@pytest.mark.asyncio
+async def test_drop_expired_partitions(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    manager = _manager(session_factory, retention_months=1)
+    await manager.create_partitions(today=date(2026, 8, 1))
+
+    dropped = await manager.drop_expired_partitions(today=date(2026, 10, 5))
+
+    async with session_factory() as db:
+        async with db.begin():
+            remaining = await manager.get_partitions(db)
+    assert dropped == ["chat_logs_y2026m08"]
+    assert sorted(remaining) == [date(2026, 9, 1), date(2026, 10, 1)]
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_moves_rows_of_default_partition(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as db:
+        chat_log = await create_random_chat_log(db)
+        async with db.begin():
+            # A month without a partition yet, the row lands in the default one
+            await db.execute(
+                text("UPDATE chat_logs SET created_at = :created_at WHERE id = :id"),
+                {
+                    "created_at": datetime(2030, 3, 10, tzinfo=timezone.utc),
+                    "id": chat_log.id,
+                },
+            )
+
+    created = await _manager(session_factory, retention_months=None).create_partitions(
+        today=date(2030, 3, 20)
+    )
+
+    async with session_factory() as db:
+        async with db.begin():
+            result = await db.execute(
+                text("SELECT tableoid::regclass::text FROM chat_logs WHERE id = :id"),
+                {"id": chat_log.id},
+            )
+            partition = result.scalar_one()
+    assert created[0] == "chat_logs_y2030m03"
+    assert partition == "chat_logs_y2030m03"
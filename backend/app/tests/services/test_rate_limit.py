@@ -0,0 +1,119 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.models import Tenant
+from app.services.rate_limit import (
+    BucketState,
+    LocalBucketStore,
+    PostgresBucketStore,
+    RateLimit,
+    RateLimiter,
+)
+from app.tests.utils import create_random_tenant
+
+# Refills too slowly to matter within a test
+SLOW = 0.001
+
+
+def _limiter(store: LocalBucketStore | PostgresBucketStore) -> RateLimiter:
+    return RateLimiter(
+        store=store,
+        route_limits={
+            "get_all_*": {"user": RateLimit(2, SLOW), "tenant": RateLimit(3, SLOW)},
+            "*": {"user": RateLimit(100, SLOW)},
+        },
+        tenant_settings_ttl_seconds=60,
+        tenant_settings_cache_size=10,
+    )
+
+
+def test_bucket_state_headers() -> None:
+    limit = RateLimit(10, 2)
+
+    assert BucketState(allowed=True, limit=limit, tokens=6.5).headers() == {
+        "RateLimit-Limit": "10",
+        "RateLimit-Remaining": "6",
+        "RateLimit-Reset": "2",
+    }
+    assert BucketState(allowed=False, limit=limit, tokens=0.2).headers() == {
+        "RateLimit-Limit": "10",
+        "RateLimit-Remaining": "0",
+        "RateLimit-Reset": "5",
+        "Retry-After": "1",
+    }
+
+
+@pytest.mark.asyncio
+async def test_local_bucket_store() -> None:
+    store = LocalBucketStore(maxsize=10)
+    limit = RateLimit(2, SLOW)
+
+    states = [await store.take("a", limit) for _ in range(3)]
+
+    assert [state.allowed for state in states] == [True, True, False]
+    assert (await store.take("b", limit)).allowed
+    # Refilled
+    assert (await store.take("a", RateLimit(2, 1_000_000))).allowed
+
+
+@pytest.mark.asyncio
+async def test_user_and_route_limits() -> None:
+    limiter = _limiter(LocalBucketStore(maxsize=10))
+
+    async def allowed(route_name: str, user_id: str) -> bool:
+        state = await limiter.take(
+            None,  # type: ignore[arg-type]
+            route_name=route_name,
+            entra_tenant_id=None,
+            user_id=user_id,
+        )
+        return state is not None and state.allowed
+
+    assert [await allowed("get_all_tenants", "a") for _ in range(3)] == [
+        True,
+        True,
+        False,
+    ]
+    # Buckets of other users and routes are separate
+    assert await allowed("get_all_tenants", "b")
+    assert await allowed("get_tenant", "a")
+
+
+@pytest.mark.asyncio
+async def test_tenant_settings_override_limits(db: AsyncSession) -> None:
+    tenant = await create_random_tenant(db)
+    async with db.begin():
+        await db.execute(
+            update(Tenant)
+            .where(Tenant.id == tenant.id)
+            .values(settings={"rate_limits": {"get_all_*": {"tenant": [1, SLOW]}}})
+        )
+    limiter = _limiter(LocalBucketStore(maxsize=10))
+
+    states = [
+        await limiter.take(
+            db,
+            route_name="get_all_users",
+            entra_tenant_id=tenant.entra_tenant_id,
+            user_id=user_id,
+        )
+        for user_id in ("a", "b")
+    ]
+
+    # Shared by the tenant's users, and no user limit since the override has none
+    assert [state.allowed for state in states if state is not None] == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_postgres_bucket_store(db_engine: AsyncEngine) -> None:
+    store = PostgresBucketStore(
+        session_factory=async_sessionmaker(bind=db_engine, autobegin=False)
+    )
+    limit = RateLimit(2, SLOW)
+
+    states = [await store.take("a", limit) for _ in range(3)]
+
+    assert [state.allowed for state in states] == [True, True, False]
+    assert states[1].tokens == pytest.approx(0, abs=0.01)
+    assert (await store.take("b", limit)).allowed
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_readiness_probe
+from app.main import app
+from app.services.loop_lag import LoopLagMonitor
+from app.services.readiness import ReadinessProbe
+from app.services.warmup import WarmUp
+
+
+class FakePool:
+    def status(self) -> str:
+        return "Pool size: 1"
+
+
+class FakeConnection:
+    async def execute(self, statement: Any) -> None:
+        pass
+
+
+class FakeEngine:
+    def __init__(self, checkout_seconds: float = 0) -> None:
+        self.checkout_seconds = checkout_seconds
+        self.pool = FakePool()
+
+    @asynccontextmanager
+    async def connect(self) -> AsyncIterator[FakeConnection]:
+        await asyncio.sleep(self.checkout_seconds)
+        yield FakeConnection()
+
+
+class FakeQdrantClient:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.down = False
+
+    async def get_collections(self) -> None:
+        self.calls += 1
+        if self.down:
+            raise ConnectionRefusedError("qdrant is down")
+
+
+def _monitor() -> LoopLagMonitor:
+    return LoopLagMonitor(
+        interval_seconds=0.01,
+        buckets_ms=[10, 100],
+        window_seconds=60,
+        debug=False,
+        slow_callback_ms=100,
+        stack_dump_threshold_ms=500,
+    )
+
+
+def _probe(
+    *,
+    engine: FakeEngine | None = None,
+    qdrant: FakeQdrantClient | None = None,
+    monitor: LoopLagMonitor | None = None,
+    **kwargs: Any,
+) -> ReadinessProbe:
+    warm_up = WarmUp(engine=engine, cruds=[], pool_connections=0)  # type: ignore[arg-type]
+    warm_up.finished = True
+    options = {
+        "cache_ttl_seconds": 60,
+        "max_pool_wait_ms": 50,
+        "max_loop_lag_ms": 1000,
+        "timeout_seconds": 1,
+    }
+    options.update(kwargs)
+    qdrant = qdrant or FakeQdrantClient()
+    return ReadinessProbe(
+        engine=engine or FakeEngine(),  # type: ignore[arg-type]
+        qdrant_client=lambda: qdrant,  # type: ignore[arg-type, return-value]
+        warm_up=warm_up,
+        loop_lag_monitor=monitor or _monitor(),
+        **options,
+    )
+
+
+@pytest.mark.asyncio
+async def test_ready_route_reports_checks() -> None:
+    probe = _probe()
+    app.dependency_overrides[get_readiness_probe] = lambda: probe
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            ready = await client.get("/api/v1/utils/ready")
+            probe.warm_up.finished = False
+            probe.cache_ttl_seconds = 0
+            not_ready = await client.get("/api/v1/utils/ready")
+    finally:
+        app.dependency_overrides.pop(get_readiness_probe)
+
+    assert ready.status_code == 200
+    assert ready.json()["ready"]
+    assert set(ready.json()["checks"]) == {"warm_up", "postgres", "qdrant", "loop_lag"}
+    assert not_ready.status_code == 503
+    assert not not_ready.json()["checks"]["warm_up"]["ok"]
+
+
+@pytest.mark.asyncio
+async def test_checks_are_cached() -> None:
+    qdrant = FakeQdrantClient()
+    probe = _probe(qdrant=qdrant)
+
+    await asyncio.gather(*(probe.check() for _ in range(5)))
+    qdrant.down = True
+    readiness = await probe.check()
+
+    assert qdrant.calls == 1
+    assert readiness.ready
+
+
+@pytest.mark.asyncio
+async def test_unreachable_qdrant_is_not_ready() -> None:
+    qdrant = FakeQdrantClient()
+    qdrant.down = True
+
+    readiness = await _probe(qdrant=qdrant).check()
+
+    assert not readiness.ready
+    # The error is logged, not exposed on the public route
+    assert readiness.checks["qdrant"].detail == "Unavailable"
+
+
+@pytest.mark.asyncio
+async def test_long_pool_wait_is_not_ready() -> None:
+    readiness = await _probe(engine=FakeEngine(checkout_seconds=0.1)).check()
+
+    assert not readiness.ready
+    assert readiness.checks["postgres"].latency_ms >= 50  # type: ignore[operator]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_check_is_not_ready() -> None:
+    readiness = await _probe(
+        engine=FakeEngine(checkout_seconds=1), timeout_seconds=0.05
+    ).check()
+
+    assert readiness.checks["postgres"].detail == "Timed out"
+    assert not readiness.ready
+
+
+@pytest.mark.asyncio
+async def test_recent_loop_lag_is_not_ready() -> None:
+    monitor = _monitor()
+    monitor_task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    try:
+        ready = await _probe(monitor=monitor, max_loop_lag_ms=100).check()
+        # Blocks the loop, the probe runs only after the block is over
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+        not_ready = await _probe(monitor=monitor, max_loop_lag_ms=100).check()
+    finally:
+        monitor_task.cancel()
+        await asyncio.gather(monitor_task, return_exceptions=True)
+
+    assert ready.ready
+    assert not not_ready.ready
+    assert not_ready.checks["loop_lag"].latency_ms >= 100  # type: ignore[operator]
@@ -0,0 +1,33 @@
+from uuid import uuid4
+
+import pytest
+
+from app.services.embeddings import HashingEmbedder
+from app.services.retrieval import reciprocal_rank_fusion
+
+
+def test_reciprocal_rank_fusion_rewards_agreement() -> None:
+    a, b, c, d = uuid4(), uuid4(), uuid4(), uuid4()
+
+    fused = reciprocal_rank_fusion([[a, b, c], [b, d, a]], k=60)
+
+    assert [obj_id for obj_id, _ in fused] == [b, a, d, c]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+
+def test_reciprocal_rank_fusion_empty() -> None:
+    assert reciprocal_rank_fusion([[], []], k=60) == []
+
+
+@pytest.mark.asyncio
+async def test_hashing_embedder_is_normalized_and_deterministic() -> None:
+    embedder = HashingEmbedder(dimension=64)
+
+    first, second, empty = await embedder.embed(
+        ["Election results", "election RESULTS", ""]
+    )
+
+    assert len(first) == 64
+    assert first == second
+    assert sum(value * value for value in first) == pytest.approx(1.0)
+    assert not any(empty)
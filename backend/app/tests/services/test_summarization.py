@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from app.services.summarization import (
+    LocalSummarizationProvider,
+    Summarizer,
+    chunk_text,
+)
+
+
+class CountingProvider(LocalSummarizationProvider):
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def summarize(self, text: str, *, max_words: int) -> str:
+        self.calls.append(text)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.001)
+        self.running -= 1
+        return await super().summarize(text, max_words=max_words)
+
+
+def _paragraphs(n: int, *, prefix: str = "p") -> list[str]:
+    return [
+        f"{prefix}{i} " + " ".join(f"word{i}x{j}" for j in range(30)) + "."
+        for i in range(n)
+    ]
+
+
+def _summarizer(provider: CountingProvider, **kwargs) -> Summarizer:
+    options = {"chunk_size": 1000, "fan_out": 2, "max_words": 10, "lru_size": 100}
+    options.update(kwargs)
+    return Summarizer(provider=provider, session_factory=None, **options)
+
+
+def test_chunk_text_respects_chunk_size() -> None:
+    text = "\n\n".join(_paragraphs(40))
+
+    chunks = chunk_text(text, chunk_size=1000)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
+
+
+def test_chunk_text_splits_long_paragraphs() -> None:
+    text = "a" * 2500
+
+    assert chunk_text(text, chunk_size=1000) == ["a" * 1000, "a" * 1000, "a" * 500]
+
+
+def test_chunk_text_edit_keeps_later_chunks() -> None:
+    paragraphs = _paragraphs(60)
+    original = chunk_text("\n\n".join(paragraphs), chunk_size=1000)
+
+    paragraphs[0] = paragraphs[0] + " An edited sentence."
+    edited = chunk_text("\n\n".join(paragraphs), chunk_size=1000)
+
+    assert edited[0] != original[0]
+    assert edited[-3:] == original[-3:]
+
+
+@pytest.mark.asyncio
+async def test_summarize_map_reduce_with_bounded_fan_out() -> None:
+    provider = CountingProvider()
+    summarizer = _summarizer(provider)
+
+    result = await summarizer.summarize("\n\n".join(_paragraphs(40)))
+
+    assert result.chunks > 2
+    assert result.cached_chunks == 0
+    assert len(result.summary.split()) <= 10
+    # One call per chunk plus at least one reduce call
+    assert len(provider.calls) > result.chunks
+    assert provider.max_running <= 2
+
+
+@pytest.mark.asyncio
+async def test_resummarize_edited_text_only_redoes_changed_chunks() -> None:
+    provider = CountingProvider()
+    summarizer = _summarizer(provider)
+    paragraphs = _paragraphs(60)
+
+    first = await summarizer.summarize("\n\n".join(paragraphs))
+    paragraphs[-1] = paragraphs[-1] + " An edited sentence."
+    provider.calls.clear()
+    second = await summarizer.summarize("\n\n".join(paragraphs))
+
+    assert second.chunks == first.chunks
+    assert second.cached_chunks == first.chunks - 1
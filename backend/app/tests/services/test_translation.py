@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from app.services.cache import LRUCache
+from app.services.translation import LocalTranslationProvider, TranslationBatcher
+
+
+class CountingProvider(LocalTranslationProvider):
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def translate(
+        self, segments: list[str], *, source_language: str, target_language: str
+    ) -> list[str]:
+        self.calls.append(segments)
+        await asyncio.sleep(0)
+        return await super().translate(
+            segments, source_language=source_language, target_language=target_language
+        )
+
+
+def _batcher(provider: CountingProvider, **kwargs) -> TranslationBatcher:
+    options = {
+        "max_batch_size": 64,
+        "max_batch_chars": 10_000,
+        "max_wait_ms": 5,
+        "lru_size": 100,
+    }
+    options.update(kwargs)
+    return TranslationBatcher(provider=provider, session_factory=None, **options)
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_provider_call() -> None:
+    provider = CountingProvider()
+    batcher = _batcher(provider)
+
+    results = await asyncio.gather(
+        batcher.translate(
+            ["hello", "world"], source_language="en", target_language="no"
+        ),
+        batcher.translate(
+            ["hello", "again"], source_language="en", target_language="no"
+        ),
+    )
+
+    assert results == [
+        ["[no] hello", "[no] world"],
+        ["[no] hello", "[no] again"],
+    ]
+    # Identical segments in flight are only translated once
+    assert provider.calls == [["hello", "world", "again"]]
+
+
+@pytest.mark.asyncio
+async def test_cached_segments_skip_provider() -> None:
+    provider = CountingProvider()
+    batcher = _batcher(provider)
+
+    await batcher.translate(["hello"], source_language="en", target_language="no")
+    await batcher.translate(["hello"], source_language="en", target_language="no")
+    await batcher.translate(["hello"], source_language="en", target_language="de")
+
+    assert provider.calls == [["hello"], ["hello"]]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_bounded() -> None:
+    provider = CountingProvider()
+    batcher = _batcher(provider, max_batch_size=2, max_batch_chars=8)
+
+    segments = ["aaaa", "bbbb", "cccc", "dddddddddd"]
+    result = await batcher.translate(
+        segments, source_language="en", target_language="no"
+    )
+
+    assert result == [f"[no] {segment}" for segment in segments]
+    assert provider.calls == [["aaaa", "bbbb"], ["cccc"], ["dddddddddd"]]
+
+
+@pytest.mark.asyncio
+async def test_provider_failure_is_raised_and_not_cached() -> None:
+    class FailingProvider(CountingProvider):
+        async def translate(self, segments, **kwargs) -> list[str]:  # noqa: ARG002
+            raise RuntimeError("provider down")
+
+    batcher = _batcher(FailingProvider())
+
+    with pytest.raises(RuntimeError):
+        await batcher.translate(["hello"], source_language="en", target_language="no")
+
+    assert len(batcher.lru) == 0
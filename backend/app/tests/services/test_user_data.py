@@ -0,0 +1,109 @@
+import gzip
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.models import ChatLog, ChatSession, User
+from app.services.user_data import UserDataManager
+from app.tests.utils import (
+    create_random_chat_log,
+    create_random_chat_session,
+    create_random_tenant,
+    create_random_user,
+)
+
+
+class RecordingPointStore:
+    def __init__(self) -> None:
+        self.deleted: list[dict[str, str]] = []
+
+    async def delete_where(self, **match: str) -> None:
+        self.deleted.append(match)
+
+
+def _manager(
+    session_factory: async_sessionmaker[AsyncSession], points: RecordingPointStore
+) -> UserDataManager:
+    return UserDataManager(
+        session_factory=session_factory,
+        chat_log_points=points,
+        export_batch_size=1,
+        export_gzip_level=6,
+        erase_chunk_size=1,
+        erase_pause_seconds=0,
+    )
+
+
+async def _user_with_chat_logs(db: AsyncSession) -> tuple[User, list[ChatSession]]:
+    deps = {
+        "tenant": await create_random_tenant(db),
+        "user": await create_random_user(db),
+    }
+    chat_sessions = [await create_random_chat_session(db, deps) for _ in range(2)]
+    for chat_session in chat_sessions:
+        for _ in range(2):
+            await create_random_chat_log(db, {"chat_session": chat_session})
+    return deps["user"], chat_sessions
+
+
+@pytest.mark.asyncio
+async def test_export_streams_all_user_data(
+    db: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    user, chat_sessions = await _user_with_chat_logs(db)
+    other_user, _ = await _user_with_chat_logs(db)
+
+    manager = _manager(session_factory, RecordingPointStore())
+    chunks = [chunk async for chunk in manager.export(user.id)]
+
+    lines = [
+        json.loads(line) for line in gzip.decompress(b"".join(chunks)).splitlines()
+    ]
+    tables = [line["table"] for line in lines]
+    assert tables == ["users"] + ["chat_sessions"] * 2 + ["chat_logs"] * 4
+    assert lines[0]["data"]["id"] == str(user.id)
+    assert {line["data"]["chat_session_id"] for line in lines[3:]} == {
+        str(chat_session.id) for chat_session in chat_sessions
+    }
+    assert str(other_user.id) not in {line["data"].get("user_id") for line in lines}
+
+
+@pytest.mark.asyncio
+async def test_erase_deletes_user_data_in_chunks(
+    db: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    user, chat_sessions = await _user_with_chat_logs(db)
+    other_user, _ = await _user_with_chat_logs(db)
+    points = RecordingPointStore()
+
+    async with session_factory() as session:
+        await _manager(session_factory, points).erase(
+            session, {"user_id": str(user.id)}
+        )
+
+    async with db.begin():
+        users = (await db.execute(select(User.id))).scalars().all()
+        chat_log_count = (
+            await db.execute(
+                select(func.count())
+                .select_from(ChatLog)
+                .join(ChatSession, ChatSession.id == ChatLog.chat_session_id)
+                .where(ChatSession.user_id == user.id)
+            )
+        ).scalar_one()
+        chat_session_count = (
+            await db.execute(
+                select(func.count())
+                .select_from(ChatSession)
+                .where(ChatSession.user_id == user.id)
+            )
+        ).scalar_one()
+
+    assert user.id not in users
+    assert other_user.id in users
+    assert chat_log_count == chat_session_count == 0
+    assert sorted(match["chat_session_id"] for match in points.deleted) == sorted(
+        str(chat_session.id) for chat_session in chat_sessions
+    )
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.crud import CRUD_chat_logs, CRUD_tenants
+from app.services.warmup import WarmUp
+
+
+class UnreachableEngine:
+    def connect(self) -> None:
+        raise ConnectionRefusedError("database is down")
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_finishes() -> None:
+    warm_up = WarmUp(engine=UnreachableEngine(), cruds=[], pool_connections=2)  # type: ignore[arg-type]
+
+    # The process then serves cold rather than never getting ready
+    await warm_up.run()
+
+    assert warm_up.finished
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_pool_connections(test_database: AsyncEngine) -> None:
+    engine = create_async_engine(test_database.url, pool_size=2)
+    warm_up = WarmUp(
+        engine=engine, cruds=[CRUD_tenants, CRUD_chat_logs], pool_connections=2
+    )
+    built = []
+
+    try:
+        await warm_up.run(build_openapi=lambda: built.append(True))
+        checked_in = engine.pool.checkedin()  # type: ignore[attr-defined]
+    finally:
+        await engine.dispose()
+
+    assert warm_up.finished
+    assert built == [True]
+    assert checked_in == 2
@@ -0,0 +1,121 @@
+import zlib
+
+import pytest
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.types import ASGIApp, Message
+
+from app.compression import CompressionMiddleware, select_encoding
+
+
+def _middleware(app: ASGIApp) -> CompressionMiddleware:
+    return CompressionMiddleware(
+        app,
+        minimum_size=100,
+        encodings=["zstd", "br", "gzip"],
+        gzip_level=6,
+        brotli_level=4,
+        zstd_level=3,
+    )
+
+
+async def _call(
+    app: ASGIApp, *, accept_encoding: str = "gzip"
+) -> tuple[dict[str, str], list[bytes]]:
+    scope = {
+        "type": "http",
+        # Streaming responses then don't wait on receive() for a disconnect
+        "asgi": {"spec_version": "2.4"},
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    headers = {
+        key.decode().lower(): value.decode() for key, value in messages[0]["headers"]
+    }
+    return headers, [message.get("body", b"") for message in messages[1:]]
+
+
+def test_select_encoding() -> None:
+    preference = ["zstd", "br", "gzip"]
+
+    assert select_encoding("gzip, br", preference) == "br"
+    assert select_encoding("gzip;q=1.0, br;q=0", preference) == "gzip"
+    assert select_encoding("GZIP", preference) == "gzip"
+    assert select_encoding("identity", preference) is None
+    assert select_encoding("", preference) is None
+
+
+@pytest.mark.asyncio
+async def test_compresses_large_body() -> None:
+    body = "chat log " * 100
+    app = _middleware(PlainTextResponse(body))
+
+    headers, chunks = await _call(app)
+
+    assert headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in headers["vary"]
+    compressed = b"".join(chunks)
+    assert int(headers["content-length"]) == len(compressed)
+    assert zlib.decompress(compressed, wbits=31).decode() == body
+
+
+@pytest.mark.asyncio
+async def test_small_body_not_compressed() -> None:
+    app = _middleware(PlainTextResponse("ok"))
+
+    headers, chunks = await _call(app)
+
+    assert "content-encoding" not in headers
+    assert b"".join(chunks) == b"ok"
+
+
+@pytest.mark.asyncio
+async def test_no_accepted_encoding() -> None:
+    app = _middleware(PlainTextResponse("chat log " * 100))
+
+    headers, _ = await _call(app, accept_encoding="identity")
+
+    assert "content-encoding" not in headers
+
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_decodable_on_arrival() -> None:
+    lines = [f'{{"index": {index}}}\n' for index in range(5)]
+
+    async def stream():
+        for line in lines:
+            yield line
+
+    app = _middleware(StreamingResponse(stream(), media_type="application/x-ndjson"))
+
+    headers, chunks = await _call(app)
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    decompressor = zlib.decompressobj(wbits=31)
+    decoded = [decompressor.decompress(chunk).decode() for chunk in chunks]
+    # Every line can be read as soon as its chunk arrives, before the stream ends
+    assert decoded[: len(lines)] == lines
+    assert decompressor.eof
+
+
+@pytest.mark.asyncio
+async def test_event_stream_not_compressed() -> None:
+    async def stream():
+        yield "data: token\n\n"
+
+    app = _middleware(StreamingResponse(stream(), media_type="text/event-stream"))
+
+    headers, chunks = await _call(app)
+
+    assert "content-encoding" not in headers
+    assert b"".join(chunks) == b"data: token\n\n"
@@ -0,0 +1,150 @@
+import asyncio
+import time
+
+import pytest
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import Message, Receive, Scope, Send
+
+from app.concurrency import (
+    AIMDLimit,
+    ConcurrencyLimitMiddleware,
+    PriorityClass,
+    api_priority_rules,
+)
+from app.main import app as main_app
+
+
+class BlockingApp:
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.started = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.started += 1
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _limit(initial_limit: int = 4) -> AIMDLimit:
+    return AIMDLimit(
+        initial_limit=initial_limit, min_limit=1, max_limit=10, backoff_ratio=0.5
+    )
+
+
+def _middleware(app: BlockingApp, limit: AIMDLimit) -> ConcurrencyLimitMiddleware:
+    return ConcurrencyLimitMiddleware(
+        app,
+        limit=limit,
+        priority_classes=[
+            PriorityClass("interactive", 1.0, 1000),
+            PriorityClass("heavy", 0.5, 1000),
+            PriorityClass("external", 0.5, None),
+        ],
+        rules=api_priority_rules("/api/v1"),
+        default_priority="interactive",
+        retry_after_seconds=3,
+    )
+
+
+async def _call(
+    app: ConcurrencyLimitMiddleware, method: str, path: str
+) -> tuple[int, dict[str, str]]:
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    headers = {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+    return messages[0]["status"], headers
+
+
+def test_api_priority_rules() -> None:
+    middleware = _middleware(BlockingApp(), _limit())
+
+    def priority(method: str, path: str) -> str | None:
+        priority_class = middleware.classify(method, path)
+        return None if priority_class is None else priority_class.name
+
+    assert priority("GET", "/api/v1/utils/ready") is None
+    assert priority("POST", "/api/v1/summarize/") == "external"
+    assert priority("POST", "/api/v1/translate/") == "external"
+    assert priority("POST", "/api/v1/chat_logs/generate") == "external"
+    assert priority("GET", "/api/v1/tenants/") == "heavy"
+    assert priority("POST", "/api/v1/chat_logs/") == "heavy"
+    assert priority("POST", "/api/v1/users/bulk_update") == "heavy"
+    assert priority("GET", "/api/v1/users/123/chat_sessions") == "heavy"
+    assert priority("GET", "/api/v1/tenants/123") == "interactive"
+    assert priority("GET", "/") == "interactive"
+
+
+@pytest.mark.asyncio
+async def test_sheds_heavy_requests_first() -> None:
+    app = BlockingApp()
+    middleware = _middleware(app, _limit(initial_limit=4))
+
+    in_flight = [
+        asyncio.create_task(_call(middleware, "GET", "/api/v1/tenants/")),
+        asyncio.create_task(_call(middleware, "GET", "/api/v1/tenants/")),
+    ]
+    await asyncio.sleep(0)
+    heavy_status, heavy_headers = await _call(middleware, "GET", "/api/v1/tenants/")
+    in_flight.append(asyncio.create_task(_call(middleware, "GET", "/api/v1/tenants/1")))
+    await asyncio.sleep(0)
+    app.release.set()
+    responses = await asyncio.gather(*in_flight)
+
+    assert (heavy_status, heavy_headers["retry-after"]) == (503, "3")
+    assert [status for status, _ in responses] == [200, 200, 200]
+    assert middleware.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_sheds_above_the_limit() -> None:
+    app = BlockingApp()
+    middleware = _middleware(app, _limit(initial_limit=2))
+
+    in_flight = [
+        asyncio.create_task(_call(middleware, "GET", f"/api/v1/tenants/{i}"))
+        for i in range(2)
+    ]
+    await asyncio.sleep(0)
+    status, _ = await _call(middleware, "GET", "/api/v1/tenants/2")
+    app.release.set()
+    await asyncio.gather(*in_flight)
+
+    assert status == 503
+    assert app.started == 2
+
+
+def test_aimd_limit() -> None:
+    limit = _limit(initial_limit=4)
+
+    # An idle worker doesn't raise the limit
+    limit.on_sample(started_at=0, in_flight=1, late=False)
+    assert limit.limit == 4
+
+    # About one per limit's worth of responses in time
+    for _ in range(5):
+        limit.on_sample(started_at=0, in_flight=4, late=False)
+    assert limit.limit == 5
+
+    limit.on_sample(started_at=time.monotonic(), in_flight=4, late=True)
+    assert limit.limit == 2
+    # Started before the decrease, the same overload
+    limit.on_sample(started_at=0, in_flight=4, late=True)
+    assert limit.limit == 2
+
+
+def test_cors_wraps_concurrency_limit() -> None:
+    # Outermost first, so rejected requests get the CORS headers too
+    middleware_classes = [middleware.cls for middleware in main_app.user_middleware]
+
+    assert middleware_classes.index(CORSMiddleware) < middleware_classes.index(
+        ConcurrencyLimitMiddleware
+    )
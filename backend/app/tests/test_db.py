@@ -1,19 +1,154 @@
+import hashlib
+import os
+
 from pydantic import PostgresDsn
 from pydantic_core import MultiHostUrl
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.core.db import Base
+from app.core.init_db import init_db
 
 # Parameter values from docker-compose.test.yml
-TEST_OLTP_DATABASE_URI: PostgresDsn | None = MultiHostUrl.build(
-    scheme="postgresql+asyncpg",
-    username="postgres",
-    password="test",
-    host="test-db",
-    port=5432,
-    path="test-media-market-oltp-db",
-)
-
-test_engine = create_async_engine(
-    str(TEST_OLTP_DATABASE_URI),
-    poolclass=NullPool,
-)
+TEST_OLTP_DATABASE_NAME = "test-media-market-oltp-db"
+
+
+def database_uri(database: str) -> PostgresDsn:
+    return MultiHostUrl.build(
+        scheme="postgresql+asyncpg",
+        username="postgres",
+        password="test",
+        host="test-db",
+        port=5432,
+        path=database,
+    )
+
+
+# Cloned into one database per xdist worker
+TEMPLATE_DATABASE_NAME = f"{TEST_OLTP_DATABASE_NAME}-template"
+
+
+def create_test_engine(database: str, **kwargs) -> AsyncEngine:
+    return create_async_engine(
+        str(database_uri(database)), poolclass=NullPool, **kwargs
+    )
+
+
+def schema_fingerprint() -> str:
+    """Changes with the DDL of the models, outdating the template database."""
+    dialect = postgresql.dialect()
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl.extend(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in sorted(table.indexes, key=lambda index: index.name or "")
+        )
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()
+
+
+async def _build_template(maintenance: AsyncEngine, fingerprint: str) -> None:
+    async with maintenance.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE IF EXISTS "{TEMPLATE_DATABASE_NAME}"'))
+        await conn.execute(text(f'CREATE DATABASE "{TEMPLATE_DATABASE_NAME}"'))
+
+    template_engine = create_test_engine(TEMPLATE_DATABASE_NAME)
+    async with template_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(template_engine) as db:
+        await init_db(db)
+    await template_engine.dispose()
+
+    async with maintenance.connect() as conn:
+        await conn.execute(
+            text(f"COMMENT ON DATABASE \"{TEMPLATE_DATABASE_NAME}\" IS '{fingerprint}'")
+        )
+
+
+async def create_worker_database() -> str:
+    """
+    Creates the database of this test process, ``PYTEST_XDIST_WORKER`` under
+    pytest-xdist, as a copy of the template database.
+
+    The template is built with ``create_all`` and ``init_db`` the first time, and
+    rebuilt when the models' DDL changes. Copying it is a file level copy, far
+    cheaper than running the DDL. Returns the database's name.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    database = f"{TEST_OLTP_DATABASE_NAME}-{worker}"
+    fingerprint = schema_fingerprint()
+
+    maintenance = create_test_engine("postgres", isolation_level="AUTOCOMMIT")
+    async with maintenance.connect() as conn:
+        # Workers wait while one of them builds the template
+        await conn.execute(
+            text("SELECT pg_advisory_lock(hashtext(:key))"),
+            {"key": TEMPLATE_DATABASE_NAME},
+        )
+        try:
+            current = (
+                await conn.execute(
+                    text(
+                        "SELECT shobj_description(oid, 'pg_database') FROM pg_database"
+                        " WHERE datname = :name"
+                    ),
+                    {"name": TEMPLATE_DATABASE_NAME},
+                )
+            ).scalar_one_or_none()
+            if current != fingerprint:
+                await _build_template(maintenance, fingerprint)
+
+            await conn.execute(text(f'DROP DATABASE IF EXISTS "{database}"'))
+            await conn.execute(
+                text(
+                    f'CREATE DATABASE "{database}" TEMPLATE "{TEMPLATE_DATABASE_NAME}"'
+                )
+            )
+        finally:
+            await conn.execute(
+                text("SELECT pg_advisory_unlock(hashtext(:key))"),
+                {"key": TEMPLATE_DATABASE_NAME},
+            )
+    await maintenance.dispose()
+
+    return database
+
+
+async def drop_database(database: str) -> None:
+    maintenance = create_test_engine("postgres", isolation_level="AUTOCOMMIT")
+    async with maintenance.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE IF EXISTS "{database}"'))
+    await maintenance.dispose()
+
+
+async def reset_database(engine: AsyncEngine) -> None:
+    """
+    Empties all tables and drops the partitions tests created, then runs
+    ``init_db``, back to the state of the template database.
+    """
+    async with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not table.dialect_kwargs.get("postgresql_partition_by"):
+                continue
+            partitions = await conn.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits"
+                    " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                    " WHERE pg_inherits.inhparent = CAST(:table_name AS regclass)"
+                ),
+                {"table_name": table.name},
+            )
+            for partition in partitions.scalars().all():
+                if partition != f"{table.name}_default":
+                    await conn.execute(text(f'DROP TABLE "{partition}"'))
+
+        table_names = ", ".join(
+            f'"{table.name}"' for table in Base.metadata.sorted_tables
+        )
+        await conn.execute(text(f"TRUNCATE {table_names} CASCADE"))
+
+    async with AsyncSession(engine) as db:
+        await init_db(db)
@@ -0,0 +1,49 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parents[2]
+
+# Imported on first use or in the lifespan, not by ``import app.main``
+DEFERRED_MODULES = ["qdrant_client", "grpc", "numpy", "passlib", "yaml", "jinja2"]
+
+# Cumulative ``-X importtime`` of ``app.main``, about twice a warm import on a
+# laptop. IMPORT_TIME_BUDGET_SECONDS overrides it for slower CI machines.
+IMPORT_TIME_BUDGET_SECONDS = float(os.environ.get("IMPORT_TIME_BUDGET_SECONDS", 2.5))
+
+
+def _python(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_app_main_defers_heavy_imports() -> None:
+    result = _python(
+        "-c", "import json, sys, app.main; print(json.dumps(sorted(sys.modules)))"
+    )
+    modules = set(json.loads(result.stdout.splitlines()[-1]))
+
+    assert [module for module in DEFERRED_MODULES if module in modules] == []
+
+
+@pytest.mark.parametrize("module", ["app.main", "app.initial_data"])
+def test_import_time_budget(module: str) -> None:
+    # Best of three, the first run also pays for a cold disk cache
+    timings = []
+    for _ in range(3):
+        stderr = _python("-X", "importtime", "-c", f"import {module}").stderr
+        match = re.search(rf"\|\s*(\d+) \| {re.escape(module)}$", stderr, re.M)
+        assert match, stderr
+        timings.append(int(match[1]) / 1e6)
+
+    assert min(timings) < IMPORT_TIME_BUDGET_SECONDS
@@ -1,3 +1,9 @@
+from .articles import (
+    ArticleDeps,
+    create_random_article,
+    model_random_create_article,
+    model_random_update_article,
+)
 from .chat_logs import (
     create_random_chat_log,
     model_random_create_chat_log,
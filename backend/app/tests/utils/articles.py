@@ -0,0 +1,62 @@
+import random
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import Article, Tenant
+from app.core.schemas import ArticleCreate, ArticleUpdate
+from app.crud import CRUD_articles
+from app.tests.utils.tenants import create_random_tenant
+from app.tests.utils.utils import (
+    ModelDeps,
+    create_dep_ids_map,
+    random_lower_string,
+)
+
+
+class ArticleDeps(ModelDeps):
+    tenant: Tenant
+
+
+async def _create_article_deps(db: AsyncSession) -> ArticleDeps:
+    tenant = await create_random_tenant(db)
+    deps: ArticleDeps = {"tenant": tenant}
+    return deps
+
+
+async def model_random_create_article(
+    db: AsyncSession,
+    deps: ArticleDeps | None = None,
+) -> ArticleCreate:
+    """If input deps, all dependencies for article must be provided"""
+    # Prepare deps
+    if deps is None:
+        deps = await _create_article_deps(db)
+    dep_ids_map = create_dep_ids_map(deps, ArticleDeps)
+
+    # Model create article
+    tenant_id = dep_ids_map["tenant"]
+    title = random_lower_string()
+    body = " ".join(random_lower_string(small_string=True) for _ in range(50))
+    language = random.choice(["en", "no", "de", "fr"])
+
+    return ArticleCreate(tenant_id=tenant_id, title=title, body=body, language=language)
+
+
+async def model_random_update_article(
+    db: AsyncSession,
+    deps: ArticleDeps | None = None,
+) -> ArticleUpdate:
+    # Schemas for update is same as create
+    article_create = await model_random_create_article(db, deps)
+    article_create = article_create.model_dump()
+    return ArticleUpdate(**article_create)
+
+
+async def create_random_article(
+    db: AsyncSession,
+    deps: ArticleDeps | None = None,
+) -> Article:
+    article_in = await model_random_create_article(db, deps)
+
+    article = await CRUD_articles.create(db=db, obj_in=article_in)
+    return article[0]
@@ -0,0 +1,170 @@
+"""
+Synthetic rows at scale, e.g. for benchmarks, as column dicts with client side ids.
+
+Generators yield batches, so millions of rows never sit in memory at once. Text is
+sliced at random offsets out of one random corpus instead of joined word by word,
+which keeps a million chat logs to seconds. Prompt and response lengths are log
+normal like real chat traffic, mostly short with a long tail.
+"""
+
+import random
+import string
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import ChatLog, ChatSession, Tenant, User
+
+Rows = list[dict[str, Any]]
+
+# Median and spread of the log normal text lengths, in characters
+PROMPT_LENGTH = (80, 0.8)
+RESPONSE_TEXT_LENGTH = (900, 0.7)
+MAX_TEXT_LENGTH = 16_000
+
+
+class _TextSampler:
+    def __init__(self, rng: random.Random, corpus_size: int = 1 << 20):
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 12)))
+            for _ in range(5000)
+        ]
+        self.rng = rng
+        self.corpus = " ".join(rng.choices(words, k=corpus_size // 7))
+
+    def sample(self, median: int, sigma: float) -> str:
+        length = min(int(self.rng.lognormvariate(0, sigma) * median), MAX_TEXT_LENGTH)
+        start = self.rng.randrange(len(self.corpus) - length)
+        return self.corpus[start : start + length].strip() or "x"
+
+
+def _uuids(rng: random.Random, n: int) -> list[UUID]:
+    return [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(n)]
+
+
+def _batches(n: int, batch_size: int) -> Iterator[int]:
+    for start in range(0, n, batch_size):
+        yield min(batch_size, n - start)
+
+
+def tenant_rows(n: int, *, seed: int = 0, batch_size: int = 10_000) -> Iterator[Rows]:
+    rng = random.Random(seed)
+    for size in _batches(n, batch_size):
+        yield [
+            {
+                "id": tenant_id,
+                "company_name": f"Company {tenant_id.hex[:8]}",
+                "entra_tenant_id": str(tenant_id),
+                "settings": {},
+            }
+            for tenant_id in _uuids(rng, size)
+        ]
+
+
+def user_rows(
+    n: int, *, tenant_ids: Sequence[UUID], seed: int = 0, batch_size: int = 10_000
+) -> Iterator[Rows]:
+    rng = random.Random(seed)
+    for size in _batches(n, batch_size):
+        tenants = rng.choices(tenant_ids, k=size)
+        yield [
+            {
+                "id": user_id,
+                "entra_id": str(user_id),
+                "tenant_id": tenant_id,
+                "email": f"{user_id.hex[:16]}@example.com",
+                "full_name": f"User {user_id.hex[:8]}",
+                "role": "guest",
+                "settings": {},
+            }
+            for user_id, tenant_id in zip(_uuids(rng, size), tenants, strict=True)
+        ]
+
+
+def chat_session_rows(
+    n: int,
+    *,
+    users: Sequence[tuple[UUID, UUID]],
+    seed: int = 0,
+    batch_size: int = 10_000,
+) -> Iterator[Rows]:
+    """``users`` are ``(user_id, tenant_id)`` pairs."""
+    rng = random.Random(seed)
+    for size in _batches(n, batch_size):
+        owners = rng.choices(users, k=size)
+        yield [
+            {"id": chat_session_id, "user_id": user_id, "tenant_id": tenant_id}
+            for chat_session_id, (user_id, tenant_id) in zip(
+                _uuids(rng, size), owners, strict=True
+            )
+        ]
+
+
+def chat_log_rows(
+    n: int,
+    *,
+    chat_session_ids: Sequence[UUID],
+    seed: int = 0,
+    batch_size: int = 10_000,
+) -> Iterator[Rows]:
+    rng = random.Random(seed)
+    text = _TextSampler(rng)
+    for size in _batches(n, batch_size):
+        chat_sessions = rng.choices(chat_session_ids, k=size)
+        yield [
+            {
+                "id": chat_log_id,
+                "chat_session_id": chat_session_id,
+                "prompt": text.sample(*PROMPT_LENGTH),
+                "response_text": text.sample(*RESPONSE_TEXT_LENGTH),
+            }
+            for chat_log_id, chat_session_id in zip(
+                _uuids(rng, size), chat_sessions, strict=True
+            )
+        ]
+
+
+async def insert_rows(
+    db: AsyncSession, model: type[Any], batches: Iterable[Rows]
+) -> list[UUID]:
+    """Inserts each batch in its own transaction, returns the ids of all rows."""
+    ids = []
+    for rows in batches:
+        async with db.begin():
+            await db.execute(insert(model), rows)
+        ids.extend(row["id"] for row in rows)
+    return ids
+
+
+async def seed_tables(
+    db: AsyncSession,
+    *,
+    n_tenants: int,
+    n_users: int,
+    n_chat_sessions: int,
+    n_chat_logs: int,
+    seed: int = 0,
+) -> dict[str, list[UUID]]:
+    """Seeds all four tables, returns the ids of the rows by table name."""
+    tenant_ids = await insert_rows(db, Tenant, tenant_rows(n_tenants, seed=seed))
+    user_batches = list(user_rows(n_users, tenant_ids=tenant_ids, seed=seed))
+    user_ids = await insert_rows(db, User, user_batches)
+    users = [(row["id"], row["tenant_id"]) for rows in user_batches for row in rows]
+    chat_session_ids = await insert_rows(
+        db, ChatSession, chat_session_rows(n_chat_sessions, users=users, seed=seed)
+    )
+    chat_log_ids = await insert_rows(
+        db,
+        ChatLog,
+        chat_log_rows(n_chat_logs, chat_session_ids=chat_session_ids, seed=seed),
+    )
+    return {
+        Tenant.__tablename__: tenant_ids,
+        User.__tablename__: user_ids,
+        ChatSession.__tablename__: chat_session_ids,
+        ChatLog.__tablename__: chat_log_ids,
+    }
@@ -0,0 +1,34 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import Table
+
+from app.crud.filters import index_leading_columns
+
+
+def unindexed_columns(table: Table, column_names: Iterable[str]) -> list[str]:
+    """Columns in ``column_names`` that no index of ``table`` can look up."""
+    return sorted(set(column_names) - index_leading_columns(table))
+
+
+class IndexAdvisor:
+    """
+    Records the columns CRUD filters on during the test session, so columns
+    that would be looked up with a sequential scan can be reported.
+    """
+
+    def __init__(self) -> None:
+        self.tables: dict[str, Table] = {}
+        self.filter_columns: defaultdict[str, set[str]] = defaultdict(set)
+
+    def record(self, table: Table, column_names: Iterable[str]) -> None:
+        self.tables[table.name] = table
+        self.filter_columns[table.name].update(column_names)
+
+    def missing_indexes(self) -> dict[str, list[str]]:
+        missing = {}
+        for table_name, column_names in self.filter_columns.items():
+            columns = unindexed_columns(self.tables[table_name], column_names)
+            if columns:
+                missing[table_name] = columns
+        return missing
@@ -0,0 +1,60 @@
+import asyncio
+import signal
+
+from app.backend_pre_start import init
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, close_qdrant_client, engine
+from app.logs.logger import logger, setup_logging
+from app.services.idempotency import idempotency_store
+from app.services.job_handlers import job_worker
+from app.services.partitions import chat_log_partitions
+
+
+async def maintain_partitions() -> None:
+    """Keeps future chat log partitions created and drops expired ones."""
+    while True:
+        try:
+            await chat_log_partitions.maintain()
+        except Exception as e:
+            logger.error(f"Could not maintain chat log partitions: {e}")
+        await asyncio.sleep(settings.CHAT_LOG_PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+
+
+async def prune_idempotency_keys() -> None:
+    """Deletes expired Idempotency-Keys and their responses."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                deleted = await idempotency_store.delete_expired(db)
+            logger.info(f"Deleted {deleted} expired idempotency keys")
+        except Exception as e:
+            logger.error(f"Could not delete expired idempotency keys: {e}")
+        await asyncio.sleep(settings.IDEMPOTENCY_PRUNE_INTERVAL_SECONDS)
+
+
+async def main() -> None:
+    setup_logging()
+    await init(engine)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, job_worker.stop)
+
+    maintenance_tasks = [
+        asyncio.create_task(maintain_partitions()),
+        asyncio.create_task(prune_idempotency_keys()),
+    ]
+
+    logger.info("Job worker started")
+    await job_worker.run()
+    logger.info("Job worker stopped")
+
+    for task in maintenance_tasks:
+        task.cancel()
+    await asyncio.gather(*maintenance_tasks, return_exceptions=True)
+    await close_qdrant_client()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())